@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Speed of the extractors from :mod:`dhtmlparser3.extractors` compared to the
+same work done on the DOM.
+
+Usage::
+
+    PYTHONPATH=src python3 benchmarks/extractors.py [size_in_mb]
+"""
+import sys
+import time
+
+import dhtmlparser3
+from dhtmlparser3.extractors import extract_meta
+from dhtmlparser3.extractors import extract_links
+from dhtmlparser3.extractors import extract_title
+from dhtmlparser3.extractors import extract_images
+
+
+HEAD = """<html><head>
+<title>Benchmark &amp; page</title>
+<meta charset="utf-8">
+<meta name="description" content="Page used for the benchmark">
+<script>var links = ['<a href="/not-a-link">'];</script>
+</head><body>
+"""
+
+ARTICLE = """<div class="article">
+  <h2><a href="/articles/{0}.html" title="Article {0}">Article {0}</a></h2>
+  <img src="/img/{0}.png" alt="Picture {0}" width=100 height=100>
+  <p>Some text of the article, with <b>bold</b> and <i>italic</i> parts,
+  &amp; an <a href="https://example.com/?id={0}&amp;ref=bench">external link</a>.</p>
+  <!-- <a href="/commented-out"> -->
+</div>
+"""
+
+
+def generate(size):
+    pieces = [HEAD]
+    length = len(HEAD)
+    while length < size:
+        piece = ARTICLE.format(len(pieces))
+        pieces.append(piece)
+        length += len(piece)
+
+    pieces.append("</body></html>")
+    return "".join(pieces)
+
+
+def extract_dom(html):
+    dom = dhtmlparser3.parse(html)
+
+    links = [a.p["href"] for a in dom.find("a") if "href" in a.p]
+    images = [img.p["src"] for img in dom.find("img") if "src" in img.p]
+    meta = [dict(meta.p) for meta in dom.find("meta")]
+    title = dom.find("title")[0].content_without_tags()
+
+    return links, images, meta, title
+
+
+def extract_fast(html):
+    return (
+        extract_links(html),
+        extract_images(html),
+        extract_meta(html),
+        extract_title(html),
+    )
+
+
+def measure(fn, html):
+    start = time.perf_counter()
+    fn(html)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    size = float(sys.argv[1]) if len(sys.argv) > 1 else 2
+    html = generate(int(size * 1024 * 1024))
+
+    dom_time = measure(extract_dom, html)
+    fast_time = measure(extract_fast, html)
+
+    print(f"input: {len(html) / 1024 / 1024:.1f} MB")
+    print(f"parse() + find(): {dom_time:6.3f} s")
+    print(f"extractors:       {fast_time:6.3f} s ({dom_time / fast_time:.0f}x faster)")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Memory used by parsed pages of one site, with and without the sharing of
+the identical sub-trees by :class:`dhtmlparser3.interning.InternStore`.
+
+Usage::
+
+    PYTHONPATH=src python3 benchmarks/interning.py [number_of_pages]
+"""
+import gc
+import sys
+import tracemalloc
+
+import dhtmlparser3
+from dhtmlparser3.interning import InternStore
+
+
+HEADER = '<div class="header"><ul>%s</ul></div>' % "".join(
+    f'<li><a href="/section/{i}" class="nav">Section {i}</a></li>' for i in range(30)
+)
+
+FOOTER = '<div class="footer">%s</div>' % "".join(
+    f'<p class="small">Footer text {i} &copy; 2021</p>' for i in range(20)
+)
+
+
+def generate(number):
+    return (
+        f"<html><body>{HEADER}<div class=content><h1>Page {number}</h1>"
+        f"<p>Unique text of the page {number}.</p></div>{FOOTER}</body></html>"
+    )
+
+
+def measure(pages, store=None, read=False):
+    gc.collect()
+    tracemalloc.start()
+
+    doms = [dhtmlparser3.parse(page) for page in pages]
+    if store is not None:
+        doms = [store.intern(dom) for dom in doms]
+
+    # reading the documents shouldn't copy the shared sub-trees
+    if read:
+        for dom in doms:
+            dom.find("a", {"class": "nav"})
+            dom.to_string()
+
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return used, doms
+
+
+if __name__ == "__main__":
+    number = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pages = [generate(i) for i in range(number)]
+
+    plain, doms = measure(pages)
+    del doms
+
+    store = InternStore()
+    interned, doms = measure(pages, store)
+
+    print(f"pages: {number}")
+    print(f"parse():          {plain / 1024 / 1024:6.1f} MB")
+    print(
+        f"InternStore:      {interned / 1024 / 1024:6.1f} MB "
+        f"({plain / interned:.0f}x less, {len(store)} distinct sub-trees)"
+    )
+    del doms
+
+    read, doms = measure(pages, InternStore(), read=True)
+    print(f"after find():     {read / 1024 / 1024:6.1f} MB")
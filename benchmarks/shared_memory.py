@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Memory allocated by each worker process, which queries the same large
+document: parsed by every worker, or attached from the shared memory by
+:func:`dhtmlparser3.sharing.attach`.
+
+Usage::
+
+    PYTHONPATH=src python3 benchmarks/shared_memory.py [workers] [size_in_mb]
+"""
+import gc
+import sys
+import time
+import tracemalloc
+import multiprocessing
+
+import dhtmlparser3
+from dhtmlparser3 import sharing
+from dhtmlparser3.compact import CompactDocument
+
+from extractors import generate
+
+
+def query(dom):
+    return len(dom.find("a", {"title": "Article 100"})) + len(dom.find("p"))
+
+
+def parse_worker(html):
+    gc.collect()
+    tracemalloc.start()
+
+    dom = dhtmlparser3.parse(html)
+    found = query(dom)
+
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return used, found
+
+
+def attach_worker(name):
+    gc.collect()
+    tracemalloc.start()
+
+    with sharing.attach(name) as document:
+        found = query(document)
+        used = tracemalloc.get_traced_memory()[0]
+
+    tracemalloc.stop()
+    return used, found
+
+
+def run(worker, argument, workers):
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers) as pool:
+        results = pool.map(worker, [argument] * workers)
+
+    duration = time.perf_counter() - start
+    used = max(used for used, _ in results)
+
+    return used, duration
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    size = float(sys.argv[2]) if len(sys.argv) > 2 else 2
+    html = generate(int(size * 1024 * 1024))
+
+    print(f"workers: {workers}, document: {len(html) / 1024 / 1024:.1f} MB")
+
+    used, duration = run(parse_worker, html, workers)
+    print(f"parse() in each worker: {used / 1024:8.0f} kB per worker, {duration:.2f}s")
+
+    memory = sharing.share(CompactDocument(html))
+    try:
+        used, duration = run(attach_worker, memory.name, workers)
+        print(
+            f"attach():               {used / 1024:8.0f} kB per worker, "
+            f"{duration:.2f}s"
+        )
+        print(f"shared block:           {memory.size / 1024:8.0f} kB")
+    finally:
+        memory.close()
+        memory.unlink()
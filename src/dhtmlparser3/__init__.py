@@ -1,30 +1,216 @@
 from dhtmlparser3 import specialdict
+from dhtmlparser3.encoding import decode as _decode
+from dhtmlparser3.encoding import sniff_encoding
 
 from dhtmlparser3.tags.tag import Tag
 from dhtmlparser3.tags.comment import Comment
+from dhtmlparser3.tags.raw_text import RawText
+from dhtmlparser3.tags.shared_tag import SharedTag
 
 from dhtmlparser3.parser import Parser
+from dhtmlparser3.parser import StreamParser
+from dhtmlparser3.reader import FileReader
+from dhtmlparser3.query import Query
+from dhtmlparser3.query import compile_query
+from dhtmlparser3.treediff import diff
+from dhtmlparser3.treediff import patch
 
 
 class FileParser:
-    def __init__(self, path: str, case_insensitive_parameters=True):
+    def __init__(
+        self,
+        path: str,
+        case_insensitive_parameters=True,
+        lazy_entities=False,
+        binary=False,
+        preserve_source=False,
+    ):
         self.path = path
+        self.binary = binary
+        self.preserve_source = preserve_source
 
-        with open(path) as f:
-            self.dom = parse(f.read())
+        reader = FileReader(path, binary)
+        parser = StreamParser(
+            case_insensitive_parameters, lazy_entities, keep_source=preserve_source
+        )
+        for chunk in reader:
+            parser.feed(chunk)
+        parser.close()
 
-    def write(self, path: str = None):
+        self.dom = parser.get_dom()
+        self.encoding = reader.encoding
+        self.bom = reader.bom
+
+    def write(self, path: str = None, preserve_source=None):
         if path is None:
             path = self.path
 
-        with open(path, "w") as f:
-            f.write(str(self.dom))
+        if preserve_source is None:
+            preserve_source = self.preserve_source
+
+        dom = self.dom
+
+        # single root element is returned without the container, which also
+        # spans the rest of the source, like the stray closing tags after it
+        container = dom.parent
+        if (
+            preserve_source
+            and container is not None
+            and not container.name
+            and len(container.content) == 1
+            and container.content[0] is dom
+        ):
+            dom = container
+
+        if not self.binary:
+            with open(path, "w") as f:
+                f.write(dom.to_string(preserve_source))
+            return
+
+        with open(path, "wb") as f:
+            f.write(self.bom)
+            f.write(
+                dom.to_string(preserve_source).encode(
+                    self.encoding, "xmlcharrefreplace"
+                )
+            )
+
+
+def parse(string: str, case_insensitive_parameters=True, lazy_entities=False):
+    """
+    Parse `string` into DOM.
 
+    Args:
+        string (str): HTML/XML string.
+        case_insensitive_parameters (bool): Compare parameter names case
+            insensitively. Default True.
+        lazy_entities (bool): Keep texts and parameter values containing
+            entities as :class:`.RawText`, which is decoded only on access and
+            serialized back verbatim. Default False.
 
-def parse(string: str, case_insensitive_parameters=True):
-    parser = Parser(string, case_insensitive_parameters)
+    Returns:
+        Tag: Root of the DOM.
+    """
+    parser = Parser(string, case_insensitive_parameters, lazy_entities)
     return parser.parse_dom()
 
 
-def parse_file(path: str, case_insensitive_parameters=True):
-    return FileParser(path, case_insensitive_parameters)
+def parse_bytes(
+    data: bytes, case_insensitive_parameters=True, lazy_entities=False, encoding=None
+):
+    """
+    Parse `data` into DOM. Encoding is detected from the BOM, XML declaration
+    or ``<meta charset>``, see :mod:`dhtmlparser3.encoding`.
+
+    Args:
+        data (bytes): HTML/XML document.
+        case_insensitive_parameters (bool): Compare parameter names case
+            insensitively. Default True.
+        lazy_entities (bool): See :func:`parse`. Default False.
+        encoding (str): Use this encoding instead of the detected one.
+
+    Returns:
+        Tag: Root of the DOM.
+    """
+    string, _ = _decode(data, encoding)
+    return parse(string, case_insensitive_parameters, lazy_entities)
+
+
+def parse_file(
+    path: str,
+    case_insensitive_parameters=True,
+    lazy_entities=False,
+    binary=False,
+    preserve_source=False,
+):
+    """
+    Parse file at `path`. The file is read and parsed in chunks, gzip, bzip2
+    and xz compressed files are decompressed transparently.
+
+    Args:
+        path (str): Path to the file.
+        case_insensitive_parameters (bool): Compare parameter names case
+            insensitively. Default True.
+        lazy_entities (bool): See :func:`parse`. Default False.
+        binary (bool): Read the file as bytes and detect the encoding like
+            :func:`parse_bytes`. The same encoding is used by `.write()`.
+            Default False, which uses the locale encoding.
+        preserve_source (bool): Keep the content of the file, so that `.write()`
+            copies unmodified parts verbatim, see :meth:`.Tag.to_string`.
+            Default False.
+
+    Returns:
+        FileParser: Object with parsed `.dom` and `.write()` method.
+    """
+    return FileParser(
+        path, case_insensitive_parameters, lazy_entities, binary, preserve_source
+    )
+
+
+def iterparse_file(
+    path: str,
+    name: str = None,
+    discard=True,
+    case_insensitive_parameters=True,
+    lazy_entities=False,
+    binary=False,
+):
+    """
+    Parse file at `path` in chunks and yield tags as soon as they are complete
+    (their closing tag was parsed), in the order of their closing.
+
+    Example:
+        for item in dhtmlparser3.iterparse_file("export.xml.gz", "item"):
+            print(item.find("title")[0].content_without_tags())
+
+    Args:
+        path (str): Path to the file.
+        name (str): Yield only tags with this name. Default None for all tags.
+        discard (bool): Remove the yielded tags from their parents once you
+            are done with them (after the chunk they were parsed from), with
+            everything before them in the parent (like the whitespace and the
+            other tags), so the memory doesn't grow with the size of the
+            file. Default True.
+        case_insensitive_parameters (bool): Compare parameter names case
+            insensitively. Default True.
+        lazy_entities (bool): See :func:`parse`. Default False.
+        binary (bool): Read the file as bytes and detect the encoding like
+            :func:`parse_bytes`. Default False.
+
+    Yields:
+        Tag: Complete tags.
+    """
+    parser = StreamParser(case_insensitive_parameters, lazy_entities)
+
+    chunks = iter(FileReader(path, binary))
+    while chunks is not None:
+        chunk = next(chunks, None)
+        if chunk is None:
+            closed = parser.close()
+            chunks = None
+        else:
+            closed = parser.feed(chunk)
+
+        if name is not None:
+            closed = [tag for tag in closed if tag._is_almost_equal(name)]
+
+        yield from closed
+
+        if discard:
+            _detach_from_parents(closed)
+
+
+def _detach_from_parents(tags):
+    """
+    Remove the `tags` and everything before them (texts in between, tags not
+    matching the name) from their parents.
+    """
+    # siblings are closed in the document order, so the last one wins
+    last_tags = {id(tag.parent): tag for tag in tags if tag.parent is not None}
+
+    for tag in last_tags.values():
+        content = tag.parent.content
+        for index in range(len(content) - 1, -1, -1):
+            if content[index] is tag:
+                del content[:index + 1]
+                break
@@ -0,0 +1,1036 @@
+"""
+This module contains read-only, array-backed representation of the parsed
+document, which needs a fraction of the memory of the :class:`.Tag` tree.
+
+Example usage::
+
+    >>> document = CompactDocument('<ul><li class=a>1</li><li>2</li></ul>')
+    >>> [li.content_without_tags() for li in document.find("li")]
+    ['1', '2']
+    >>> document.find("li", {"class": "a"})[0].to_tag()
+    Tag('li', parameters=SpecialDict([('class', 'a')]), is_non_pair=False)
+
+Nodes (tags, texts and comments) are stored in the parallel :mod:`array`
+columns, in the document order: kind, name, parent, first child, next
+sibling, offsets in the source and the range of the parameters. Names,
+parameters, comments and texts with entities are kept in the table of unique
+strings, other texts are sliced from the source on access.
+
+The arrays can be serialized by :meth:`CompactDocument.to_bytes` and used
+directly from the buffer (shared memory, mmap'd file) by
+:meth:`CompactDocument.from_buffer`, see :mod:`dhtmlparser3.sharing`.
+
+The tree has the same structure as the DOM from :func:`.parse`. Nodes are
+accessed through :class:`CompactNode`, which has the read-only part of the
+:class:`.Tag` API and :meth:`CompactNode.to_tag` for creating real tags.
+"""
+import sys
+import struct
+from array import array
+from bisect import bisect_left
+from typing import List
+from typing import Union
+from typing import Iterator
+from typing import Optional
+
+from dhtmlparser3.query import Equals
+from dhtmlparser3.query import compile_query
+from dhtmlparser3.tokens import TextToken
+from dhtmlparser3.tokens import CommentToken
+from dhtmlparser3.tokenizer import Tokenizer
+from dhtmlparser3.specialdict import SpecialDict
+from dhtmlparser3.tags.tag import Tag
+from dhtmlparser3.tags.comment import Comment
+
+
+TAG = 0
+TEXT = 1  # slice of the source
+STRING = 2  # text different from the source (entities), in the string table
+COMMENT = 3
+
+_TEXT_KINDS = (TEXT, STRING)
+
+_MAGIC = b"DHP3CMP\0"
+# 2 added the index sections to the header
+_VERSION = 2
+# magic, version, flags, nodes, parameters, strings, size of the string data,
+# tag names, indexed names, their postings, indexed parameters, their postings
+_HEADER = struct.Struct("<8sIIIIIQIIIII")
+# magic and the version, same in all versions of the header
+_PREFIX = struct.Struct("<8sI")
+_CASE_INSENSITIVE = 1
+_BIG_ENDIAN = 2
+_INDEXED = 4
+_BYTE_ORDER_FLAG = _BIG_ENDIAN if sys.byteorder == "big" else 0
+
+_NODE_ARRAYS = (
+    "kinds",
+    "non_pairs",
+    "names",
+    "lower_names",
+    "parents",
+    "first_children",
+    "next_siblings",
+    "starts",
+    "ends",
+    "parameter_starts",
+    "parameter_ends",
+    "subtree_ends",
+)
+_PARAMETER_ARRAYS = ("keys", "values")
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _offset(offset: Optional[int]) -> int:
+    return -1 if offset is None else offset
+
+
+def _span_offset(offset: int) -> Optional[int]:
+    return None if offset == -1 else offset
+
+
+def _contains(postings, index: int) -> bool:
+    position = bisect_left(postings, index)
+    return position < len(postings) and postings[position] == index
+
+
+class _StringTable:
+    """
+    Read-only table of strings stored as UTF-8 in the buffer.
+    """
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0 or index >= len(self):
+            raise IndexError(index)
+
+        offsets = self.offsets
+        data = self.data[offsets[index]:offsets[index + 1]]
+        return str(data, "utf-8", "surrogatepass")
+
+
+class CompactDocument:
+    """
+    Read-only parsed document stored in arrays.
+
+    Attributes:
+        string (str): Parsed string, None for the document created by
+            :meth:`from_buffer`.
+        strings (list): Table of unique strings (names, keys, values, ..).
+        root (CompactNode): Root of the DOM, like the result of :func:`.parse`.
+    """
+    _owner = None
+    _views = ()
+    _name_postings = None  # set for the deserialized documents with index
+
+    def __init__(self, string: str, case_insensitive_parameters=True):
+        """
+        Args:
+            string (str): HTML/XML string.
+            case_insensitive_parameters (bool): Compare parameter names case
+                insensitively. Default True.
+        """
+        if string.startswith("\ufeff"):
+            string = string[1:]
+
+        self.string = string
+        self._dict_class = SpecialDict if case_insensitive_parameters else dict
+
+        self._init_arrays()
+        self._build()
+        self._name_ids = self._string_ids
+        self.root = self._get_root()
+
+    def _init_arrays(self):
+        self.strings = []
+        self._string_ids = {}
+
+        self.kinds = array("b")
+        self.names = array("i")  # string id of the name, text or comment
+        self.lower_names = array("i")  # for case insensitive search
+        self.parents = array("i")
+        self.first_children = array("i")
+        self.next_siblings = array("i")
+        self.starts = array("i")
+        self.ends = array("i")
+        self.parameter_starts = array("i")
+        self.parameter_ends = array("i")
+        self.non_pairs = array("b")
+        self.subtree_ends = array("i")  # index of the last descendant
+
+        self.keys = array("i")
+        self.values = array("i")
+
+    @classmethod
+    def from_dom(cls, dom: Tag) -> "CompactDocument":
+        """
+        Create the document from the :class:`.Tag` tree.
+
+        Texts are stored in the table of strings, :attr:`string` is None.
+        Parameters are compared case insensitively, if the `dom` uses
+        :class:`.SpecialDict` for them.
+
+        Args:
+            dom (Tag): Root of the DOM.
+
+        Returns:
+            CompactDocument: Document with the same tree as the `dom`.
+        """
+        document = cls.__new__(cls)
+        document.string = None
+        document._dict_class = dict
+        # .copy() gets the dict of the views, like the SharedTag parameters
+        if isinstance(dom.parameters.copy(), SpecialDict):
+            document._dict_class = SpecialDict
+
+        document._init_arrays()
+        document._build_from_dom(dom)
+        document._name_ids = document._string_ids
+        document.root = document._get_root()
+
+        return document
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Number of the nodes, including the root container.
+        """
+        return len(self.kinds)
+
+    def find(self, name, p=None, fn=None, case_sensitive=False) -> List["CompactNode"]:
+        """
+        Same as :meth:`.Tag.find` on the root.
+        """
+        return self.root.find(name, p, fn, case_sensitive)
+
+    def to_dom(self) -> Tag:
+        """
+        Create the whole :class:`.Tag` tree.
+        """
+        return self.root.to_tag()
+
+    def to_bytes(self, index=False) -> bytes:
+        """
+        Serialize the document to the format of :meth:`from_buffer`.
+
+        Texts are stored in the table of strings, so the source string is not
+        needed (and not stored). The offsets of the nodes are kept.
+
+        Args:
+            index (bool): Add the posting lists of the tags by the name and
+                by the parameters, which are used by :meth:`.CompactNode.find`
+                of the deserialized document. Default False.
+
+        Returns:
+            bytes: Serialized document.
+        """
+        strings = list(self.strings)
+        string_ids = {string: string_id for string_id, string in enumerate(strings)}
+
+        def string_id(string):
+            string_id = string_ids.get(string)
+            if string_id is None:
+                string_id = len(strings)
+                strings.append(string)
+                string_ids[string] = string_id
+
+            return string_id
+
+        kinds = array("b", self.kinds)
+        names = array("i", self.names)
+        for position, kind in enumerate(kinds):
+            if kind == TEXT:
+                kinds[position] = STRING
+                names[position] = string_id(self._text(position))
+
+        tag_names = sorted(
+            {name for kind, name in zip(kinds, names) if kind == TAG}
+            | {name for name in self.lower_names if name != -1}
+        )
+
+        index_arrays = []
+        if index:
+            index_arrays = self._index_arrays(string_id)
+
+        encoded = [string.encode("utf-8", "surrogatepass") for string in strings]
+        string_offsets = array("q", [0])
+        for data in encoded:
+            string_offsets.append(string_offsets[-1] + len(data))
+
+        flags = _BYTE_ORDER_FLAG
+        if self._dict_class is SpecialDict:
+            flags |= _CASE_INSENSITIVE
+        if index:
+            flags |= _INDEXED
+
+        index_counts = (0, 0, 0, 0)
+        if index:
+            index_counts = [len(index_arrays[position]) for position in (0, 2, 3, 6)]
+
+        sections = [
+            _HEADER.pack(
+                _MAGIC,
+                _VERSION,
+                flags,
+                len(kinds),
+                len(self.keys),
+                len(strings),
+                string_offsets[-1],
+                len(tag_names),
+                *index_counts,
+            )
+        ]
+        columns = {"kinds": kinds, "names": names}
+        for name in _NODE_ARRAYS + _PARAMETER_ARRAYS:
+            column = columns.get(name)
+            if column is None:
+                column = getattr(self, name)
+            sections.append(column.tobytes())
+        sections.append(string_offsets.tobytes())
+        sections.append(b"".join(encoded))
+        sections.append(array("i", tag_names).tobytes())
+        sections.extend(column.tobytes() for column in index_arrays)
+
+        output = bytearray()
+        for section in sections:
+            output += section
+            output += bytes(_aligned(len(output)) - len(output))
+
+        return bytes(output)
+
+    def _index_arrays(self, string_id) -> List[array]:
+        """
+        Posting lists of the tags by the lowercase name and by the
+        ``(key, value)`` pairs of the parameters, sorted for binary search:
+        name ids, offsets, postings, key ids, value ids, offsets, postings.
+        """
+        strings = self.strings
+        keys = self.keys
+        values = self.values
+        lower_names = self.lower_names
+        parameter_starts = self.parameter_starts
+        parameter_ends = self.parameter_ends
+        case_insensitive = self._dict_class is SpecialDict
+
+        by_name = {}
+        by_parameter = {}
+        for index, kind in enumerate(self.kinds):
+            if kind != TAG:
+                continue
+
+            by_name.setdefault(lower_names[index], []).append(index)
+            for position in range(parameter_starts[index], parameter_ends[index]):
+                key = strings[keys[position]]
+                if case_insensitive:
+                    key = key.lower()
+
+                pair = (key, strings[values[position]])
+                postings = by_parameter.setdefault(pair, [])
+                if not postings or postings[-1] != index:
+                    postings.append(index)
+
+        def flatten(groups):
+            offsets = array("i", [0])
+            postings = array("i")
+            for group in groups:
+                postings.extend(group)
+                offsets.append(len(postings))
+
+            return offsets, postings
+
+        name_ids = sorted(by_name)
+        pairs = sorted(by_parameter)
+        name_offsets, name_postings = flatten(by_name[name] for name in name_ids)
+        pair_offsets, pair_postings = flatten(by_parameter[pair] for pair in pairs)
+
+        return [
+            array("i", name_ids),
+            name_offsets,
+            name_postings,
+            array("i", (string_id(key) for key, _ in pairs)),
+            array("i", (string_id(value) for _, value in pairs)),
+            pair_offsets,
+            pair_postings,
+        ]
+
+    @classmethod
+    def from_buffer(cls, buffer, owner=None) -> "CompactDocument":
+        """
+        Use the document serialized by :meth:`to_bytes` directly from the
+        `buffer`, without copying the arrays.
+
+        Call :meth:`close` (or use the document as a context manager) to
+        release the `buffer`.
+
+        Args:
+            buffer: Object supporting the buffer protocol (bytes, mmap,
+                ``SharedMemory.buf``, ..).
+            owner: Object, which is closed by :meth:`close` after the
+                buffer is released. Default None.
+
+        Raises:
+            ValueError: If the buffer doesn't contain serialized document.
+
+        Returns:
+            CompactDocument: Read-only document backed by the `buffer`.
+        """
+        document = cls.__new__(cls)
+        document._views = [memoryview(buffer).cast("B")]
+        try:
+            document._read_buffer(document._views[0])
+        except ValueError:
+            document.close()
+            raise
+
+        document._owner = owner
+        return document
+
+    def _read_buffer(self, view: memoryview):
+        if len(view) < _PREFIX.size:
+            raise ValueError("Buffer doesn't contain serialized document!")
+
+        magic, version = _PREFIX.unpack_from(view)
+        if magic != _MAGIC:
+            raise ValueError("Buffer doesn't contain serialized document!")
+        if version != _VERSION:
+            raise ValueError(f"Unsupported version {version} of the document!")
+        if len(view) < _HEADER.size:
+            raise ValueError("Buffer doesn't contain serialized document!")
+
+        header = _HEADER.unpack_from(view)
+        flags, node_count, parameter_count = header[2:5]
+        string_count, string_data_size, tag_name_count = header[5:8]
+        indexed_names, name_postings, indexed_pairs, pair_postings = header[8:]
+        if flags & _BIG_ENDIAN != _BYTE_ORDER_FLAG:
+            raise ValueError("Document was serialized with different byte order!")
+
+        offset = _aligned(_HEADER.size)
+
+        def take(typecode, count):
+            nonlocal offset
+            end = offset + count * struct.calcsize(typecode)
+            if end > len(view):
+                raise ValueError("Serialized document is truncated!")
+
+            section = view[offset:end].cast(typecode)
+            self._views.append(section)
+            offset = _aligned(end)
+            return section
+
+        for name in _NODE_ARRAYS:
+            typecode = "b" if name in ("kinds", "non_pairs") else "i"
+            setattr(self, name, take(typecode, node_count))
+        for name in _PARAMETER_ARRAYS:
+            setattr(self, name, take("i", parameter_count))
+
+        string_offsets = take("q", string_count + 1)
+        strings = _StringTable(string_offsets, take("B", string_data_size))
+        tag_names = take("i", tag_name_count)
+
+        if flags & _INDEXED:
+            self._indexed_names = take("i", indexed_names)
+            self._name_offsets = take("i", indexed_names + 1)
+            self._name_postings = take("i", name_postings)
+            self._indexed_keys = take("i", indexed_pairs)
+            self._indexed_values = take("i", indexed_pairs)
+            self._pair_offsets = take("i", indexed_pairs + 1)
+            self._pair_postings = take("i", pair_postings)
+
+        self.string = None
+        self.strings = strings
+        self._dict_class = dict
+        if flags & _CASE_INSENSITIVE:
+            self._dict_class = SpecialDict
+
+        self._name_ids = {strings[name]: name for name in tag_names}
+        self.root = self._get_root()
+
+    def close(self):
+        """
+        Release the buffer of the document created by :meth:`from_buffer`
+        and close its `owner`. The document can't be used afterwards.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = ()
+
+        owner = self._owner
+        self._owner = None
+        if owner is not None:
+            owner.close()
+
+    def _string_id(self, string: str) -> int:
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.strings.append(string)
+            self._string_ids[string] = string_id
+
+        return string_id
+
+    def _add_node(self, kind, name, parent, start, end) -> int:
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.names.append(name)
+        self.parents.append(parent)
+        self.first_children.append(-1)
+        self.next_siblings.append(-1)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.non_pairs.append(0)
+
+        parameter_start = len(self.keys)
+        self.parameter_starts.append(parameter_start)
+        self.parameter_ends.append(parameter_start)
+
+        if parent != -1:
+            last_child = self._last_children[parent]
+            if last_child == -1:
+                self.first_children[parent] = index
+            else:
+                self.next_siblings[last_child] = index
+
+            self._last_children[parent] = index
+        self._last_children.append(-1)
+
+        return index
+
+    def _add_tag(self, token, parent) -> int:
+        name_id = self._string_id(token.name)
+        index = self._add_node(TAG, name_id, parent, token.start, token.end)
+
+        for parameter in token.parameters:
+            self.keys.append(self._string_id(parameter.key))
+            self.values.append(self._string_id(str(parameter.value)))
+        self.parameter_ends[index] = len(self.keys)
+
+        if token.is_non_pair:
+            self.non_pairs[index] = 1
+
+        return index
+
+    def _add_text(self, token, parent):
+        text = token.content
+        start = token.start
+        end = token.end
+        if end - start == len(text) and self.string.startswith(text, start):
+            self._add_node(TEXT, -1, parent, start, end)
+        else:
+            self._add_node(STRING, self._string_id(text), parent, start, end)
+
+    def _build(self):
+        """
+        Build the arrays from the tokens, the same way as the :class:`.Parser`
+        builds the tree.
+        """
+        self._last_children = array("i")
+
+        root = self._add_node(TAG, self._string_id(""), -1, 0, len(self.string))
+        stack = [root]
+        top = root
+
+        tokens = Tokenizer(self.string).tokenize_iter()
+        if not self.string:
+            tokens = []
+
+        for token in tokens:
+            if isinstance(token, TextToken):
+                self._add_text(token, top)
+
+            elif isinstance(token, CommentToken):
+                self._add_node(
+                    COMMENT,
+                    self._string_id(token.content),
+                    top,
+                    token.start,
+                    token.end,
+                )
+
+            elif token.is_non_pair:
+                self._add_tag(token, top)
+
+            elif token.is_end_tag:
+                name = token.name
+                strings = self.strings
+                names = self.names
+                for closed in reversed(stack):
+                    if strings[names[closed]] == name:
+                        break
+                else:
+                    continue  # closing tag, which doesn't match anything
+
+                self.ends[closed] = token.end
+                if closed == top:
+                    stack.pop()
+                    top = stack[-1]
+                else:
+                    top = self._reshape_non_pair_tags(stack, closed)
+
+            else:
+                top = self._add_tag(token, top)
+                stack.append(top)
+
+        if len(stack) > 1:
+            self._reshape_non_pair_tags(stack, root)
+
+        self._finish_build()
+
+    def _build_from_dom(self, dom: Tag):
+        self._last_children = array("i")
+
+        parent = -1
+        if dom.name:  # the root container is always at the index 0
+            start = _offset(dom.start)
+            end = _offset(dom.end)
+            parent = self._add_node(TAG, self._string_id(""), -1, start, end)
+
+        stack = [(dom, parent)]
+        while stack:
+            item, parent = stack.pop()
+            if isinstance(item, Tag):
+                index = self._add_node(
+                    TAG,
+                    self._string_id(item.name),
+                    parent,
+                    _offset(item.start),
+                    _offset(item.end),
+                )
+                for key, value in item.parameters.items():
+                    self.keys.append(self._string_id(key))
+                    self.values.append(self._string_id(str(value)))
+                self.parameter_ends[index] = len(self.keys)
+
+                if item.is_non_pair:
+                    self.non_pairs[index] = 1
+
+                stack.extend((child, index) for child in reversed(item.content))
+
+            elif isinstance(item, Comment):
+                self._add_node(
+                    COMMENT,
+                    self._string_id(item.content or ""),
+                    parent,
+                    _offset(item.start),
+                    _offset(item.end),
+                )
+
+            else:
+                self._add_node(STRING, self._string_id(str(item)), parent, -1, -1)
+
+        self._finish_build()
+
+    def _finish_build(self):
+        self.lower_names = array(
+            "i",
+            (
+                self._string_id(self.strings[name].lower()) if kind == TAG else -1
+                for kind, name in zip(self.kinds, self.names)
+            ),
+        )
+
+        # children have higher indexes, so the reversed order computes them
+        # before their parents
+        subtree_ends = array("i", range(len(self.kinds)))
+        last_children = self._last_children
+        for index in range(len(self.kinds) - 1, -1, -1):
+            last_child = last_children[index]
+            if last_child != -1:
+                subtree_ends[index] = subtree_ends[last_child]
+
+        self.subtree_ends = subtree_ends
+        del self._last_children
+
+    def _reshape_non_pair_tags(self, stack, closed) -> int:
+        """
+        Same as :meth:`.Parser._reshape_non_pair_tags`: unclosed tags above
+        the `closed` one in the `stack` become non-pair tags and their
+        content is moved after them.
+        """
+        closed_index = len(stack) - 1 - stack[::-1].index(closed)
+        non_pairs = stack[closed_index + 1:]
+        del stack[closed_index + 1:]
+
+        first_children = self.first_children
+        next_siblings = self.next_siblings
+        last_children = self._last_children
+        parents = self.parents
+
+        for tag in reversed(non_pairs):
+            self.non_pairs[tag] = 1
+
+            first_child = first_children[tag]
+            if first_child == -1:
+                continue
+
+            # move the content between the tag and its next sibling
+            parent = parents[tag]
+            last_child = last_children[tag]
+            next_siblings[last_child] = next_siblings[tag]
+            next_siblings[tag] = first_child
+            if last_children[parent] == tag:
+                last_children[parent] = last_child
+
+            child = first_child
+            while child != -1:
+                parents[child] = parent
+                if child == last_child:
+                    break
+                child = next_siblings[child]
+
+            first_children[tag] = -1
+            last_children[tag] = -1
+
+        stack.pop()
+        if stack:
+            return stack[-1]
+
+        return closed
+
+    def _find_indexes(self, index: int, query) -> Iterator[int]:
+        """
+        Indexes of the tags in the sub-tree of `index` with the name of the
+        `query`. Parameters and `fn` of the query have to be checked by the
+        caller (the posting lists of the indexed document just narrow down
+        the candidates).
+        """
+        end = self.subtree_ends[index] + 1
+        if self._name_postings is not None:
+            posting_lists = self._query_posting_lists(query)
+            if posting_lists:
+                return self._find_in_postings(posting_lists, index, end, query)
+
+        if not query.name:
+            kinds = self.kinds
+            return (index for index in range(index, end) if kinds[index] == TAG)
+
+        # names are compared as ids, without creating the nodes
+        name_id = self._name_ids.get(query.name)
+        if name_id is None:
+            return iter(())
+
+        names = self.names if query.case_sensitive else self.lower_names
+        return (index for index in range(index, end) if names[index] == name_id)
+
+    def _query_posting_lists(self, query) -> list:
+        """
+        Posting lists of the name and of the parameters compared for
+        equality in the `query`.
+        """
+        posting_lists = []
+        if query.name:
+            posting_lists.append(self._name_posting_list(query.name.lower()))
+
+        for key, predicate in query.parameters:
+            if isinstance(predicate, Equals) and isinstance(predicate.expected, str):
+                posting_lists.append(self._pair_posting_list(key, predicate.expected))
+
+        return posting_lists
+
+    def _name_posting_list(self, name: str):
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            return ()
+
+        names = self._indexed_names
+        position = bisect_left(names, name_id)
+        if position == len(names) or names[position] != name_id:
+            return ()
+
+        offsets = self._name_offsets
+        return self._name_postings[offsets[position]:offsets[position + 1]]
+
+    def _pair_posting_list(self, key: str, value: str):
+        if self._dict_class is SpecialDict:
+            key = key.lower()
+
+        strings = self.strings
+        keys = self._indexed_keys
+        values = self._indexed_values
+
+        low = 0
+        high = len(keys)
+        while low < high:
+            middle = (low + high) // 2
+            if (strings[keys[middle]], strings[values[middle]]) < (key, value):
+                low = middle + 1
+            else:
+                high = middle
+
+        if low == len(keys):
+            return ()
+        if strings[keys[low]] != key or strings[values[low]] != value:
+            return ()
+
+        offsets = self._pair_offsets
+        return self._pair_postings[offsets[low]:offsets[low + 1]]
+
+    def _find_in_postings(self, posting_lists, start, end, query) -> Iterator[int]:
+        """
+        Intersect the `posting_lists` in the range `start` - `end`, from the
+        shortest one.
+        """
+        posting_lists = sorted(
+            (
+                postings[bisect_left(postings, start):bisect_left(postings, end)]
+                for postings in posting_lists
+            ),
+            key=len,
+        )
+        shortest = posting_lists[0]
+        others = posting_lists[1:]
+
+        name_id = None
+        if query.name and query.case_sensitive:
+            name_id = self._name_ids.get(query.name)
+            if name_id is None:
+                return
+
+        names = self.names
+        for index in shortest:
+            if name_id is not None and names[index] != name_id:
+                continue
+
+            if all(_contains(postings, index) for postings in others):
+                yield index
+
+    def _content_text(self, index: int) -> str:
+        """
+        All texts in the sub-tree of `index`, like
+        :meth:`.Tag.content_without_tags`.
+        """
+        kinds = self.kinds
+        return "".join(
+            self._text(item)
+            for item in range(index + 1, self.subtree_ends[index] + 1)
+            if kinds[item] in _TEXT_KINDS
+        )
+
+    def _parameters(self, index: int) -> dict:
+        strings = self.strings
+        keys = self.keys
+        values = self.values
+
+        parameters = self._dict_class()
+        for position in range(self.parameter_starts[index], self.parameter_ends[index]):
+            parameters[strings[keys[position]]] = strings[values[position]]
+
+        return parameters
+
+    def _get_root(self) -> "CompactNode":
+        first_child = self.first_children[0]
+        if (
+            first_child != -1
+            and self.next_siblings[first_child] == -1
+            and self.kinds[first_child] == TAG
+        ):
+            return CompactNode(self, first_child)
+
+        return CompactNode(self, 0)
+
+    def _text(self, index: int) -> str:
+        if self.kinds[index] == TEXT:
+            return self.string[self.starts[index]:self.ends[index]]
+
+        return self.strings[self.names[index]]
+
+    def _item(self, index: int) -> Union["CompactNode", str, Comment]:
+        kind = self.kinds[index]
+        if kind == TAG:
+            return CompactNode(self, index)
+        elif kind == COMMENT:
+            return Comment(self.strings[self.names[index]])
+
+        return self._text(index)
+
+
+class CompactNode:
+    """
+    Read-only view of the tag in the :class:`CompactDocument`, with the same
+    API as :class:`.Tag` for reading and searching.
+
+    Attributes:
+        document (CompactDocument): Document of the tag.
+        index (int): Index of the tag in the arrays of the document.
+    """
+    __slots__ = ("document", "index")
+
+    def __init__(self, document: CompactDocument, index: int):
+        self.document = document
+        self.index = index
+
+    @property
+    def name(self) -> str:
+        return self.document.strings[self.document.names[self.index]]
+
+    @property
+    def is_non_pair(self) -> bool:
+        return bool(self.document.non_pairs[self.index])
+
+    @property
+    def parameters(self) -> dict:
+        """
+        New dictionary with the parameters of the tag.
+        """
+        return self.document._parameters(self.index)
+
+    @property
+    def p(self) -> dict:
+        return self.parameters
+
+    @property
+    def parent(self) -> Optional["CompactNode"]:
+        parent = self.document.parents[self.index]
+        if parent == -1:
+            return None
+
+        return CompactNode(self.document, parent)
+
+    @property
+    def content(self) -> List[Union["CompactNode", str, Comment]]:
+        return [self.document._item(index) for index in self._child_indexes()]
+
+    @property
+    def c(self):
+        return self.content
+
+    @property
+    def tags(self) -> List["CompactNode"]:
+        kinds = self.document.kinds
+        return [
+            CompactNode(self.document, index)
+            for index in self._child_indexes()
+            if kinds[index] == TAG
+        ]
+
+    @property
+    def start(self) -> Optional[int]:
+        return _span_offset(self.document.starts[self.index])
+
+    @property
+    def end(self) -> Optional[int]:
+        return _span_offset(self.document.ends[self.index])
+
+    def _child_indexes(self) -> Iterator[int]:
+        next_siblings = self.document.next_siblings
+        index = self.document.first_children[self.index]
+        while index != -1:
+            yield index
+            index = next_siblings[index]
+
+    def content_without_tags(self) -> str:
+        return self.document._content_text(self.index)
+
+    def depth_first_iterator(
+        self, tags_only=False
+    ) -> Iterator[Union["CompactNode", str, Comment]]:
+        document = self.document
+        kinds = document.kinds
+        for index in range(self.index, document.subtree_ends[self.index] + 1):
+            if kinds[index] == TAG:
+                yield CompactNode(document, index)
+            elif not tags_only:
+                yield document._item(index)
+
+    def find_depth_first_iter(
+        self, name, p=None, fn=None, case_sensitive=False
+    ) -> Iterator["CompactNode"]:
+        query = compile_query(name, p, fn, case_sensitive)
+        document = self.document
+
+        check = query.parameters or query.fn is not None
+        for index in document._find_indexes(self.index, query):
+            node = CompactNode(document, index)
+            if not check or query.matches(node):
+                yield node
+
+    def find(self, name, p=None, fn=None, case_sensitive=False) -> List["CompactNode"]:
+        """
+        Same as :meth:`.Tag.find`.
+        """
+        return list(self.find_depth_first_iter(name, p, fn, case_sensitive))
+
+    def to_tag(self) -> Tag:
+        """
+        Create :class:`.Tag` tree of this node and its content.
+        """
+        document = self.document
+        kinds = document.kinds
+
+        tags = {}
+        root = None
+        for index in range(self.index, document.subtree_ends[self.index] + 1):
+            if kinds[index] == TAG:
+                node = CompactNode(document, index)
+                item = Tag(node.name, node.parameters, is_non_pair=node.is_non_pair)
+                tags[index] = item
+            else:
+                item = document._item(index)
+
+            parent = tags.get(document.parents[index])
+            if index == self.index or parent is None:
+                root = item
+                continue
+
+            parent.content.append(item)
+            if isinstance(item, Tag):
+                item.parent = parent
+
+        return root
+
+    def to_string(self) -> str:
+        return self.to_tag().to_string()
+
+    def __str__(self) -> str:
+        return self.to_string()
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.name!r}, "
+            f"parameters={self.parameters!r}, is_non_pair={self.is_non_pair})"
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, CompactNode):
+            return False
+
+        return self.document is other.document and self.index == other.index
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash((id(self.document), self.index))
+
+    def __getitem__(self, item):
+        if isinstance(item, str):
+            return self.parameters[item]
+
+        return self.tags[item]
+
+    def __contains__(self, item):
+        if isinstance(item, str):
+            return item in self.parameters
+
+        return item in self.content
+
+    def __iter__(self):
+        return iter(self.tags)
+
+    def __len__(self):
+        return len(self.tags)
+
+    def __bool__(self):
+        return self.document.first_children[self.index] != -1
@@ -0,0 +1,108 @@
+"""
+This module detects encoding of HTML/XML documents given as bytes.
+
+The encoding is taken from the byte order mark, XML declaration or
+``<meta charset>`` / ``<meta http-equiv="Content-Type">``, in this order.
+Only the first :data:`SNIFF_LENGTH` bytes are examined.
+"""
+import re
+import codecs
+from typing import Tuple
+
+
+#: How many bytes from the start of the document are examined.
+SNIFF_LENGTH = 4096
+
+#: Encoding used when nothing is declared.
+DEFAULT_ENCODING = "utf-8"
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+_XML_DECLARATION_RE = re.compile(
+    rb"""^\s*<\?xml[^>]*?encoding\s*=\s*["']\s*([A-Za-z0-9._:-]+)"""
+)
+_META_CHARSET_RE = re.compile(
+    rb"""<meta\s[^>]*?charset\s*=\s*["']?\s*([A-Za-z0-9._:-]+)""", re.IGNORECASE
+)
+
+
+def _normalize(name) -> str:
+    """
+    Return canonical python name of the encoding, or None if unknown.
+    """
+    if isinstance(name, bytes):
+        name = name.decode("ascii")
+
+    try:
+        name = codecs.lookup(name).name
+    except LookupError:
+        return None
+
+    # document which can be read as ascii can't be really in utf-16
+    if name.startswith("utf-16"):
+        return "utf-8"
+
+    return name
+
+
+def sniff_encoding(data: bytes, default: str = DEFAULT_ENCODING) -> Tuple[str, int]:
+    """
+    Detect encoding of the document in `data`.
+
+    Example usage::
+
+        >>> sniff_encoding(b'<meta charset="windows-1250"><p>...')
+        ('cp1250', 0)
+
+    Args:
+        data (bytes): Document, or at least its first :data:`SNIFF_LENGTH`
+            bytes.
+        default (str): Encoding used when nothing is declared.
+
+    Returns:
+        tuple: ``(encoding, bom_length)``.
+    """
+    head = bytes(data[:SNIFF_LENGTH])
+
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+
+    declaration = _XML_DECLARATION_RE.match(head)
+    if declaration:
+        encoding = _normalize(declaration.group(1))
+        if encoding:
+            return encoding, 0
+
+    for meta in _META_CHARSET_RE.finditer(head):
+        encoding = _normalize(meta.group(1))
+        if encoding:
+            return encoding, 0
+
+    return default, 0
+
+
+def decode(data: bytes, encoding: str = None) -> Tuple[str, str]:
+    """
+    Decode `data` to string, without copying the BOM-stripped bytes.
+
+    Args:
+        data (bytes): Document.
+        encoding (str): Use this encoding instead of the detected one. The
+            BOM is still removed. Default None.
+
+    Returns:
+        tuple: ``(string, encoding)``.
+    """
+    detected_encoding, bom_length = sniff_encoding(data)
+    if encoding is None:
+        encoding = detected_encoding
+
+    with memoryview(data) as view:
+        string = str(view[bom_length:], encoding, "replace")
+
+    return string, encoding
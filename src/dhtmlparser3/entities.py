@@ -0,0 +1,140 @@
+"""
+This module decodes HTML character references (entities) using the complete
+HTML5 table, including the legacy forms without the trailing semicolon.
+
+Named references are resolved with the longest-prefix rule used by browsers,
+so ``&notit;`` decodes to ``¬it;`` while ``&notin;`` decodes to ``∉``.
+"""
+import re
+from html.entities import html5
+
+
+#: Complete HTML5 table of named references, ``"amp;" -> "&"``. Names without
+#: the trailing semicolon are the legacy forms allowed without it.
+ENTITIES = html5
+
+#: Length of the longest entity name, including the semicolon.
+MAX_NAME_LENGTH = max(len(name) for name in ENTITIES)
+
+# names which may be used without the trailing semicolon; longest first, so
+# that the first prefix hit is the longest match
+_LEGACY_NAMES = {name for name in ENTITIES if not name.endswith(";")}
+_LEGACY_LENGTHS = sorted({len(name) for name in _LEGACY_NAMES}, reverse=True)
+
+_ENTITY_RE = re.compile(
+    r"&(?:#[xX]([0-9a-fA-F]+);?|#([0-9]+);?|([A-Za-z][A-Za-z0-9]*)(;?))"
+)
+_ALNUM_OR_EQ_RE = re.compile(r"[A-Za-z0-9=]")
+
+# number of digits of the highest code point (0x10FFFF)
+_MAX_DIGITS = {16: len("10FFFF"), 10: len("1114111")}
+
+
+def _digits_to_text(digits: str, base: int) -> str:
+    # overlong numbers are out of range anyway; converting them could be slow
+    # or even raise ValueError (limit of the int() digits)
+    digits = digits.lstrip("0")
+    if len(digits) > _MAX_DIGITS[base]:
+        return "�"
+
+    return _codepoint_to_text(int(digits or "0", base))
+
+
+def _codepoint_to_text(number: int) -> str:
+    if number == 0 or number > 0x10FFFF or 0xD800 <= number <= 0xDFFF:
+        return "�"
+
+    # numeric references in the C1 range are interpreted as windows-1252
+    if 0x80 <= number <= 0x9F:
+        try:
+            return bytes((number,)).decode("cp1252")
+        except UnicodeDecodeError:
+            pass
+
+    return chr(number)
+
+
+def match(string: str, pos: int = 0, in_attribute: bool = False):
+    """
+    Match character reference starting at `pos` (which should point to ``&``).
+
+    Args:
+        string (str): Source string.
+        pos (int): Position of the ``&`` character.
+        in_attribute (bool): Use the attribute value rules, where legacy
+            references followed by alphanumeric char or ``=`` are not decoded.
+
+    Returns:
+        tuple: ``(decoded_text, end)`` or None if there is no reference.
+    """
+    found = _ENTITY_RE.match(string, pos)
+    if found is None:
+        return None
+
+    hex_number, dec_number, name, semicolon = found.groups()
+    if hex_number is not None:
+        return _digits_to_text(hex_number, 16), found.end()
+
+    if dec_number is not None:
+        return _digits_to_text(dec_number, 10), found.end()
+
+    if semicolon:
+        text = ENTITIES.get(name + ";")
+        if text is not None:
+            return text, found.end()
+
+    # longest legacy name, which is a prefix of the `name`
+    name_start = pos + 1
+    for length in _LEGACY_LENGTHS:
+        if length > len(name):
+            continue
+
+        prefix = name[:length]
+        if prefix not in _LEGACY_NAMES:
+            continue
+
+        end = name_start + length
+        if in_attribute and _ALNUM_OR_EQ_RE.match(string, end):
+            return None
+
+        return ENTITIES[prefix], end
+
+    return None
+
+
+def decode(string: str, in_attribute: bool = False) -> str:
+    """
+    Decode all character references in `string` in one pass.
+
+    Example usage::
+
+        >>> decode("&lt;b&gt; &amp; &copy2024")
+        '<b> & ©2024'
+
+    Args:
+        string (str): String with the references.
+        in_attribute (bool): Use the attribute value rules. Default False.
+
+    Returns:
+        str: Decoded string.
+    """
+    if "&" not in string:
+        return string
+
+    output = []
+    last_end = 0
+    pos = string.find("&")
+    while pos != -1:
+        matched = match(string, pos, in_attribute)
+        if matched is None:
+            pos = string.find("&", pos + 1)
+            continue
+
+        text, end = matched
+        output.append(string[last_end:pos])
+        output.append(text)
+        last_end = end
+        pos = string.find("&", end)
+
+    output.append(string[last_end:])
+    return "".join(output)
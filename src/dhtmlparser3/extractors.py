@@ -0,0 +1,225 @@
+"""
+This module extracts common data (links, images, ``<meta>`` tags, title)
+directly from the string, without building the DOM.
+
+The string is scanned only for the interesting tags, everything else is
+skipped by the regular expression engine. Comments and the content of
+``<script>`` and ``<style>`` tags are skipped too, so the links in them are
+not extracted.
+
+Example usage::
+
+    >>> extract_links('<a href="/a?b=1&amp;c=2">x</a><a name=x>', "http://h/")
+    ['http://h/a?b=1&c=2']
+"""
+import re
+from typing import Dict
+from typing import List
+from typing import Tuple
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+from urllib.parse import urljoin
+
+from dhtmlparser3 import entities
+
+
+# tags, which contain raw text, where the tags are not recognized
+_RAW_TEXT_TAGS = ("script", "style", "textarea", "title")
+
+_ATTRIBUTE_RE = re.compile(
+    r"""([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]*)))?"""
+)
+
+_tag_res = {}
+
+
+def _get_tag_re(names: Tuple[str, ...]):
+    tag_re = _tag_res.get(names)
+    if tag_re is not None:
+        return tag_re
+
+    alternatives = "|".join(
+        re.escape(name) for name in sorted(set(names) | set(_RAW_TEXT_TAGS))
+    )
+    # unquoted part of the tag ends at the next "<" (like in the tokenizer),
+    # so the unterminated tag is not scanned to the end of the input
+    tag_re = re.compile(
+        r"<(?:!--.*?(?:-->|\Z)|(%s)(?=[\s/>])((?:\"[^\"]*\"|'[^']*'|[^'\"<>])*)>)"
+        % alternatives,
+        re.IGNORECASE | re.DOTALL,
+    )
+    _tag_res[names] = tag_re
+
+    return tag_re
+
+
+def _parse_attributes(string: str) -> Dict[str, str]:
+    attributes = {}
+    for match in _ATTRIBUTE_RE.finditer(string):
+        key = match.group(1).lower()
+        if key in attributes:  # first one wins, as in the browsers
+            continue
+
+        value = match.group(2)
+        if value is None:
+            value = match.group(3)
+        if value is None:
+            value = match.group(4)
+        if value is None:
+            value = ""
+
+        if "&" in value:
+            value = entities.decode(value, in_attribute=True)
+
+        attributes[key] = value
+
+    return attributes
+
+
+def _scan(
+    string: str, names: Iterable[str]
+) -> Iterator[Tuple[str, Dict[str, str], int]]:
+    names = tuple(sorted(name.lower() for name in names))
+    tag_re = _get_tag_re(names)
+
+    pos = 0
+    while True:
+        match = tag_re.search(string, pos)
+        if match is None:
+            return
+
+        pos = match.end()
+        name = match.group(1)
+        if name is None:  # comment
+            continue
+
+        name = name.lower()
+        if name in names:
+            yield name, _parse_attributes(match.group(2)), pos
+
+        if name in _RAW_TEXT_TAGS:
+            end = _find_closing_tag(string, name, pos)
+            if name in names:
+                yield f"/{name}", {}, end
+
+            pos = end
+
+
+def _find_closing_tag(string: str, name: str, pos: int) -> int:
+    closing_re = re.compile(r"</%s[\s/>]" % name, re.IGNORECASE)
+    match = closing_re.search(string, pos)
+    if match is None:
+        return len(string)
+
+    return match.start()
+
+
+def scan_tags(
+    string: str, names: Iterable[str]
+) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    Find opening tags with given `names` in the `string`.
+
+    Example usage::
+
+        >>> list(scan_tags('<A HREF=x>a</A><img src=y>', ["a", "img"]))
+        [('a', {'href': 'x'}), ('img', {'src': 'y'})]
+
+    Args:
+        string (str): HTML.
+        names (iterable): Names of the tags (case insensitive).
+
+    Yields:
+        tuple: ``(name, attributes)``. Name and keys of the attributes are
+            lowercase, values have decoded entities.
+    """
+    for name, attributes, _ in _scan(string, names):
+        if not name.startswith("/"):
+            yield name, attributes
+
+
+def _extract_parameter(string, names, parameter, base_url):
+    values = []
+    for _, attributes in scan_tags(string, names):
+        value = attributes.get(parameter)
+        if value is None:
+            continue
+
+        value = value.strip()
+        if base_url is not None:
+            value = urljoin(base_url, value)
+
+        values.append(value)
+
+    return values
+
+
+def extract_links(
+    string: str, base_url: str = None, tags: Iterable[str] = ("a", "area")
+) -> List[str]:
+    """
+    Return `href` of all links, in the order of the document.
+
+    Args:
+        string (str): HTML.
+        base_url (str): Make the links absolute using this URL. Default None.
+        tags (iterable): Names of the tags with the links. Default ``a`` and
+            ``area``.
+
+    Returns:
+        list: Links.
+    """
+    return _extract_parameter(string, tags, "href", base_url)
+
+
+def extract_images(string: str, base_url: str = None) -> List[str]:
+    """
+    Return `src` of all ``<img>`` tags, in the order of the document.
+
+    Args:
+        string (str): HTML.
+        base_url (str): Make the URLs absolute using this URL. Default None.
+
+    Returns:
+        list: URLs of the images.
+    """
+    return _extract_parameter(string, ("img",), "src", base_url)
+
+
+def extract_meta(string: str) -> List[Dict[str, str]]:
+    """
+    Return parameters of all ``<meta>`` tags.
+
+    Example usage::
+
+        >>> extract_meta('<meta charset=utf-8><meta name="author" content="B">')
+        [{'charset': 'utf-8'}, {'name': 'author', 'content': 'B'}]
+
+    Args:
+        string (str): HTML.
+
+    Returns:
+        list: Dicts with lowercase keys.
+    """
+    return [attributes for _, attributes in scan_tags(string, ("meta",))]
+
+
+def extract_title(string: str) -> Optional[str]:
+    """
+    Return text of the first ``<title>`` tag, with decoded entities.
+
+    Args:
+        string (str): HTML.
+
+    Returns:
+        str: Title, or None if there is no title.
+    """
+    start = None
+    for name, _, pos in _scan(string, ("title",)):
+        if name == "title":
+            start = pos
+        else:
+            return entities.decode(string[start:pos])
+
+    return None
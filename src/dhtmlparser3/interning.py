@@ -0,0 +1,105 @@
+"""
+This module shares identical sub-trees (headers, footers, navigation, ..)
+between many parsed documents.
+
+Example usage::
+
+    >>> store = InternStore()
+    >>> doms = [store.intern(dhtmlparser3.parse(page)) for page in pages]
+
+:meth:`InternStore.intern` replaces the content of the document with
+:class:`.SharedTag` views of frozen templates. Each distinct sub-tree
+(recognized by :meth:`.Tag.fingerprint`) is stored only once, no matter in
+how many documents or places it is used. Views are created lazily, when the
+content is accessed, and copy the shared parameters on the first
+modification (copy-on-write), so the documents can be used and modified as
+usual. :meth:`.Tag.find` and :meth:`.Tag.to_string` read the untouched
+sub-trees directly from the templates.
+"""
+from dhtmlparser3.tags.tag import Tag
+from dhtmlparser3.tags.shared_tag import SharedTag
+
+
+class InternStore:
+    """
+    Store of the frozen templates of the sub-trees, indexed by their
+    fingerprints.
+    """
+    def __init__(self):
+        self._templates = {}
+        self._strings = {}
+
+    def __len__(self) -> int:
+        """
+        Number of distinct sub-trees in the store.
+        """
+        return len(self._templates)
+
+    def __contains__(self, tag: Tag) -> bool:
+        return tag.fingerprint() in self._templates
+
+    def intern(self, dom: Tag) -> Tag:
+        """
+        Replace the sub-tags of the `dom` with the views of the shared
+        templates.
+
+        The root stays the same object, but its sub-tags are replaced, so
+        the tags you got from the `dom` before are no longer part of it.
+        Source spans are not kept, ``.to_string(preserve_source=True)``
+        regenerates the interned sub-trees.
+
+        Args:
+            dom (Tag): Parsed document.
+
+        Returns:
+            Tag: The `dom`.
+        """
+        dom.fingerprint()
+
+        # tags are collected in the pre-order, so the reversed order creates
+        # templates of the sub-tags before their parents
+        pending = []
+        stack = [item for item in dom.content if isinstance(item, Tag)]
+        while stack:
+            tag = stack.pop()
+            if tag._fingerprint in self._templates:
+                continue
+
+            pending.append(tag)
+            stack.extend(item for item in tag.content if isinstance(item, Tag))
+
+        for tag in reversed(pending):
+            if tag._fingerprint not in self._templates:
+                self._templates[tag._fingerprint] = self._make_template(tag)
+
+        dom.content = self._template_content(dom, dom)
+        return dom
+
+    def _make_template(self, tag: Tag) -> Tag:
+        template = Tag(
+            tag.name,
+            tag.parameters.copy(),
+            self._template_content(tag),
+            tag.is_non_pair,
+        )
+        template._fingerprint = tag._fingerprint
+
+        return template
+
+    def _template_content(self, tag: Tag, parent: Tag = None) -> list:
+        """
+        Convert the content of the `tag` to the shared templates, or to the
+        views of them, if the `parent` is set.
+        """
+        content = []
+        for item in tag.content:
+            if isinstance(item, Tag):
+                item = self._templates[item._fingerprint]
+                if parent is not None:
+                    item = SharedTag(item, parent)
+            elif isinstance(item, str):
+                item = self._strings.setdefault(item, item)
+
+            content.append(item)
+
+        return content
@@ -0,0 +1,190 @@
+"""
+This module contains the lazy DOM, which creates the :class:`.Tag` objects
+only for the parts of the document you actually use.
+
+Example usage::
+
+    >>> dom = parse_lazy(huge_html)
+    >>> dom.find("title")[0].content_without_tags()  # rest stays unmaterialized
+
+The document is parsed to :class:`.CompactDocument`, which records only the
+structure of the tree in arrays. :class:`LazyTag` creates its parameters and
+content on the first access. Searching (:meth:`.Tag.find`) in the unmodified
+sub-trees uses the name index of the compact document and creates only the
+tags on the path to the results.
+
+Lazy tags are regular :class:`.Tag` instances and can be modified as usual.
+Modified sub-trees are searched by the regular traversal. The parameters and
+the content handed out by :attr:`LazyTag.parameters` and
+:attr:`LazyTag.content` may be modified directly, so they make the tag and
+its parents modified as well.
+"""
+from typing import Iterator
+from typing import Optional
+
+from dhtmlparser3.query import compile_query
+from dhtmlparser3.compact import TAG
+from dhtmlparser3.compact import CompactNode
+from dhtmlparser3.compact import CompactDocument
+from dhtmlparser3.tags.tag import Tag
+
+
+class LazyTag(Tag):
+    """
+    Tag backed by the node of the :class:`.CompactDocument`.
+    """
+    # True until the parameters or the content of the tag or of some tag in
+    # its sub-tree are handed out or modified, so the compact document still
+    # describes the sub-tree
+    _pristine = True
+
+    def __init__(self, document: CompactDocument, index: int, parent: Tag = None):
+        self.name = document.strings[document.names[index]]
+        self.is_non_pair = bool(document.non_pairs[index])
+        self.parent = parent
+        self.start = document.starts[index]
+        self.end = document.ends[index]
+
+        self._document = document
+        self._index = index
+        self._parameters = None
+        self._content = None
+        self._child_tags = None  # compact index -> LazyTag
+        self._wfind_only_on_content = False
+
+    @property
+    def parameters(self):
+        self._set_modified()
+
+        parameters = self._parameters
+        if parameters is None:
+            parameters = self._document._parameters(self._index)
+            self._parameters = parameters
+
+        return parameters
+
+    @parameters.setter
+    def parameters(self, parameters):
+        self._mark_dirty(tag=True)
+        self._parameters = parameters
+
+    @property
+    def content(self):
+        self._set_modified()
+        return self._materialize_content()
+
+    @content.setter
+    def content(self, content):
+        self._mark_dirty(content=True)
+        self._content = content
+        self._child_tags = None
+
+    def _materialize_content(self) -> list:
+        content = self._content
+        if content is None:
+            document = self._document
+            kinds = document.kinds
+            next_siblings = document.next_siblings
+
+            content = []
+            child_tags = {}
+            index = document.first_children[self._index]
+            while index != -1:
+                if kinds[index] == TAG:
+                    tag = LazyTag(document, index, self)
+                    child_tags[index] = tag
+                    content.append(tag)
+                else:
+                    content.append(document._item(index))
+                index = next_siblings[index]
+
+            self._content = content
+            self._child_tags = child_tags
+
+        return content
+
+    @property
+    def is_materialized(self) -> bool:
+        """
+        Was the content of this tag already created?
+        """
+        return self._content is not None
+
+    def _set_modified(self):
+        item = self
+        while isinstance(item, LazyTag) and item._pristine:
+            item._pristine = False
+            item = item.parent
+
+    def _mark_dirty(self, tag=False, content=False):
+        self._set_modified()
+        super()._mark_dirty(tag, content)
+
+    def content_without_tags(self) -> str:
+        if self._pristine:
+            return self._document._content_text(self._index)
+
+        return super().content_without_tags()
+
+    def _find_shortcut(self, query) -> Optional[Iterator["LazyTag"]]:
+        if self._pristine:
+            return self._find_pristine(query)
+
+        return None
+
+    def _find_pristine(self, query) -> Iterator["LazyTag"]:
+        document = self._document
+
+        # parameters are checked without creating the tag, `fn` gets the
+        # real one
+        parameters = compile_query("", dict(query.parameters)).matches
+        for index in document._find_indexes(self._index, query):
+            if query.parameters and not parameters(CompactNode(document, index)):
+                continue
+
+            tag = self._tag_at(index)
+            if query.fn is None or query.fn(tag):
+                yield tag
+
+    def _tag_at(self, index: int) -> "LazyTag":
+        """
+        Return the tag for the node `index` of the compact document in the
+        sub-tree, creating only the content of the tags on the path to it.
+        """
+        parents = self._document.parents
+
+        path = []
+        while index != self._index:
+            path.append(index)
+            index = parents[index]
+
+        # tags in the pristine sub-tree have their original content, or none
+        tag = self
+        for index in reversed(path):
+            if tag._content is None:
+                tag._materialize_content()
+
+            tag = tag._child_tags[index]
+
+        return tag
+
+
+def parse_lazy(string: str, case_insensitive_parameters=True) -> Tag:
+    """
+    Parse `string` into lazy DOM, see :mod:`dhtmlparser3.lazy`.
+
+    Args:
+        string (str): HTML/XML string.
+        case_insensitive_parameters (bool): Compare parameter names case
+            insensitively. Default True.
+
+    Returns:
+        LazyTag: Root of the DOM, like the one from :func:`.parse`.
+    """
+    document = CompactDocument(string, case_insensitive_parameters)
+
+    container = LazyTag(document, 0)
+    if document.root.index != 0:
+        return container._materialize_content()[0]
+
+    return container
@@ -1,14 +1,30 @@
 import gc
+from typing import List
 
 from dhtmlparser3.tokens import TextToken
 from dhtmlparser3.tokens import CommentToken
+from dhtmlparser3.source import Source
 from dhtmlparser3.tokenizer import Tokenizer
+from dhtmlparser3.tokenizer import IncrementalTokenizer
 from dhtmlparser3.specialdict import SpecialDict
 
 from dhtmlparser3.tags.tag import Tag
 from dhtmlparser3.tags.comment import Comment
 
 
+def _index_of(items: list, item) -> int:
+    """
+    Like `items.index(item)`, but compare by identity. Returns -1 if not found.
+
+    Tags equal by name and parameters may be at several places in the DOM.
+    """
+    for index in range(len(items) - 1, -1, -1):
+        if items[index] is item:
+            return index
+
+    return -1
+
+
 class Parser:
     NONPAIR_TAGS = {
         "br",
@@ -22,38 +38,78 @@ class Parser:
         "base",
     }
 
-    def __init__(self, string: str, case_insensitive_parameters=True):
+    def __init__(
+        self, string: str, case_insensitive_parameters=True, lazy_entities=False
+    ):
         # remove UTF BOM (prettify fails if not)
-        if len(string) > 3 and string[:3] == "\xef\xbb\xbf":
-            string = string[3:]
+        if string.startswith("\ufeff"):
+            string = string[1:]
 
         if case_insensitive_parameters:
             Tag._DICT_INSTANCE = SpecialDict
         else:
             Tag._DICT_INSTANCE = dict
 
-        self.tokenizer = Tokenizer(string)
+        self.source = Source(string)
+        self.tokenizer = Tokenizer(string, lazy_entities)
 
     def parse_dom(self) -> Tag:
         gc.disable()
 
-        root_elem = Tag("")
+        self._start_dom(self.source)
+        self._feed_tokens(self.tokenizer.tokenize_iter())
+        self._close_dom()
+
+        gc.enable()
+
+        return self._get_dom()
+
+    def _start_dom(self, source):
+        self.root_elem = Tag("")
+        self.root_elem.start = 0
+        self.root_elem._tag_end = 0
+        self.root_elem.source = source
+
+        if source is not None:
+            self.root_elem.end = len(source)
+            self.root_elem._content_end = len(source)
+
+        self.element_stack = [self.root_elem]
+
+    def _feed_tokens(self, tokens, closed=None):
+        """
+        Add `tokens` to the DOM.
 
-        top_element = root_elem
-        element_stack = [root_elem]
-        for token in self.tokenizer.tokenize_iter():
+        Args:
+            tokens (iterable): Tokens from the tokenizer.
+            closed (list): If set, tags are appended to it once they are
+                complete.
+        """
+        source = self.source
+        element_stack = self.element_stack
+        top_element = element_stack[-1]
+        for token in tokens:
             if isinstance(token, TextToken):
                 top_element.content.append(token.content)
                 continue
 
             elif isinstance(token, CommentToken):
-                top_element.content.append(Comment(token.content))
+                comment = Comment(token.content)
+                comment.start = token.start
+                comment.end = token.end
+                comment.source = source
+                top_element.content.append(comment)
                 continue
 
             elif token.is_non_pair:
                 tag = token.to_tag()
+                tag.start = token.start
+                tag.end = tag._tag_end = tag._content_end = token.end
+                tag.source = source
                 tag.parent = top_element
                 top_element.content.append(tag)
+                if closed is not None:
+                    closed.append(tag)
                 continue
 
             elif token.is_end_tag:
@@ -66,33 +122,47 @@ class Parser:
                     continue
 
                 closed_element = closed_element[0]
+                closed_element._content_end = token.start
+                closed_element.end = token.end
 
                 # correctly closed element on top of the stack
                 if closed_element is top_element:
                     element_stack.pop()
                     top_element = element_stack[-1]
+                    if closed is not None:
+                        closed.append(closed_element)
                     continue
 
-                top_element = self._reshape_non_pair_tags(element_stack, closed_element)
+                top_element = self._reshape_non_pair_tags(
+                    element_stack, closed_element, closed
+                )
+                if closed is not None:
+                    closed.append(closed_element)
                 continue
 
             new_top_element = token.to_tag()
+            new_top_element.start = token.start
+            new_top_element.end = token.end
+            new_top_element._tag_end = token.end
+            new_top_element._content_end = token.end
+            new_top_element.source = source
             top_element.content.append(new_top_element)
             new_top_element.parent = top_element
             element_stack.append(new_top_element)
             top_element = new_top_element
 
-        if len(element_stack) > 1:
-            self._reshape_non_pair_tags(element_stack, root_elem)
-
-        gc.enable()
+    def _close_dom(self, closed=None):
+        if len(self.element_stack) > 1:
+            self._reshape_non_pair_tags(self.element_stack, self.root_elem, closed)
 
+    def _get_dom(self) -> Tag:
+        root_elem = self.root_elem
         if len(root_elem.content) == 1 and isinstance(root_elem.content[0], Tag):
             return root_elem.content[0]
 
         return root_elem
 
-    def _reshape_non_pair_tags(self, element_stack, closed_element):
+    def _reshape_non_pair_tags(self, element_stack, closed_element, closed=None):
         """
         Used for non_pair tags, which are parsed like this:
 
@@ -111,7 +181,7 @@ class Parser:
             <hr>
         """
         # find which one was closed and treat all others as nonpair
-        closed_element_index = element_stack.index(closed_element) + 1
+        closed_element_index = _index_of(element_stack, closed_element) + 1
         non_pairs = element_stack[closed_element_index:]
         new_element_stack = element_stack[:closed_element_index]
         element_stack.clear()
@@ -126,6 +196,9 @@ class Parser:
             npt.is_non_pair = True
             npt.parent = closed_element
 
+        if closed is not None:
+            closed.extend(non_pairs)
+
         if element_stack:
             element_stack.pop()
 
@@ -141,12 +214,101 @@ class Parser:
         if not non_pair_tag.content:
             return
 
-        try:
-            npt_index_in_parent = parent.content.index(non_pair_tag)
-        except ValueError:
+        npt_index_in_parent = _index_of(parent.content, non_pair_tag)
+        if npt_index_in_parent == -1:
             npt_index_in_parent = 0
 
         for sub_tag in reversed(non_pair_tag.content):
             parent.content.insert(npt_index_in_parent + 1, sub_tag)
 
-        non_pair_tag.content.clear()
\ No newline at end of file
+        non_pair_tag.content.clear()
+
+
+class StreamParser(Parser):
+    """
+    Parser fed by chunks of the string, so the whole string doesn't have to be
+    in the memory.
+
+    Example:
+        parser = StreamParser()
+        for chunk in chunks:
+            for tag in parser.feed(chunk):
+                ...  # tag is complete, including the content
+        parser.close()
+        dom = parser.get_dom()
+    """
+
+    def __init__(
+        self, case_insensitive_parameters=True, lazy_entities=False, keep_source=False
+    ):
+        """
+        Args:
+            case_insensitive_parameters (bool): Compare parameter names case
+                insensitively. Default True.
+            lazy_entities (bool): See :class:`.Tokenizer`. Default False.
+            keep_source (bool): Keep the fed string, so the tags have
+                `.source` when the parsing is done. Default False.
+        """
+        super().__init__("", case_insensitive_parameters, lazy_entities)
+
+        self.tokenizer = IncrementalTokenizer(lazy_entities)
+        self.source = Source("") if keep_source else None
+        self._chunks = [] if keep_source else None
+        self._is_first_chunk = True
+
+        self._start_dom(self.source)
+
+    def feed(self, chunk: str) -> List[Tag]:
+        """
+        Parse `chunk`.
+
+        Returns:
+            list: Tags completed by this chunk, in the order of their closing.
+        """
+        if self._is_first_chunk and chunk:
+            self._is_first_chunk = False
+            if chunk.startswith("\ufeff"):
+                chunk = chunk[1:]
+
+        if self._chunks is not None:
+            self._chunks.append(chunk)
+
+        closed = []
+        gc.disable()
+        self._feed_tokens(self.tokenizer.feed(chunk), closed)
+        gc.enable()
+
+        return closed
+
+    def close(self) -> List[Tag]:
+        """
+        Parse the rest of the input and close all unclosed tags.
+
+        Returns:
+            list: Tags completed by closing the input.
+        """
+        closed = []
+        gc.disable()
+        self._feed_tokens(self.tokenizer.close(), closed)
+        self._close_dom(closed)
+        gc.enable()
+
+        length = self.tokenizer.offset
+        self.root_elem.end = length
+        self.root_elem._content_end = length
+
+        if self._chunks is not None:
+            self.source.string = "".join(self._chunks)
+            self._chunks = None
+
+        if self._is_first_chunk:
+            self.root_elem.content.append("")
+
+        return closed
+
+    def get_dom(self) -> Tag:
+        """
+        Returns:
+            Tag: Root of the DOM. Call :meth:`close` first.
+        """
+        return self._get_dom()
@@ -0,0 +1,517 @@
+"""
+This module transforms HTML on the token stream, without building the DOM.
+
+Tokens go from the tokenizer through the filter stages straight to the
+output. Tokens, which were not changed by the stages, are copied verbatim
+from the source, so the output differs from the input only in the changed
+parts.
+
+Example usage::
+
+    >>> pipeline = Pipeline(
+    ...     RewriteAttributes(lambda tag, key, value: value.upper(), {"href"}),
+    ...     StripComments(),
+    ... )
+    >>> pipeline.run('<a href="x.html" id=a>link</a><!-- c -->')
+    '<a href="X.HTML" id=a>link</a>'
+
+A stage is any callable, which takes an iterator of tokens and returns an
+iterator of tokens. Tokens with `.start` set are copied from the source, so
+set the `.start` to None (or yield new tokens) when you change them.
+"""
+import html
+from typing import Union
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+from dhtmlparser3 import entities
+from dhtmlparser3.quoter import escape
+from dhtmlparser3.tokens import Token
+from dhtmlparser3.tokens import TagToken
+from dhtmlparser3.tokens import TextToken
+from dhtmlparser3.tokens import CommentToken
+from dhtmlparser3.tokens import ParameterToken
+from dhtmlparser3.parser import Parser
+from dhtmlparser3.tokenizer import Tokenizer
+from dhtmlparser3.tokenizer import IncrementalTokenizer
+from dhtmlparser3.tags.tag import Tag
+from dhtmlparser3.tags.raw_text import RawText
+
+
+#: How many output parts are joined before they are written to the output.
+WRITE_BATCH = 1024
+
+
+class _SourceWindow:
+    """
+    Part of the source, which may still be needed for the verbatim copies.
+    """
+    def __init__(self, string="", offset=0):
+        self.string = string
+        self.offset = offset
+
+    def append(self, chunk):
+        self.string += chunk
+
+    def trim(self, offset):
+        if offset > self.offset:
+            self.string = self.string[offset - self.offset:]
+            self.offset = offset
+
+    def get(self, start, end):
+        if start is None or start < self.offset:
+            return None
+
+        return self.string[start - self.offset:end - self.offset]
+
+
+class Pipeline:
+    """
+    Chain of filter stages run on the token stream.
+
+    Attributes:
+        stages (list): Callables, each taking and returning an iterator of
+            tokens.
+    """
+    def __init__(self, *stages: Callable[[Iterator[Token]], Iterator[Token]]):
+        self.stages = list(stages)
+
+    def add(self, stage: Callable[[Iterator[Token]], Iterator[Token]]) -> "Pipeline":
+        """
+        Append `stage` to the end of the pipeline.
+
+        Returns:
+            Pipeline: self, so the calls may be chained.
+        """
+        self.stages.append(stage)
+        return self
+
+    def run(self, source: Union[str, Iterable[str]], output=None) -> Optional[str]:
+        """
+        Transform `source` and write the result to `output`.
+
+        Args:
+            source (str / iterable): String, or iterable of string chunks (like
+                file opened in text mode or :class:`.FileReader`). Chunks are
+                processed as they come, so the memory doesn't depend on the
+                size of the document.
+            output (obj): Object with `.write()` method. Default None.
+
+        Returns:
+            str: Transformed string if `output` is None, None otherwise.
+        """
+        window = _SourceWindow()
+        if isinstance(source, str):
+            window.string = source
+            tokens = Tokenizer(source, lazy_entities=True).tokenize_iter()
+        else:
+            tokens = self._iter_chunk_tokens(source, window)
+
+        for stage in self.stages:
+            tokens = stage(tokens)
+
+        if output is None:
+            return "".join(_serialize(tokens, window))
+
+        parts = []
+        for part in _serialize(tokens, window):
+            parts.append(part)
+            if len(parts) >= WRITE_BATCH:
+                output.write("".join(parts))
+                parts.clear()
+
+        output.write("".join(parts))
+
+    def _iter_chunk_tokens(self, chunks, window):
+        tokenizer = IncrementalTokenizer(lazy_entities=True)
+        for chunk in chunks:
+            window.append(chunk)
+            yield from tokenizer.feed(chunk)
+
+            # keep just the source of the text, which is still being joined
+            if tokenizer._text_pieces:
+                window.trim(tokenizer._text_start)
+            else:
+                window.trim(tokenizer.offset)
+
+        yield from tokenizer.close()
+
+
+def rewrite(
+    source: Union[str, Iterable[str]], *stages, output=None
+) -> Optional[str]:
+    """
+    Shortcut for ``Pipeline(*stages).run(source, output)``.
+    """
+    return Pipeline(*stages).run(source, output)
+
+
+def _serialize(tokens: Iterator[Token], window: _SourceWindow) -> Iterator[str]:
+    dont_escape = False
+    for token in tokens:
+        verbatim = window.get(token.start, token.end)
+
+        if isinstance(token, TagToken):
+            dont_escape = not token.is_end_tag and token.name in Tag._DONT_ESCAPE
+            if verbatim is None:
+                verbatim = _tag_token_to_str(token, window)
+
+        if verbatim is not None:
+            yield verbatim
+
+        elif isinstance(token, TextToken):
+            if isinstance(token.content, RawText):
+                yield token.content.raw
+            elif dont_escape:
+                yield token.content
+            else:
+                yield html.escape(token.content)
+
+        elif isinstance(token, CommentToken):
+            yield f"<!--{token.content}-->"
+
+        else:
+            yield token.to_text()
+
+
+def _tag_token_to_str(token: TagToken, window: _SourceWindow) -> str:
+    if token.is_end_tag:
+        return f"</{token.name}>"
+
+    parts = ["<", token.name]
+    for parameter in token.parameters:
+        parts.append(" ")
+
+        verbatim = window.get(parameter.start, parameter.end)
+        if verbatim is not None:
+            parts.append(verbatim)
+        elif isinstance(parameter.value, RawText):
+            parts.append(f'{parameter.key}="{escape(parameter.value.raw)}"')
+        elif parameter.value:
+            value = str(parameter.value).replace("&", "&amp;")
+            parts.append(f'{parameter.key}="{escape(value)}"')
+        else:
+            parts.append(parameter.key)
+
+    parts.append(" />" if token.is_non_pair else ">")
+
+    return "".join(parts)
+
+
+def _names_set(names: Iterable[str]):
+    if names is None:
+        return None
+
+    return {name.lower() for name in names}
+
+
+def _skip_content(tokens: Iterator[Token], name: str):
+    """
+    Consume `tokens` up to the closing tag of already opened tag `name`.
+    """
+    depth = 1
+    for token in tokens:
+        if not isinstance(token, TagToken) or token.name.lower() != name:
+            continue
+
+        if token.is_end_tag:
+            depth -= 1
+            if depth == 0:
+                return
+        elif not token.is_non_pair:
+            depth += 1
+
+
+class RewriteAttributes:
+    """
+    Change values of the tag parameters.
+
+    Args:
+        fn (callable): ``fn(tag_name, key, value)``, returns the new value, or
+            None to remove the parameter.
+        keys (iterable): Call the `fn` only for parameters with these names
+            (case insensitive). Default None for all parameters.
+        tags (iterable): Call the `fn` only for tags with these names. Default
+            None for all tags.
+    """
+    def __init__(
+        self,
+        fn: Callable[[str, str, str], Optional[str]],
+        keys: Iterable[str] = None,
+        tags: Iterable[str] = None,
+    ):
+        self.fn = fn
+        self.keys = _names_set(keys)
+        self.tags = _names_set(tags)
+
+    def __call__(self, tokens: Iterator[Token]) -> Iterator[Token]:
+        fn = self.fn
+        keys = self.keys
+        tags = self.tags
+        for token in tokens:
+            if (
+                isinstance(token, TagToken)
+                and token.parameters
+                and not token.is_end_tag
+                and (tags is None or token.name.lower() in tags)
+            ):
+                self._rewrite(token, fn, keys)
+
+            yield token
+
+    def _rewrite(self, token, fn, keys):
+        parameters = []
+        for parameter in token.parameters:
+            if keys is not None and parameter.key.lower() not in keys:
+                parameters.append(parameter)
+                continue
+
+            value = str(parameter.value)
+            new_value = fn(token.name, parameter.key, value)
+
+            if new_value is None:
+                token.start = None
+                continue
+
+            if new_value != value:
+                parameter = ParameterToken(parameter.key, new_value)
+                token.start = None
+
+            parameters.append(parameter)
+
+        token.parameters = parameters
+
+
+class DropTags:
+    """
+    Remove tags from the stream.
+
+    Args:
+        names (iterable): Names of the removed tags (case insensitive).
+        keep_content (bool): Keep everything in between the opening and
+            closing tag. Default False, which removes it too.
+    """
+    def __init__(self, names: Iterable[str], keep_content=False):
+        self.names = _names_set(names)
+        self.keep_content = keep_content
+
+    def __call__(self, tokens: Iterator[Token]) -> Iterator[Token]:
+        names = self.names
+        keep_content = self.keep_content
+
+        tokens = iter(tokens)
+        for token in tokens:
+            if not isinstance(token, TagToken):
+                yield token
+                continue
+
+            name = token.name.lower()
+            if name not in names:
+                yield token
+                continue
+
+            if keep_content or token.is_end_tag or token.is_non_pair:
+                continue
+
+            if name in Parser.NONPAIR_TAGS:
+                continue
+
+            _skip_content(tokens, name)
+
+
+class StripComments:
+    """
+    Remove all comments from the stream.
+    """
+    def __call__(self, tokens: Iterator[Token]) -> Iterator[Token]:
+        for token in tokens:
+            if not isinstance(token, CommentToken):
+                yield token
+
+
+#: Tags kept by the :class:`Sanitizer` by default.
+SAFE_TAGS = frozenset({
+    "a", "abbr", "b", "blockquote", "br", "code", "dd", "del", "div", "dl",
+    "dt", "em", "h1", "h2", "h3", "h4", "h5", "h6", "hr", "i", "img", "ins",
+    "kbd", "li", "ol", "p", "pre", "q", "s", "small", "span", "strong", "sub",
+    "sup", "table", "tbody", "td", "tfoot", "th", "thead", "tr", "u", "ul",
+})
+
+#: Parameters kept by the :class:`Sanitizer` by default, ``"*"`` for all tags.
+SAFE_PARAMETERS = {
+    "*": frozenset({"title"}),
+    "a": frozenset({"href"}),
+    "img": frozenset({"src", "alt", "width", "height"}),
+    "td": frozenset({"colspan", "rowspan"}),
+    "th": frozenset({"colspan", "rowspan"}),
+}
+
+#: Tags removed by the :class:`Sanitizer` including their content.
+UNSAFE_CONTENT_TAGS = frozenset({
+    "script", "style", "iframe", "object", "embed", "template", "noscript",
+})
+
+#: Parameters containing URL, which are checked for the allowed schemes.
+URL_PARAMETERS = frozenset({
+    "href", "src", "cite", "action", "formaction", "poster", "background",
+})
+
+#: URL schemes allowed by the :class:`Sanitizer`. Relative URLs are allowed.
+SAFE_URL_SCHEMES = frozenset({"http", "https", "mailto"})
+
+
+class Sanitizer:
+    """
+    Keep only allowed tags and parameters, in one pass over the token stream.
+
+    Disallowed tags are removed, but their content is kept (except for the
+    :data:`UNSAFE_CONTENT_TAGS`). Comments are removed. Tags are balanced using
+    stack of the open tags: closing tag closes also all tags opened inside
+    it, closing tags without the opening tag are removed and unclosed tags are
+    closed at the end.
+
+    Kept tags are always regenerated and ``<`` and ``>`` in the texts are
+    escaped, so the output doesn't depend on how the browser would read the
+    malformed parts of the input.
+
+    Args:
+        tags (iterable): Allowed tags. Default :data:`SAFE_TAGS`.
+        parameters (dict): Allowed parameters for each tag, ``"*"`` for all
+            tags. Default :data:`SAFE_PARAMETERS`.
+        unsafe_content_tags (iterable): Tags removed including the content.
+            Default :data:`UNSAFE_CONTENT_TAGS`.
+        url_schemes (iterable): Allowed schemes of the :data:`URL_PARAMETERS`.
+            Default :data:`SAFE_URL_SCHEMES`.
+    """
+    def __init__(
+        self,
+        tags: Iterable[str] = SAFE_TAGS,
+        parameters: dict = None,
+        unsafe_content_tags: Iterable[str] = UNSAFE_CONTENT_TAGS,
+        url_schemes: Iterable[str] = SAFE_URL_SCHEMES,
+    ):
+        if parameters is None:
+            parameters = SAFE_PARAMETERS
+
+        self.tags = _names_set(tags)
+        self.unsafe_content_tags = _names_set(unsafe_content_tags)
+        self.url_schemes = _names_set(url_schemes)
+
+        global_parameters = _names_set(parameters.get("*", ()))
+        self.parameters = {
+            tag: _names_set(parameters.get(tag, ())) | global_parameters
+            for tag in self.tags
+        }
+
+    def __call__(self, tokens: Iterator[Token]) -> Iterator[Token]:
+        tokens = iter(tokens)
+
+        stack = []
+        for token in tokens:
+            if isinstance(token, TextToken):
+                yield self._sanitize_text(token)
+                continue
+
+            elif not isinstance(token, TagToken):  # comments
+                continue
+
+            name = token.name.lower()
+            if name not in self.tags:
+                if (
+                    name in self.unsafe_content_tags
+                    and not token.is_end_tag
+                    and not token.is_non_pair
+                ):
+                    _skip_content(tokens, name)
+                continue
+
+            if token.is_end_tag:
+                if name not in stack:
+                    continue
+
+                while stack:
+                    open_name = stack.pop()
+                    yield TagToken(open_name, is_end_tag=True)
+                    if open_name == name:
+                        break
+                continue
+
+            yield self._sanitize_tag(token, name)
+
+            if name in Parser.NONPAIR_TAGS:
+                continue
+
+            if token.is_non_pair:  # <b/> doesn't make sense for the browsers
+                yield TagToken(name, is_end_tag=True)
+                continue
+
+            stack.append(name)
+
+        for open_name in reversed(stack):
+            yield TagToken(open_name, is_end_tag=True)
+
+    def _sanitize_text(self, token):
+        content = token.content
+        raw = content.raw if isinstance(content, RawText) else content
+        if "<" not in raw and ">" not in raw:
+            return token
+
+        raw = raw.replace("<", "&lt;").replace(">", "&gt;")
+        return TextToken(RawText(raw))
+
+    def _sanitize_tag(self, token, name):
+        allowed = self.parameters[name]
+
+        parameters = []
+        for parameter in token.parameters:
+            key = parameter.key.lower()
+            if key not in allowed:
+                continue
+
+            # unquoted values are not decoded by the tokenizer, but they are
+            # by the browser (``href=javascript&colon;x``)
+            value = parameter.value
+            if isinstance(value, RawText):
+                value = str(value)
+            elif value is not None:
+                value = entities.decode(value, in_attribute=True)
+
+            if key in URL_PARAMETERS and not self._is_safe_url(value or ""):
+                continue
+
+            parameters.append(ParameterToken(key, value))
+
+        is_non_pair = name in Parser.NONPAIR_TAGS
+        return TagToken(name, parameters, is_non_pair=is_non_pair)
+
+    def _is_safe_url(self, url):
+        # browsers ignore whitespace and control characters in the scheme
+        url = "".join(char for char in url if char > " ").lower()
+
+        scheme, colon, _ = url.partition(":")
+        if not colon or any(char in scheme for char in "/?#"):
+            return True  # relative URL
+
+        return scheme in self.url_schemes
+
+
+def sanitize(source: Union[str, Iterable[str]], output=None, **kwargs) -> Optional[str]:
+    """
+    Sanitize `source` with the :class:`Sanitizer`.
+
+    Example usage::
+
+        >>> sanitize('<p onclick="x()">Hi<script>x()</script> <b>there')
+        '<p>Hi <b>there</b></p>'
+
+    Args:
+        source (str / iterable): String, or iterable of string chunks.
+        output (obj): Object with `.write()` method. Default None.
+        **kwargs: Arguments for the :class:`Sanitizer`.
+
+    Returns:
+        str: Sanitized string if `output` is None, None otherwise.
+    """
+    return Pipeline(Sanitizer(**kwargs)).run(source, output)
@@ -0,0 +1,253 @@
+"""
+This module contains compiled queries for :meth:`.Tag.find` and the other
+search methods.
+
+Query is compiled once (names are normalized, parameters are converted to
+predicates) and can be reused for any number of documents.
+
+Example usage::
+
+    >>> links = compile_query("a", {"href": Prefix("https://")})
+    >>> for dom in doms:
+    ...     print(links.find(dom, limit=10))
+
+Values of the parameters may be strings (compared for equality) or the
+predicates: :class:`Regex`, :class:`Prefix`, :class:`Contains` and
+:class:`ClassToken`.
+"""
+import re
+from typing import List
+from typing import Union
+from typing import Iterator
+from typing import Optional
+
+
+class Predicate:
+    """
+    Test of the parameter value. Subclasses implement :meth:`__call__`.
+    """
+    __slots__ = ()
+
+    def __call__(self, value: str) -> bool:
+        raise NotImplementedError()
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+
+class Equals(Predicate):
+    """
+    Value is equal to `expected`.
+    """
+    __slots__ = ("expected",)
+
+    def __init__(self, expected: str):
+        object.__setattr__(self, "expected", expected)
+
+    def __call__(self, value: str) -> bool:
+        return value == self.expected
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({repr(self.expected)})"
+
+
+class Regex(Predicate):
+    """
+    Regular expression `pattern` matches anywhere in the value
+    (:func:`re.search`).
+    """
+    __slots__ = ("pattern",)
+
+    def __init__(self, pattern: Union[str, re.Pattern], flags: int = 0):
+        object.__setattr__(self, "pattern", re.compile(pattern, flags))
+
+    def __call__(self, value: str) -> bool:
+        return self.pattern.search(str(value)) is not None
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({repr(self.pattern.pattern)})"
+
+
+class Prefix(Predicate):
+    """
+    Value starts with `prefix`.
+    """
+    __slots__ = ("prefix",)
+
+    def __init__(self, prefix: str):
+        object.__setattr__(self, "prefix", prefix)
+
+    def __call__(self, value: str) -> bool:
+        return str(value).startswith(self.prefix)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({repr(self.prefix)})"
+
+
+class Contains(Predicate):
+    """
+    Value contains `substring`.
+    """
+    __slots__ = ("substring",)
+
+    def __init__(self, substring: str):
+        object.__setattr__(self, "substring", substring)
+
+    def __call__(self, value: str) -> bool:
+        return self.substring in str(value)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({repr(self.substring)})"
+
+
+class ClassToken(Predicate):
+    """
+    Value is whitespace separated list of tokens (like the `class` parameter)
+    and contains the `token`.
+    """
+    __slots__ = ("token",)
+
+    def __init__(self, token: str):
+        object.__setattr__(self, "token", token)
+
+    def __call__(self, value: str) -> bool:
+        return self.token in str(value).split()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({repr(self.token)})"
+
+
+class Query:
+    """
+    Immutable compiled query. Use :func:`compile_query` to create it.
+
+    Attributes:
+        name (str): Name of the matched tags, lowercase if the query is case
+            insensitive. Empty for all tags.
+        parameters (tuple): ``(key, predicate)`` pairs.
+        fn (callable): Additional test of the tag, or None.
+        case_sensitive (bool): Compare names case sensitively.
+    """
+    __slots__ = ("name", "parameters", "fn", "case_sensitive")
+
+    def __init__(self, name: str = "", p: dict = None, fn=None, case_sensitive=False):
+        if not case_sensitive:
+            name = name.lower()
+
+        parameters = []
+        if p:
+            for key, value in p.items():
+                if not isinstance(value, Predicate):
+                    value = Equals(value)
+
+                parameters.append((key, value))
+
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "parameters", tuple(parameters))
+        object.__setattr__(self, "fn", fn)
+        object.__setattr__(self, "case_sensitive", case_sensitive)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Query is immutable")
+
+    def matches(self, tag) -> bool:
+        """
+        Test whether the `tag` matches the query.
+        """
+        name = self.name
+        if name:
+            tag_name = tag.name if self.case_sensitive else tag.name.lower()
+            if tag_name != name:
+                return False
+
+        if self.parameters:
+            tag_parameters = tag.parameters
+            if not tag_parameters:
+                return False
+
+            for key, predicate in self.parameters:
+                value = tag_parameters.get(key)
+                if value is None or not predicate(value):
+                    return False
+
+        if self.fn is not None and not self.fn(tag):
+            return False
+
+        return True
+
+    def find_iter(self, tag) -> Iterator:
+        """
+        Iterate (depth first) over the matching tags in `tag`, including the
+        `tag` itself.
+        """
+        for item in tag.depth_first_iterator(tags_only=True):
+            if self.matches(item):
+                yield item
+
+    def find(self, tag, limit: int = None) -> List:
+        """
+        Find (depth first) the matching tags in `tag`.
+
+        Args:
+            tag (Tag): Searched tag.
+            limit (int): Stop after `limit` matches. Default None.
+
+        Returns:
+            list: List of matched elements.
+        """
+        matched = []
+        if limit is not None and limit <= 0:
+            return matched
+
+        for item in self.find_iter(tag):
+            matched.append(item)
+            if len(matched) == limit:
+                break
+
+        return matched
+
+    def first(self, tag) -> Optional[object]:
+        """
+        Return the first matching tag in `tag`, or None.
+        """
+        return next(self.find_iter(tag), None)
+
+    def __repr__(self):
+        arguments = [repr(self.name)]
+        if self.parameters:
+            arguments.append(f"p={dict(self.parameters)!r}")
+        if self.fn is not None:
+            arguments.append(f"fn={self.fn!r}")
+        if self.case_sensitive:
+            arguments.append("case_sensitive=True")
+
+        return f"{self.__class__.__name__}({', '.join(arguments)})"
+
+
+def compile_query(
+    name: Union[str, Query] = "", p: dict = None, fn=None, case_sensitive=False
+) -> Query:
+    """
+    Compile the arguments of :meth:`.Tag.find` to the reusable :class:`Query`.
+
+    Example usage::
+
+        >>> query = compile_query("div", {"class": ClassToken("price")})
+        >>> query.find(dom)
+
+    Args:
+        name (str): Name of the tag. Use `""` for all.
+        p (dict): Parameters to match. Values are strings or predicates.
+        fn (callable): Function taking the tag, returning True if it matches.
+        case_sensitive (bool): Compare names case sensitively. Default False.
+
+    Returns:
+        Query: Compiled query.
+    """
+    if isinstance(name, Query):
+        if p is not None or fn is not None or case_sensitive:
+            raise TypeError("Can't combine compiled Query with other arguments!")
+
+        return name
+
+    return Query(name, p, fn, case_sensitive)
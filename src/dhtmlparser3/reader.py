@@ -0,0 +1,118 @@
+"""
+This module reads files in chunks of decoded text, so they don't have to be
+loaded into the memory at once.
+
+Uncompressed files are read through :mod:`mmap`, files compressed by gzip,
+bzip2 or xz are decompressed transparently (detected by the magic bytes).
+"""
+import bz2
+import gzip
+import lzma
+import mmap
+import codecs
+from typing import Iterator
+
+from dhtmlparser3.encoding import SNIFF_LENGTH
+from dhtmlparser3.encoding import sniff_encoding
+
+
+#: Default size of the chunks, in bytes (or characters in the text mode).
+CHUNK_SIZE = 1024 * 1024
+
+_COMPRESSION_OPENERS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
+
+
+class FileReader:
+    """
+    Iterate over the content of the file, in chunks of decoded text.
+
+    Attributes:
+        path (str): Path to the file.
+        binary (bool): Read the file as bytes and detect the encoding like
+            :func:`.sniff_encoding`. Otherwise, the file is opened in text mode.
+        encoding (str): Encoding of the file. In the binary mode, it is set
+            after the first chunk is read, if not given.
+        bom (bytes): Byte order mark found at the start of the file.
+    """
+    def __init__(self, path: str, binary=False, encoding=None, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.binary = binary
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.bom = b""
+
+    def __iter__(self) -> Iterator[str]:
+        if self.binary:
+            return self._iter_decoded_chunks()
+
+        return self._iter_text_chunks()
+
+    def _get_compression_opener(self):
+        with open(self.path, "rb") as f:
+            magic = f.read(6)
+
+        for signature, opener in _COMPRESSION_OPENERS:
+            if magic.startswith(signature):
+                return opener
+
+        return None
+
+    def _iter_text_chunks(self):
+        opener = self._get_compression_opener()
+        if opener:
+            f = opener(self.path, "rt", encoding=self.encoding)
+        else:
+            f = open(self.path, encoding=self.encoding)
+
+        with f:
+            self.encoding = f.encoding
+            chunk = f.read(self.chunk_size)
+            while chunk:
+                yield chunk
+                chunk = f.read(self.chunk_size)
+
+    def _iter_byte_chunks(self):
+        opener = self._get_compression_opener()
+        if opener:
+            with opener(self.path, "rb") as f:
+                chunk = f.read(self.chunk_size)
+                while chunk:
+                    yield chunk
+                    chunk = f.read(self.chunk_size)
+            return
+
+        with open(self.path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files can't be mapped
+                return
+
+            with mapped:
+                for offset in range(0, len(mapped), self.chunk_size):
+                    yield mapped[offset:offset + self.chunk_size]
+
+    def _iter_decoded_chunks(self):
+        byte_chunks = self._iter_byte_chunks()
+
+        # collect enough data for the encoding detection
+        head = b""
+        for chunk in byte_chunks:
+            head += chunk
+            if len(head) >= SNIFF_LENGTH:
+                break
+
+        encoding, bom_length = sniff_encoding(head)
+        if self.encoding is None:
+            self.encoding = encoding
+        self.bom = head[:bom_length]
+
+        decoder = codecs.getincrementaldecoder(self.encoding)("replace")
+        yield decoder.decode(head[bom_length:])
+        for chunk in byte_chunks:
+            yield decoder.decode(chunk)
+
+        yield decoder.decode(b"", final=True)
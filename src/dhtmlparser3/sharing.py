@@ -0,0 +1,110 @@
+"""
+This module places the :class:`.CompactDocument` into the shared memory or
+to the file, from where it can be used by many processes without parsing
+and without copying.
+
+Example usage::
+
+    >>> memory = share(CompactDocument(reference_html))
+    >>> # in the worker processes:
+    >>> with attach(memory.name) as document:
+    ...     links = document.find("a", {"class": "external"})
+    >>> # when all workers are done:
+    >>> memory.close()
+    >>> memory.unlink()
+
+The same with the file::
+
+    >>> save(CompactDocument(reference_html), "reference.dhp")
+    >>> with load("reference.dhp") as document:
+    ...     links = document.find("a", {"class": "external"})
+
+Files saved with the index (``save(..., index=True)`` or
+:meth:`.Tag.save_index`) contain also the posting lists of the tags by the
+name and by the ``(key, value)`` pairs of the parameters. :meth:`find` of
+the loaded document intersects them instead of scanning the arrays, so the
+queries touch only the pages with the matching tags.
+
+Attached documents read the arrays and strings straight from the shared
+pages (see :meth:`.CompactDocument.from_buffer`), so the private memory of
+the workers doesn't grow with the size of the document, nor with their
+count.
+"""
+import mmap
+from multiprocessing.shared_memory import SharedMemory
+
+from dhtmlparser3.compact import CompactDocument
+
+
+def share(document: CompactDocument, name: str = None) -> SharedMemory:
+    """
+    Copy the `document` to the new block of shared memory.
+
+    The caller owns the block: call ``.close()`` and ``.unlink()`` on it,
+    when it is no longer needed.
+
+    Args:
+        document (CompactDocument): Document to share.
+        name (str): Name of the block. Default None for random name.
+
+    Returns:
+        SharedMemory: Block with the document. Pass its ``.name`` to
+        :func:`attach`.
+    """
+    data = document.to_bytes()
+
+    memory = SharedMemory(name, create=True, size=len(data))
+    memory.buf[:len(data)] = data
+
+    return memory
+
+
+def attach(name: str) -> CompactDocument:
+    """
+    Attach to the document shared by :func:`share`.
+
+    Args:
+        name (str): Name of the shared memory block.
+
+    Returns:
+        CompactDocument: Read-only document. Call ``.close()`` on it to
+        detach.
+    """
+    memory = SharedMemory(name)
+    return CompactDocument.from_buffer(memory.buf, memory)
+
+
+def save(document: CompactDocument, path: str, index=False):
+    """
+    Save the `document` to the file at `path`, for :func:`load`.
+
+    Args:
+        document (CompactDocument): Document to save.
+        path (str): Path to the file.
+        index (bool): Add the posting lists of the tags by the name and by
+            the parameters, see :meth:`.CompactDocument.to_bytes`. Default
+            False.
+    """
+    with open(path, "wb") as f:
+        f.write(document.to_bytes(index))
+
+
+def load(path: str) -> CompactDocument:
+    """
+    Map the file saved by :func:`save` to the memory.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        CompactDocument: Read-only document. Call ``.close()`` on it to
+        unmap the file.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        return CompactDocument.from_buffer(mapped, mapped)
+    except ValueError:
+        mapped.close()
+        raise
@@ -0,0 +1,55 @@
+"""
+This module maps character offsets in the parsed string to line and column
+numbers.
+"""
+from bisect import bisect_right
+from typing import Tuple
+
+
+class Source:
+    """
+    Parsed string shared by all the elements of one DOM.
+
+    Index of the line starts is built lazily on the first position lookup.
+
+    Attributes:
+        string (str): The parsed string.
+    """
+    def __init__(self, string: str):
+        self.string = string
+        self._line_starts = None
+
+    def _build_line_starts(self):
+        line_starts = [0]
+
+        string = self.string
+        newline = string.find("\n")
+        while newline != -1:
+            line_starts.append(newline + 1)
+            newline = string.find("\n", newline + 1)
+
+        return line_starts
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        """
+        Convert `offset` to line and column.
+
+        Args:
+            offset (int): Offset in the :attr:`string`.
+
+        Returns:
+            tuple: ``(line, column)``, both starting from 1.
+        """
+        if self._line_starts is None:
+            self._line_starts = self._build_line_starts()
+
+        line = bisect_right(self._line_starts, offset)
+        column = offset - self._line_starts[line - 1] + 1
+
+        return line, column
+
+    def __getitem__(self, item):
+        return self.string[item]
+
+    def __len__(self):
+        return len(self.string)
@@ -1,7 +1,29 @@
 class Comment:
+    """
+    Attributes:
+        content (str): Text of the comment.
+        start (int): Offset of the comment in the parsed string, or None.
+        end (int): Offset just after the end of the comment, or None.
+        source (Source): Parsed string with the line index, or None.
+    """
+    start = None
+    end = None
+    source = None
+
     def __init__(self, content=None):
         self.content = content
 
+    @property
+    def position(self):
+        """
+        Line and column (both starting from 1) of the comment in the parsed
+        string. None for comments, which were not created by the parser.
+        """
+        if self.source is None or self.start is None:
+            return None
+
+        return self.source.position(self.start)
+
     def to_string(self):
         if not self.content.strip():
             return "<!-- -->"
@@ -0,0 +1,90 @@
+from dhtmlparser3 import entities
+
+
+class RawText:
+    """
+    Text with unresolved entities, as it was written in the source. Entities
+    are decoded on the first access to the text, serialization writes the
+    source back verbatim.
+
+    It behaves mostly like the decoded ``str`` (comparison, hashing, ``in``,
+    methods like ``.strip()``), use ``str(raw_text)`` to get the real string.
+
+    Attributes:
+        raw (str): Source form of the text, including the entities.
+    """
+    def __init__(self, raw="", in_attribute=False):
+        self.raw = raw
+        self._in_attribute = in_attribute
+        self._text = None
+
+    @property
+    def text(self) -> str:
+        """
+        Decoded text.
+        """
+        if self._text is None:
+            self._text = entities.decode(self.raw, self._in_attribute)
+
+        return self._text
+
+    def to_string(self):
+        return self.raw
+
+    def prettify(self, depth, dont_format=False):
+        if dont_format or self.raw.strip():
+            return self.raw
+
+        return ""
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({repr(self.raw)})"
+
+    def __eq__(self, other):
+        if isinstance(other, RawText):
+            return self.text == other.text
+
+        return self.text == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return hash(self.text)
+
+    def __len__(self):
+        return len(self.text)
+
+    def __bool__(self):
+        return bool(self.raw)
+
+    def __contains__(self, item):
+        return item in self.text
+
+    def __iter__(self):
+        return iter(self.text)
+
+    def __getitem__(self, item):
+        return self.text[item]
+
+    def __add__(self, other):
+        return self.text + str(other)
+
+    def __radd__(self, other):
+        return str(other) + self.text
+
+    def __getattr__(self, name):
+        # delegate str methods, like .strip() or .startswith()
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        return getattr(self.text, name)
+
+    def __copy__(self):
+        return RawText(self.raw, self._in_attribute)
+
+    def __deepcopy__(self, memodict={}):
+        return RawText(self.raw, self._in_attribute)
@@ -0,0 +1,209 @@
+from collections.abc import MutableMapping
+from typing import Iterator
+from typing import Optional
+
+from dhtmlparser3.query import compile_query
+from dhtmlparser3.tags.tag import Tag
+
+
+class SharedTag(Tag):
+    """
+    View of the `template` tag, which can be shared by any number of views.
+
+    Name and the non-pair flag are taken from the template. Until the first
+    modification, :attr:`parameters` reads the template's dict, the first
+    write (also ``tag.p["key"] = value``) copies it to the view. Content is
+    created on the first access to :attr:`content`, as the list of views of
+    the template's sub-tags (texts and comments are shared). :meth:`find`
+    and :meth:`to_string` read the untouched sub-trees from the template,
+    so reading the document costs nothing and the template is never
+    modified.
+
+    Attributes:
+        template (Tag): Shared tag, or None after the first modification.
+    """
+    def __init__(self, template: Tag, parent: Tag = None):
+        self.name = template.name
+        self.is_non_pair = template.is_non_pair
+        self.parent = parent
+
+        self.template = template
+        self._parameters = None
+        self._content = None
+        self._wfind_only_on_content = False
+
+        self._copy_span(template)
+        if template._fingerprint is not None:
+            self._fingerprint = template._fingerprint
+
+    @property
+    def parameters(self):
+        if self._parameters is None:
+            return _SharedParameters(self)
+
+        return self._parameters
+
+    @parameters.setter
+    def parameters(self, parameters):
+        self._mark_dirty(tag=True)
+        self._parameters = parameters
+
+    @property
+    def content(self):
+        content = self._content
+        if content is None:
+            content = [
+                SharedTag(item, self) if isinstance(item, Tag) else item
+                for item in self.template.content
+            ]
+            self._content = content
+
+        return content
+
+    @content.setter
+    def content(self, content):
+        self._mark_dirty(content=True)
+        self._content = content
+
+    def _mark_dirty(self, tag=False, content=False):
+        if self.template is not None:
+            # materialize the content and parameters from the template
+            self.content
+            if self._parameters is None:
+                self._parameters = self.template.parameters.copy()
+            self.template = None
+
+        super()._mark_dirty(tag, content)
+
+    def content_without_tags(self) -> str:
+        if self._content is None:
+            return self.template.content_without_tags()
+
+        return super().content_without_tags()
+
+    def to_string(self, preserve_source=False) -> str:
+        if self._content is None:
+            return self.template.to_string(preserve_source)
+
+        return super().to_string(preserve_source)
+
+    def _to_source_parts(self, parts: list):
+        if self._content is None:
+            self.template._to_source_parts(parts)
+        else:
+            super()._to_source_parts(parts)
+
+    def _find_shortcut(self, query) -> Optional[Iterator["SharedTag"]]:
+        # sub-tree without the content is the same as the template
+        if self._content is None:
+            return self._find_in_template(query)
+
+        return None
+
+    def _find_in_template(self, query) -> Iterator["SharedTag"]:
+        """
+        Search the template, creating only the views on the paths to the
+        matching tags. `fn` of the `query` gets the view.
+        """
+        matches = query.matches
+        if query.fn is not None:
+            matches = compile_query(
+                query.name, dict(query.parameters), None, query.case_sensitive
+            ).matches
+
+        if matches(self.template) and (query.fn is None or query.fn(self)):
+            yield self
+
+        # indexes of the content on the path to the current tag
+        path = [None]
+        stack = [enumerate(self.template.content)]
+        while stack:
+            for index, item in stack[-1]:
+                if isinstance(item, Tag):
+                    path[-1] = index
+                    if matches(item):
+                        view = self._view_at(path)
+                        if query.fn is None or query.fn(view):
+                            yield view
+
+                    path.append(None)
+                    stack.append(enumerate(item.content))
+                    break
+            else:
+                stack.pop()
+                path.pop()
+
+    def _view_at(self, path: list) -> Tag:
+        tag = self
+        for index in path:
+            tag = tag.content[index]
+
+        return tag
+
+
+class _SharedParameters(MutableMapping):
+    """
+    Parameters of the :class:`SharedTag`, read from its template until the
+    first write, which copies them to the view.
+    """
+    __slots__ = ("_view",)
+
+    def __init__(self, view: SharedTag):
+        self._view = view
+
+    @property
+    def _mapping(self) -> dict:
+        view = self._view
+        if view._parameters is None:
+            return view.template.parameters
+
+        return view._parameters
+
+    def _writable(self) -> dict:
+        self._view._mark_dirty(tag=True)
+        return self._view._parameters
+
+    def __getitem__(self, key):
+        return self._mapping[key]
+
+    def __setitem__(self, key, value):
+        self._writable()[key] = value
+
+    def __delitem__(self, key):
+        del self._writable()[key]
+
+    def __contains__(self, key):
+        return key in self._mapping
+
+    def __iter__(self):
+        return iter(self._mapping)
+
+    def __len__(self):
+        return len(self._mapping)
+
+    def __eq__(self, other):
+        if isinstance(other, _SharedParameters):
+            other = other._mapping
+
+        return self._mapping == other
+
+    def __repr__(self):
+        return repr(self._mapping)
+
+    def get(self, key, default=None):
+        return self._mapping.get(key, default)
+
+    def keys(self):
+        return self._mapping.keys()
+
+    def items(self):
+        return self._mapping.items()
+
+    def values(self):
+        return self._mapping.values()
+
+    def copy(self) -> dict:
+        return self._mapping.copy()
+
+    def clear(self):
+        self._writable().clear()
@@ -1,13 +1,25 @@
 import html
 import copy
+import hashlib
 from typing import Dict
 from typing import List
+from typing import Tuple
 from typing import Union
+from typing import Iterable
 from typing import Iterator
-
+from typing import Optional
+
+from dhtmlparser3.query import Query
+from dhtmlparser3.query import Regex
+from dhtmlparser3.query import Equals
+from dhtmlparser3.query import Prefix
+from dhtmlparser3.query import Contains
+from dhtmlparser3.query import ClassToken
+from dhtmlparser3.query import compile_query
 from dhtmlparser3.quoter import escape
 from dhtmlparser3.specialdict import SpecialDict
 from dhtmlparser3.tags.comment import Comment
+from dhtmlparser3.tags.raw_text import RawText
 
 
 class Tag:
@@ -17,12 +29,50 @@ class Tag:
         parameters (SpecialDict): Dictionary for the parameters.
         content (list): List of sub-elements.
         parent (Tag): Reference to parent element.
+        start (int): Offset of the tag in the parsed string, or None.
+        end (int): Offset just after the end of the tag (including the
+            closing tag) in the parsed string, or None.
+        source (Source): Parsed string with the line index, or None.
     """
 
     _DICT_INSTANCE = SpecialDict
     _DONT_ESCAPE = {"style", "script"}
     _DONT_FORMAT = {"pre", "style", "script"}
 
+    start = None
+    end = None
+    source = None
+
+    # end of the opening tag and start of the closing tag in the source
+    _tag_end = None
+    _content_end = None
+
+    # used by .to_string(preserve_source=True) to decide what to regenerate
+    _tag_dirty = False
+    _content_dirty = False
+    _subtree_dirty = False
+
+    # cached by .fingerprint(), cleared up to the root by ._mark_dirty()
+    _fingerprint = None
+
+    # set by .number_nodes(), see ._has_numbering()
+    _numbering = None
+    _pre = 0
+    _post = 0
+    _depth = 0
+
+    # set by .text_index(), invalidated by ._mark_dirty()
+    _text_index = None
+
+    # on the topmost tag of the document: modification counter bumped by
+    # ._mark_dirty() and the cache enabled by .enable_query_cache()
+    _generation = 0
+    _query_cache = None
+
+    # subclasses searching their sub-trees without the traversal define
+    # ._find_shortcut(query), which returns iterator of the matches, or None
+    _find_shortcut = None
+
     def __init__(self, name, parameters=None, content=None, is_non_pair=False):
         self.name = name
 
@@ -38,6 +88,11 @@ class Tag:
         self.is_non_pair = is_non_pair
         self.parent = None
 
+        # ._mark_dirty() invalidates the caches up through the parents
+        for item in self.content:
+            if isinstance(item, Tag):
+                item.parent = self
+
         self._wfind_only_on_content = False
 
     @property
@@ -62,6 +117,43 @@ class Tag:
         """
         return [x for x in self.content if isinstance(x, Tag)]
 
+    @property
+    def position(self) -> Optional[Tuple[int, int]]:
+        """
+        Line and column (both starting from 1) of the tag in the parsed string.
+        None for tags, which were not created by the parser.
+        """
+        if self.source is None or self.start is None:
+            return None
+
+        return self.source.position(self.start)
+
+    @property
+    def depth(self) -> int:
+        """
+        Number of the ancestors of the tag. O(1) after :meth:`number_nodes`.
+        """
+        if self._has_numbering():
+            return self._depth
+
+        depth = 0
+        parent = self.parent
+        while parent is not None:
+            depth += 1
+            parent = parent.parent
+
+        return depth
+
+    def source_string(self) -> Optional[str]:
+        """
+        Return the part of the parsed string, from which this tag was parsed.
+        None for tags, which were not created by the parser.
+        """
+        if self.source is None or self.start is None:
+            return None
+
+        return self.source.string[self.start:self.end]
+
     def double_link(self):
         """
         Make the DOM hierarchy double-linked. Each content element now points
@@ -84,6 +176,8 @@ class Tag:
                 output += item.content_without_tags()
             elif isinstance(item, str):
                 output += item
+            elif isinstance(item, RawText):
+                output += item.text
 
         return output
 
@@ -107,16 +201,16 @@ class Tag:
 
         return False
 
-    def remove_item(self, item: Union[str, "Tag", Comment]):
+    def remove_item(self, item: Union[str, "Tag", Comment, RawText]):
         """
         Remove the item from the .content property.
         """
+        self._mark_dirty(content=True)
+
         if isinstance(item, str):
             self.content.remove(item)
-        elif isinstance(item, Comment):
-            self.content = [
-                x for x in self.content if not (isinstance(x, Comment) and x is item)
-            ]
+        elif isinstance(item, (Comment, RawText)):
+            self.content = [x for x in self.content if x is not item]
         elif isinstance(item, Tag):
             self.content = [
                 x for x in self.content if not (isinstance(x, Tag) and x is item)
@@ -124,10 +218,26 @@ class Tag:
         else:
             raise ValueError(f"Can't remove `{repr(item)}`")
 
-    def to_string(self) -> str:
+    def to_string(self, preserve_source=False) -> str:
         """
         Get HTML representation of the tag and the content.
+
+        Args:
+            preserve_source (bool): Copy unmodified parts of the DOM verbatim
+                from the parsed string and regenerate only the parts modified
+                by the Tag API. Default False.
+
+        Note:
+            Only the source of this tag is copied. When the document has a
+            single root element, it is returned by the parser without the
+            container, so the stray closing tags after it are not part of the
+            output. ``FileParser.write()`` serializes the whole container.
         """
+        if preserve_source:
+            parts = []
+            self._to_source_parts(parts)
+            return "".join(parts)
+
         output = self.tag_to_str()
 
         escape_fn = html.escape
@@ -145,6 +255,363 @@ class Tag:
 
         return output
 
+    def _to_source_parts(self, parts: list):
+        source = self.source
+        if source is not None and not (
+            self._tag_dirty or self._content_dirty or self._subtree_dirty
+        ):
+            parts.append(source.string[self.start:self.end])
+            return
+
+        tag_from_source = source is not None and not self._tag_dirty
+        if tag_from_source:
+            parts.append(source.string[self.start:self._tag_end])
+        else:
+            parts.append(self.tag_to_str())
+
+        if source is not None and not self._content_dirty and self._spans_match():
+            # text and comments in between the sub-tags are copied verbatim
+            pointer = self._tag_end
+            for item in self.content:
+                if isinstance(item, Tag):
+                    parts.append(source.string[pointer:item.start])
+                    item._to_source_parts(parts)
+                    pointer = item.end
+
+            parts.append(source.string[pointer:self._content_end])
+        else:
+            escape_fn = html.escape
+            if self.name in self._DONT_ESCAPE:
+                escape_fn = lambda x: x
+
+            for item in self.content:
+                if isinstance(item, str):
+                    parts.append(escape_fn(item))
+                elif isinstance(item, Tag):
+                    item._to_source_parts(parts)
+                else:
+                    parts.append(item.to_string())
+
+        if tag_from_source:
+            parts.append(source.string[self._content_end:self.end])
+        elif self.name and not self.is_non_pair:
+            parts.append(f"</{self.name}>")
+
+    def _spans_match(self) -> bool:
+        """
+        Check that all sub-tags come from the same source, in the same order.
+        """
+        pointer = self._tag_end
+        for item in self.content:
+            if isinstance(item, Tag):
+                if item.source is not self.source or item.start < pointer:
+                    return False
+
+                pointer = item.end
+
+        return pointer <= self._content_end
+
+    def mark_dirty(self):
+        """
+        Mark the tag as modified, so it is regenerated by
+        ``.to_string(preserve_source=True)``.
+
+        The Tag API (``tag["key"] = value``, ``del tag[0]``, :meth:`remove_item`,
+        :meth:`replace_with` and so on) does this automatically. Call this
+        after you modify the `.name`, `.parameters` or `.content` directly.
+        """
+        self._mark_dirty(tag=True, content=True)
+
+    def _mark_dirty(self, tag=False, content=False):
+        if self._numbering is not None:
+            self._numbering.valid = False
+        if self._text_index is not None:
+            self._text_index.valid = False
+
+        self._top()._generation += 1
+
+        # cached fingerprint of the tag implies cached fingerprints of all
+        # sub-tags, so the first tag without it ends the invalidation
+        item = self
+        while item is not None and item._fingerprint is not None:
+            item._fingerprint = None
+            item = item.parent
+
+        if tag:
+            self._tag_dirty = True
+        if content:
+            self._content_dirty = True
+
+        parent = self.parent
+        while parent is not None and not parent._subtree_dirty:
+            parent._subtree_dirty = True
+            parent = parent.parent
+
+    def _top(self) -> "Tag":
+        top = self
+        while top.parent is not None:
+            top = top.parent
+
+        return top
+
+    def enable_query_cache(self, enabled=True):
+        """
+        Cache the results of :meth:`find`, :meth:`match` and
+        :meth:`match_paths` called on any tag in this document.
+
+        Repeated queries are answered from the cache, until the document is
+        modified through the Tag API (or :meth:`mark_dirty`). Call
+        :meth:`mark_dirty` after you modify the `.content` or `.parameters`
+        directly. Queries with `fn` are not cached.
+
+        Args:
+            enabled (bool): Set to False to disable the cache. Default True.
+        """
+        top = self._top()
+        top._query_cache = _QueryCache(top._generation) if enabled else None
+
+    def _cached(self, method: str, key: Optional[tuple], compute) -> list:
+        """
+        Return copy of the cached result of the `method` with the normalized
+        query `key`, or ``compute()`` it. Key None means the query can't be
+        cached.
+        """
+        top = self._top()
+        cache = top._query_cache
+        if cache is None or key is None:
+            return compute()
+
+        if cache.generation != top._generation or len(cache.results) >= _CACHE_SIZE:
+            cache.results.clear()
+            cache.generation = top._generation
+
+        key = (id(self), method, key)
+        cached = cache.results.get(key)
+        if cached is None or cached[0] is not self:
+            cached = (self, compute())
+            cache.results[key] = cached
+
+        return list(cached[1])
+
+    def number_nodes(self):
+        """
+        Assign the pre-order and post-order ranks and the depth to all tags in
+        this sub-tree, so :meth:`is_ancestor_of`, :attr:`depth` and
+        :meth:`sorted_in_document_order` don't have to walk the tree.
+
+        The numbering is invalidated by any modification through the Tag API
+        (or :meth:`mark_dirty`), after which the methods fall back to the
+        traversal until you call this again.
+        """
+        numbering = _Numbering()
+
+        self._depth = self.depth
+        self._numbering = numbering
+        self._pre = 0
+
+        pre = 0
+        post = 0
+        stack = [(self, iter(self.content))]
+        while stack:
+            tag, iterator = stack[-1]
+            for item in iterator:
+                if isinstance(item, Tag):
+                    pre += 1
+                    item._numbering = numbering
+                    item._pre = pre
+                    item._depth = tag._depth + 1
+                    stack.append((item, iter(item.content)))
+                    break
+            else:
+                stack.pop()
+                tag._post = post
+                post += 1
+
+    def _has_numbering(self) -> bool:
+        return self._numbering is not None and self._numbering.valid
+
+    def is_ancestor_of(self, other: "Tag") -> bool:
+        """
+        Return True if `other` is in the sub-tree of this tag (and is not this
+        tag). O(1) after :meth:`number_nodes`.
+        """
+        if self._has_numbering() and other._numbering is self._numbering:
+            return self._pre < other._pre and other._post < self._post
+
+        parent = other.parent
+        while parent is not None:
+            if parent is self:
+                return True
+            parent = parent.parent
+
+        return False
+
+    def closest(
+        self, name, p=None, fn=None, case_sensitive=False
+    ) -> Optional["Tag"]:
+        """
+        Return the nearest tag matching the arguments of :meth:`find`, going
+        from this tag up through the parents, or None.
+        """
+        matches = compile_query(name, p, fn, case_sensitive).matches
+
+        tag = self
+        while tag is not None:
+            if matches(tag):
+                return tag
+            tag = tag.parent
+
+        return None
+
+    def sorted_in_document_order(self, tags: Iterable["Tag"]) -> List["Tag"]:
+        """
+        Return `tags` from this sub-tree sorted in the document order, without
+        duplicates (compared by identity).
+
+        After :meth:`number_nodes`, this just sorts by the pre-order ranks,
+        otherwise the sub-tree is traversed.
+
+        Raises:
+            ValueError: If some of the tags is not in this sub-tree.
+        """
+        unique = list({id(tag): tag for tag in tags}.values())
+
+        numbering = self._numbering if self._has_numbering() else None
+        if numbering is not None and all(
+            tag._numbering is numbering for tag in unique
+        ):
+            for tag in unique:
+                if tag._pre < self._pre or tag._post > self._post:
+                    raise ValueError(f"{tag!r} is not in the sub-tree!")
+
+            return sorted(unique, key=lambda tag: tag._pre)
+
+        order = {
+            id(tag): index
+            for index, tag in enumerate(self.depth_first_iterator(tags_only=True))
+        }
+        for tag in unique:
+            if id(tag) not in order:
+                raise ValueError(f"{tag!r} is not in the sub-tree!")
+
+        return sorted(unique, key=lambda tag: order[id(tag)])
+
+    def text_index(self) -> "TextIndex":
+        """
+        Return the inverted index of the words in the texts of this sub-tree
+        (:class:`.TextIndex`).
+
+        The index is built in one pass over the sub-tree and reused, until
+        the tree is modified through the Tag API (or :meth:`mark_dirty`).
+        Index of the whole document is reused for its sub-trees.
+        """
+        # imported here, because the textindex module works with the Tag class
+        from dhtmlparser3.textindex import TextIndex
+
+        index = self._text_index
+        if index is None or not index.valid:
+            index = TextIndex(self)
+
+        return index
+
+    def fingerprint(self) -> bytes:
+        """
+        Return 128 bit digest of the name, parameters (in any order) and the
+        whole content of the tag.
+
+        Fingerprints are cached for all tags in the sub-tree and invalidated
+        by modifications through the Tag API (or :meth:`mark_dirty`), so
+        repeated calls are O(1). Useful as a key for deduplication of the
+        same sub-trees.
+        """
+        if self._fingerprint is not None:
+            return self._fingerprint
+
+        # children are in the list after their parents, so reversed order
+        # computes the fingerprints of the children first
+        pending = []
+        stack = [self]
+        while stack:
+            tag = stack.pop()
+            pending.append(tag)
+            for item in tag.content:
+                if isinstance(item, Tag) and item._fingerprint is None:
+                    stack.append(item)
+
+        for tag in reversed(pending):
+            tag._fingerprint = tag._compute_fingerprint()
+
+        return self._fingerprint
+
+    def _compute_fingerprint(self) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+
+        def update(kind: bytes, string: str):
+            data = string.encode("utf-8", "surrogatepass")
+            digest.update(kind + len(data).to_bytes(8, "little") + data)
+
+        update(b"n", self.name)
+        update(b"/" if self.is_non_pair else b">", "")
+
+        if self.parameters:
+            parameters = sorted(
+                (key.lower(), str(value)) for key, value in self.parameters.items()
+            )
+            for key, value in parameters:
+                update(b"k", key)
+                update(b"v", value)
+
+        for item in self.content:
+            if isinstance(item, Tag):
+                digest.update(b"t" + item._fingerprint)
+            elif isinstance(item, Comment):
+                update(b"c", item.content or "")
+            else:
+                update(b"s", str(item))
+
+        return digest.digest()
+
+    def deep_equals(self, other: "Tag") -> bool:
+        """
+        Compare the name, parameters and the whole content with `other` tag.
+        Unlike ``==``, which compares only the tags themselves.
+
+        Sub-trees with different :meth:`fingerprint` are not compared at all,
+        so call :meth:`mark_dirty` after you modify the `.content` or
+        `.parameters` directly.
+        """
+        if not isinstance(other, Tag):
+            return False
+
+        stack = [(self, other)]
+        while stack:
+            first, second = stack.pop()
+            if first is second:
+                continue
+
+            if first.fingerprint() != second.fingerprint():
+                return False
+
+            if first != second or len(first.content) != len(second.content):
+                return False
+
+            for first_item, second_item in zip(first.content, second.content):
+                if isinstance(first_item, Tag):
+                    if not isinstance(second_item, Tag):
+                        return False
+                    stack.append((first_item, second_item))
+                elif isinstance(first_item, Comment):
+                    if not isinstance(second_item, Comment):
+                        return False
+                    if first_item.content != second_item.content:
+                        return False
+                elif isinstance(second_item, (Tag, Comment)):
+                    return False
+                elif str(first_item) != str(second_item):
+                    return False
+
+        return True
+
     def tag_to_str(self) -> str:
         """
         Convert just the tag with parameters to string, without content.
@@ -161,12 +628,9 @@ class Tag:
         if not self.parameters:
             return ""
 
-        parameters = []
-        for key, value in self.parameters.items():
-            if value:
-                parameters.append(f'{key}="{escape(str(value))}"')
-            else:
-                parameters.append(f"{key}")
+        parameters = [
+            _parameter_to_str(key, value) for key, value in self.parameters.items()
+        ]
 
         return " " + " ".join(parameters)
 
@@ -184,6 +648,8 @@ class Tag:
                     output += html.escape(item)
                 else:
                     output += item
+            elif isinstance(item, RawText) and not escape:
+                output += item.text
             else:
                 output += item.to_string()
 
@@ -204,12 +670,15 @@ class Tag:
             if self.parent and not unused_root_element:
                 self_index = self.parent.content.index(self)
                 self.parent.content[self_index] = item
+                self.parent._mark_dirty(content=True)
             else:
                 self.name = ""
                 self.parameters.clear()
                 self.is_non_pair = True
                 self.content = [item]
+                self._mark_dirty(tag=True, content=True)
         elif isinstance(item, Tag):
+            self._mark_dirty(tag=True, content=not keep_content)
             self.name = item.name
             self.parameters = item.parameters.copy()
             if not keep_content:
@@ -229,10 +698,10 @@ class Tag:
             return container
 
         # in the subsequent iterations, perform the matching on the sub-tags
-        sub_tags = (item.content for item in self.content)
-        for item in sum(sub_tags, []):  # flattern the list
-            if isinstance(item, Tag):
-                if item._is_almost_equal(name, p, fn, case_sensitive):
+        query = compile_query(name, p, fn, case_sensitive)
+        for sub_tag in self.content:
+            for item in sub_tag.content:
+                if isinstance(item, Tag) and query.matches(item):
                     container.content.append(item)
 
         return container
@@ -252,43 +721,25 @@ class Tag:
         Returns:
             list: List of matched elements.
         """
-        item = self
-        args = list(args)
-
-        arg = args.pop(0)
-        matched = self._call_find(arg)
-
         if not args:
-            return matched
+            raise ValueError("At least one path element is required!")
 
-        next_matched = []
-        while args:
-            arg = args.pop(0)
-            for item in matched:
-                next_matched.extend(item._call_find(arg))
-
-            matched = next_matched
-            next_matched = []
-
-        return matched
-
-    def _call_find(self, arg):
-        if isinstance(arg, dict):
-            return self.find(**arg)
-        elif isinstance(arg, list) or isinstance(arg, tuple):
-            return self.find(*arg)
-        else:
-            return self.find(arg)
+        return self._cached(
+            "match",
+            _path_key(args),
+            lambda: self._match_automaton(args, exact_path=False),
+        )
 
     def match_paths(self, *args):
         """
         Exactly match the path given by the arguments.
 
         Example:
-            dom.match("body", ["div", {"class": "page-body"}], "p")
+            dom.match_paths("body", ["div", {"class": "page-body"}], "p")
 
         This will match the path only if it really goes like this. If the `<p>`
-        is for example wrapped in <div>, it won't be matched.
+        is for example wrapped in <div>, it won't be matched. The first
+        element of the path may be anywhere in the tree.
 
         Args:
             *args (list): List of paths to match.
@@ -296,34 +747,172 @@ class Tag:
         Returns:
             list: List of matched elements.
         """
-        item = self
-        args = list(args)
-        while args:
-            arg = args.pop(0)
-            item = item._call_wfind(arg)
-
-        return item.content
-
-    def _call_wfind(self, arg):
-        if isinstance(arg, dict):
-            return self.wfind(**arg)
-        elif isinstance(arg, list) or isinstance(arg, tuple):
-            return self.wfind(*arg)
-        else:
-            return self.wfind(arg)
+        if not args:
+            return self.content
+
+        return self._cached(
+            "match_paths",
+            _path_key(args),
+            lambda: self._match_automaton(args, exact_path=True),
+        )
+
+    def _match_automaton(self, args, exact_path) -> List["Tag"]:
+        """
+        Match `args` in one traversal of the tree.
+
+        Each tag gets a state - bitmask, where bit `k` means that the first `k`
+        elements of the path were matched by the tag and its ancestors (bit 0
+        is always set). The tag is in the result when it sets the last bit.
+
+        For :meth:`match`, elements of the path may be matched anywhere below
+        the previous element, or by the same tag (like the :meth:`find`
+        includes the tag itself). For :meth:`match_paths`, they have to be
+        matched by the direct children.
+        """
+        matchers = [compile_query(*_find_arguments(arg)).matches for arg in args]
+        final_bit = 1 << len(matchers)
+
+        def next_state(item, state):
+            if exact_path:
+                new_state = 1
+                for index, matches in enumerate(matchers):
+                    if state & (1 << index) and matches(item):
+                        new_state |= 1 << (index + 1)
+            else:
+                new_state = state
+                for index, matches in enumerate(matchers):
+                    if new_state & (1 << index) and matches(item):
+                        new_state |= 1 << (index + 1)
+
+            return new_state
+
+        # the last bit is not inherited, tag is matched only by its own state
+        inherited_mask = final_bit - 1
+
+        matched = []
+        state = next_state(self, 1)
+        if state & final_bit:
+            matched.append(self)
+
+        stack = [(iter(self.content), state & inherited_mask)]
+        while stack:
+            content, state = stack[-1]
+            for item in content:
+                if not isinstance(item, Tag):
+                    continue
+
+                item_state = next_state(item, state)
+                if item_state & final_bit:
+                    matched.append(item)
+
+                stack.append((iter(item.content), item_state & inherited_mask))
+                break
+            else:
+                stack.pop()
+
+        return matched
 
-    def find(self, name, p=None, fn=None, case_sensitive=False) -> List["Tag"]:
+    def find(
+        self, name, p=None, fn=None, case_sensitive=False, text_contains=None
+    ) -> List["Tag"]:
         """
         Find (depth first) all tags with given parameters.
 
         Args:
             name (str): Name of the tag you are looking for. Use `""` for all.
-            p (dict): Parameters to match.
+                Compiled :class:`.Query` may be used instead of all arguments.
+            p (dict): Parameters to match. Values may be strings or predicates
+                from :mod:`dhtmlparser3.query`.
             fn (lambda fn): Lambda expecting one argument.
              It will be tested for each element in the tree.
             case_sensitive (bool): Use case sensitive search. Default `False`.
+            text_contains (str): Match only the tags with this phrase in the
+                text, see :mod:`dhtmlparser3.textindex`. Only the candidates
+                from the :meth:`text_index` are tested. Default None.
+        """
+        if text_contains is not None:
+            matches = compile_query(name, p, fn, case_sensitive).matches
+            candidates = self.text_index().containing(text_contains, self)
+            return [tag for tag in candidates if matches(tag)]
+
+        query = compile_query(name, p, fn, case_sensitive)
+        return self._cached(
+            "find",
+            _query_key(query),
+            lambda: list(self.find_depth_first_iter(query)),
+        )
+
+    def find_many(self, queries: Dict[str, object]) -> Dict[str, List["Tag"]]:
+        """
+        Evaluate all `queries` in one traversal of the tree (depth first).
+
+        Example:
+            dom.find_many({
+                "title": "title",
+                "prices": ("span", {"class": "price"}),
+                "links": {"name": "a", "fn": lambda x: "href" in x.p},
+            })
+
+        Args:
+            queries (dict): Key -> arguments of :meth:`find`, given as the name,
+                compiled :class:`.Query`, list / tuple of positional arguments,
+                or dict of keyword arguments (like in :meth:`match`).
+
+        Returns:
+            dict: Key -> list of matched elements.
+        """
+        results = {key: [] for key in queries}
+
+        # matchers are indexed by name, so each tag is tested only with the
+        # queries, which can match it
+        by_name = {}
+        by_exact_name = {}
+        any_name = []
+        for key, query in queries.items():
+            query = compile_query(*_find_arguments(query))
+            matcher = (results[key], query.matches)
+
+            if not query.name:
+                any_name.append(matcher)
+            elif query.case_sensitive:
+                by_exact_name.setdefault(query.name, []).append(matcher)
+            else:
+                by_name.setdefault(query.name, []).append(matcher)
+
+        empty = ()
+        for item in self.depth_first_iterator(tags_only=True):
+            name_matchers = by_name.get(item.name.lower(), empty)
+            exact_matchers = by_exact_name.get(item.name, empty)
+
+            for matchers in (name_matchers, exact_matchers, any_name):
+                for result, matches in matchers:
+                    if matches(item):
+                        result.append(item)
+
+        return results
+
+    def xpath(self, expression: str) -> Union[List, str, float, bool]:
+        """
+        Evaluate the XPath `expression` with this tag as the context node.
+
+        Example:
+            dom.xpath("//div[@class='price'][1]/text()")
+
+        See :mod:`dhtmlparser3.xpath` for the supported subset of XPath 1.0.
+        Compiled expressions are cached.
+
+        Args:
+            expression (str): XPath expression.
+
+        Returns:
+            list / str / float / bool: List of the matched tags (strings for \
+            text nodes and attributes) in the document order, or the value of \
+            the expression.
         """
-        return list(self.find_depth_first_iter(name, p, fn, case_sensitive))
+        # imported here, because the xpath module works with the Tag class
+        from dhtmlparser3.xpath import compile_xpath
+
+        return compile_xpath(expression).evaluate(self)
 
     def findb(self, name, p=None, fn=None, case_sensitive=False) -> List["Tag"]:
         """
@@ -341,15 +930,34 @@ class Tag:
     def find_depth_first_iter(
         self, name, p=None, fn=None, case_sensitive=False
     ) -> Iterator["Tag"]:
-        for item in self.depth_first_iterator(tags_only=True):
-            if item._is_almost_equal(name, p, fn, case_sensitive):
-                yield item
+        query = compile_query(name, p, fn, case_sensitive)
+        matches = query.matches
+
+        stack = [iter((self,))]
+        while stack:
+            for item in stack[-1]:
+                if not isinstance(item, Tag):
+                    continue
+
+                if item._find_shortcut is not None:
+                    found = item._find_shortcut(query)
+                    if found is not None:
+                        yield from found
+                        continue
+
+                if matches(item):
+                    yield item
+                stack.append(iter(item.content))
+                break
+            else:
+                stack.pop()
 
     def find_breadth_first_iter(
         self, name, p=None, fn=None, case_sensitive=False
     ) -> Iterator["Tag"]:
+        matches = compile_query(name, p, fn, case_sensitive).matches
         for item in self.breadth_first_iterator(tags_only=True):
-            if item._is_almost_equal(name, p, fn, case_sensitive):
+            if matches(item):
                 yield item
 
     def depth_first_iterator(
@@ -357,11 +965,19 @@ class Tag:
     ) -> Iterator[Union["Tag", str, Comment]]:
         yield self
 
-        for item in self.content:
-            if isinstance(item, Tag):
-                yield from item.depth_first_iterator(tags_only)
-            elif not tags_only:
-                yield item
+        # stack of the iterators over the content instead of the recursion,
+        # so the cost of each item doesn't depend on the depth of the tree
+        stack = [iter(self.content)]
+        while stack:
+            for item in stack[-1]:
+                if isinstance(item, Tag):
+                    yield item
+                    stack.append(iter(item.content))
+                    break
+                elif not tags_only:
+                    yield item
+            else:
+                stack.pop()
 
     def breadth_first_iterator(
         self, tags_only=False, _first_call=True
@@ -513,12 +1129,7 @@ class Tag:
         return not self.__eq__(other)
 
     def __hash__(self):
-        rolling_hash = hash(self.tag_to_str())
-
-        for item in self.content:
-            rolling_hash ^= hash(item)
-
-        return rolling_hash
+        return hash(self.fingerprint())
 
     def __bool__(self):
         return bool(self.content)
@@ -534,8 +1145,10 @@ class Tag:
 
     def __setitem__(self, key, value):
         if isinstance(key, str):
+            self._mark_dirty(tag=True)
             self.parameters[key] = str(value)
         elif isinstance(key, slice):  # used for inserting
+            self._mark_dirty(content=True)
             if key.start == -1:
                 self.content.append(value)
             elif key.start == 0:
@@ -546,6 +1159,7 @@ class Tag:
                 index = self.content.index(item)
                 self.content.insert(index, value)
         else:
+            self._mark_dirty(content=True)
             item = self.tags[key]
             index = self.content.index(item)
             self.content[index] = value
@@ -561,6 +1175,7 @@ class Tag:
 
     def __delitem__(self, key):
         if isinstance(key, str):
+            self._mark_dirty(tag=True)
             del self.parameters[key]
         else:
             self.remove_item(self.tags[key])
@@ -569,15 +1184,19 @@ class Tag:
         return iter(self.tags)
 
     def __copy__(self):
-        new_tag = Tag(self.name, self.parameters.copy(), self.content, self.is_non_pair)
+        # the content is shared, so it keeps the original parent
+        new_tag = Tag(self.name, self.parameters.copy(), is_non_pair=self.is_non_pair)
+        new_tag.content = self.content
         new_tag._wfind_only_on_content = self._wfind_only_on_content
         new_tag.parent = self.parent
+        new_tag._copy_span(self)
 
         return new_tag
 
     def __deepcopy__(self, memodict={}):
         new_tag = Tag(self.name, self.parameters.copy(), is_non_pair=self.is_non_pair)
         new_tag._wfind_only_on_content = self._wfind_only_on_content
+        new_tag._copy_span(self)
 
         new_tag.content = [copy.deepcopy(x, memodict) for x in self.content]
         for item in new_tag.content:
@@ -585,3 +1204,139 @@ class Tag:
                 item.parent = new_tag
 
         return new_tag
+
+    def save_index(self, path: str):
+        """
+        Save the tree with the index of the names and parameters to the file
+        at `path`.
+
+        Open the file with :func:`dhtmlparser3.sharing.load`, which maps it
+        to the memory without parsing. The result is read-only
+        :class:`.CompactDocument`, which answers :meth:`find` from the
+        index.
+
+        Args:
+            path (str): Path to the file.
+        """
+        # imported here, because the compact module works with the Tag class
+        from dhtmlparser3.sharing import save
+        from dhtmlparser3.compact import CompactDocument
+
+        save(CompactDocument.from_dom(self), path, index=True)
+
+    def cow_clone(self) -> "Tag":
+        """
+        Return copy-on-write clone of the tag in O(1).
+
+        The clone is :class:`.SharedTag` view of this tag. Its content is
+        created level by level when accessed, and the parameters are copied
+        only for the tags modified through the Tag API, so editing a tag in
+        the clone costs O(depth) instead of copying the whole tree.
+
+        This tag is the template of the clone, so don't modify it as long as
+        you use the clones.
+        """
+        # imported here, because SharedTag is a subclass of Tag
+        from dhtmlparser3.tags.shared_tag import SharedTag
+
+        return SharedTag(self)
+
+    def _copy_span(self, other: "Tag"):
+        if other.source is not None:
+            self.start = other.start
+            self.end = other.end
+            self.source = other.source
+            self._tag_end = other._tag_end
+            self._content_end = other._content_end
+            self._tag_dirty = other._tag_dirty
+            self._content_dirty = other._content_dirty
+            self._subtree_dirty = other._subtree_dirty
+
+
+def _parameter_to_str(key: str, value) -> str:
+    """
+    Convert one parameter of the tag to ``key="value"``.
+    """
+    if isinstance(value, RawText):
+        return f'{key}="{escape(value.raw)}"'
+    elif value:
+        return f'{key}="{escape(str(value))}"'
+
+    return f"{key}"
+
+
+class _Numbering:
+    """
+    Shared by all tags numbered by one :meth:`Tag.number_nodes` call.
+    """
+    __slots__ = ("valid",)
+
+    def __init__(self):
+        self.valid = True
+
+
+class _QueryCache:
+    """
+    Results of the queries, valid for the `generation` of the document.
+    """
+    __slots__ = ("generation", "results")
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.results = {}
+
+
+_CACHE_SIZE = 256
+_VALUE_PREDICATES = (Equals, Regex, Prefix, Contains, ClassToken)
+
+
+def _query_key(query: Query) -> Optional[tuple]:
+    """
+    Hashable key of the `query`, equal for the equal queries, or None if the
+    query can't be cached.
+    """
+    if query.fn is not None:
+        return None
+
+    parameters = []
+    for key, predicate in query.parameters:
+        # other predicates may have any state, so they are compared by identity
+        value = predicate
+        if type(predicate) in _VALUE_PREDICATES:
+            value = tuple(getattr(predicate, slot) for slot in predicate.__slots__)
+
+        parameters.append((key, predicate.__class__, value))
+
+    key = (query.name, tuple(sorted(parameters)), query.case_sensitive)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+
+    return key
+
+
+def _path_key(args) -> Optional[tuple]:
+    keys = tuple(_query_key(compile_query(*_find_arguments(arg))) for arg in args)
+    if None in keys:
+        return None
+
+    return keys
+
+
+def _find_arguments(arg) -> tuple:
+    """
+    Convert `arg` in the format used by :meth:`Tag.match` to the tuple of
+    :meth:`Tag.find` arguments.
+    """
+    def arguments(name, p=None, fn=None, case_sensitive=False):
+        return name, p, fn, case_sensitive
+
+    if isinstance(arg, Query):
+        return (arg,)
+    elif isinstance(arg, dict):
+        return arguments(**arg)
+    elif isinstance(arg, list) or isinstance(arg, tuple):
+        return arguments(*arg)
+    else:
+        return arguments(arg)
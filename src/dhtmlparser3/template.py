@@ -0,0 +1,186 @@
+"""
+This module compiles the DOM with placeholders to the template, which can be
+rendered repeatedly without the serialization of the whole tree.
+
+Example usage::
+
+    >>> dom = Tag("div", {"class": Slot("cls")}, [
+    ...     Tag("h1", content=[Slot("title")]),
+    ...     Tag("p", content=["Static text."]),
+    ... ])
+    >>> template = compile_template(dom)
+    >>> template.render(title="Fish & chips", cls="menu")
+    '<div class="menu"><h1>Fish &amp; chips</h1><p>Static text.</p></div>'
+
+Static parts of the tree are serialized once, by :meth:`.Tag.to_string`
+rules. Rendering just escapes the values of the slots and joins the parts.
+"""
+import html
+from typing import List
+
+from dhtmlparser3.tags.tag import Tag
+from dhtmlparser3.tags.tag import _parameter_to_str
+
+
+class Slot:
+    """
+    Placeholder for the text in the ``.content`` of the tag, or for the
+    value of the parameter.
+
+    Attributes:
+        name (str): Name of the slot, used in :meth:`Template.render`.
+        default (str): Value used, when the slot is not set. Default ``""``.
+    """
+    def __init__(self, name: str, default: str = ""):
+        self.name = name
+        self.default = default
+
+    def to_string(self) -> str:
+        return html.escape(str(self.default))
+
+    def prettify(self, depth=0, dont_format=False) -> str:
+        return self.to_string()
+
+    def __str__(self):
+        return str(self.default)
+
+    def __bool__(self):
+        return bool(self.default)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.name!r})"
+
+
+def _text_slot(value) -> str:
+    if isinstance(value, Tag):
+        return value.to_string()
+
+    return html.escape(str(value))
+
+
+def _raw_text_slot(value) -> str:
+    if isinstance(value, Tag):
+        return value.to_string()
+
+    return str(value)
+
+
+def _parameter_slot(key: str):
+    def format_value(value) -> str:
+        if value is None:
+            return ""
+
+        return " " + _parameter_to_str(key, str(value))
+
+    return format_value
+
+
+class Template:
+    """
+    DOM compiled to the list of static strings and the slots. Use
+    :func:`compile_template` to create it.
+
+    Attributes:
+        slot_names (set): Names of all slots in the template.
+    """
+    def __init__(self, dom: Tag):
+        self._parts = []
+        self._slots = []
+        self._compile_tag(dom)
+        self._join_static_parts()
+
+        self.slot_names = {name for _, name, _, _ in self._slots}
+
+    def render(self, **values) -> str:
+        """
+        Render the template.
+
+        Values of the text slots are escaped (except in ``<script>`` and
+        ``<style>``), :class:`.Tag` values are serialized. Parameter with
+        None value is left out.
+
+        Args:
+            **values: Slot name -> value. Unset slots use their default.
+
+        Returns:
+            str: HTML.
+        """
+        parts = self._parts.copy()
+        for index, name, default, format_value in self._slots:
+            parts[index] = format_value(values.get(name, default))
+
+        return "".join(parts)
+
+    def _add_slot(self, slot: Slot, format_value):
+        self._slots.append((len(self._parts), slot.name, slot.default, format_value))
+        self._parts.append(None)
+
+    def _compile_tag(self, tag: Tag):
+        parts = self._parts
+        if tag.name:
+            parts.append(f"<{tag.name}")
+            for key, value in tag.parameters.items():
+                if isinstance(value, Slot):
+                    self._add_slot(value, _parameter_slot(key))
+                else:
+                    parts.append(" " + _parameter_to_str(key, value))
+
+            parts.append(" />" if tag.is_non_pair else ">")
+
+        escape_fn = html.escape
+        text_slot = _text_slot
+        if tag.name in Tag._DONT_ESCAPE:
+            escape_fn = lambda x: x
+            text_slot = _raw_text_slot
+
+        for item in tag.content:
+            if isinstance(item, str):
+                parts.append(escape_fn(item))
+            elif isinstance(item, Slot):
+                self._add_slot(item, text_slot)
+            elif isinstance(item, Tag):
+                self._compile_tag(item)
+            else:
+                parts.append(item.to_string())
+
+        if tag.name and not tag.is_non_pair:
+            parts.append(f"</{tag.name}>")
+
+    def _join_static_parts(self):
+        parts = []
+        slots = iter(self._slots)
+        new_slots = []
+
+        static = []
+        for part in self._parts:
+            if part is not None:
+                static.append(part)
+                continue
+
+            if static:
+                parts.append("".join(static))
+                static = []
+
+            _, name, default, format_value = next(slots)
+            new_slots.append((len(parts), name, default, format_value))
+            parts.append(None)
+
+        if static:
+            parts.append("".join(static))
+
+        self._parts = parts
+        self._slots = new_slots
+
+
+def compile_template(dom: Tag) -> Template:
+    """
+    Compile the `dom` with :class:`Slot` placeholders in the ``.content`` or
+    as the values of the parameters to the :class:`Template`.
+
+    Args:
+        dom (Tag): DOM with slots.
+
+    Returns:
+        Template: Template, which can be rendered many times.
+    """
+    return Template(dom)
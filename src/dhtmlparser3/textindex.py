@@ -0,0 +1,188 @@
+"""
+This module contains the inverted index of the words in the texts of the
+DOM, used by ``.find(text_contains=...)``.
+
+Example usage::
+
+    >>> dom.find("p", text_contains="free shipping")
+    [Tag('p', parameters=SpecialDict(), is_non_pair=False)]
+
+The index is built in one pass over the tree, the first time the
+`text_contains` query is used, and is reused until the tree is modified
+through the Tag API (see :meth:`.Tag.text_index`).
+
+Words are the runs of the alphanumeric characters (``\\w+``) in each text,
+compared case insensitively. The text of the tag matches, if its words
+contain the words of the phrase in the same order, next to each other, even
+across the tags (``<p>free <b>shipping</b></p>``). The word is never joined
+across the tags, so ``<p>one</p><p>two</p>`` contains the words ``one``
+and ``two``, not ``onetwo``.
+"""
+import re
+from bisect import bisect_right
+from typing import List
+
+from dhtmlparser3.tags.tag import Tag
+from dhtmlparser3.tags.raw_text import RawText
+
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def words(text: str) -> List[str]:
+    """
+    Split the `text` to the normalized words, as they are indexed.
+    """
+    return [word.casefold() for word in _WORD_RE.findall(text)]
+
+
+class TextIndex:
+    """
+    Inverted index of the words in the sub-tree of `dom`.
+
+    Tags are identified by their order in the pre-order traversal, which is
+    also the order of the results.
+
+    Attributes:
+        valid (bool): False after the modification of the indexed tree.
+    """
+    def __init__(self, dom: Tag):
+        self.valid = True
+
+        self._tags = []
+        self._orders = {}
+        self._parents = []
+        self._starts = []
+        self._ends = []
+
+        self._text_starts = []
+        self._text_owners = []
+
+        self._words = []
+        self._word_starts = []
+        self._word_ends = []
+        self._postings = {}
+
+        self._index(dom)
+
+    def __contains__(self, tag: Tag) -> bool:
+        return id(tag) in self._orders
+
+    def containing(self, text: str, within: Tag = None) -> List[Tag]:
+        """
+        Find the tags, whose text contains the words of the `text`.
+
+        Args:
+            text (str): Phrase of one or more words.
+            within (Tag): Return only the tags in the sub-tree of this one,
+                including it. Default None for the whole index.
+
+        Raises:
+            ValueError: If there are no words in `text`, or the `within` tag
+                is not indexed.
+
+        Returns:
+            list: Matching tags (and all their ancestors) in the document order.
+        """
+        phrase = words(text)
+        if not phrase:
+            raise ValueError(f"There are no words in {text!r}!")
+
+        postings = [self._postings.get(word) for word in phrase]
+        if not all(postings):
+            return []
+
+        within_order = 0
+        if within is not None:
+            within_order = self._orders.get(id(within))
+            if within_order is None:
+                raise ValueError(f"{within!r} is not indexed!")
+
+        found = set()
+        for start, end in self._occurrences(phrase, postings):
+            if start < self._starts[within_order] or end > self._ends[within_order]:
+                continue
+
+            order = self._deepest_containing(start, end)
+            while order not in found:
+                found.add(order)
+                if order == within_order:
+                    break
+                order = self._parents[order]
+
+        return [self._tags[order] for order in sorted(found)]
+
+    def _index(self, dom: Tag):
+        length = 0
+
+        stack = [(dom, -1)]
+        while stack:
+            item, parent = stack.pop()
+
+            # end of the tag
+            if item is None:
+                self._ends[parent] = length
+                continue
+
+            if isinstance(item, Tag):
+                order = len(self._tags)
+                self._tags.append(item)
+                self._orders[id(item)] = order
+                self._parents.append(parent)
+                self._starts.append(length)
+                self._ends.append(length)
+                item._text_index = self
+
+                stack.append((None, order))
+                stack.extend((child, order) for child in reversed(item.content))
+                continue
+
+            if isinstance(item, str):
+                text = item
+            elif isinstance(item, RawText):
+                text = item.text
+            else:
+                continue
+
+            if text:
+                self._text_starts.append(length)
+                self._text_owners.append(parent)
+                self._index_words(text, length)
+                length += len(text)
+
+    def _index_words(self, text: str, offset: int):
+        postings = self._postings
+        for match in _WORD_RE.finditer(text):
+            word = match.group().casefold()
+            postings.setdefault(word, []).append(len(self._words))
+            self._words.append(word)
+            self._word_starts.append(offset + match.start())
+            self._word_ends.append(offset + match.end())
+
+    def _occurrences(self, phrase: List[str], postings: List[list]):
+        """
+        Yield the ``(start, end)`` offsets of the `phrase` in the text,
+        checking the positions of its rarest word.
+        """
+        pivot = min(range(len(phrase)), key=lambda index: len(postings[index]))
+        last = len(phrase) - 1
+        indexed_words = self._words
+
+        for position in postings[pivot]:
+            first = position - pivot
+            if first < 0 or first + last >= len(indexed_words):
+                continue
+
+            if all(
+                indexed_words[first + index] == word
+                for index, word in enumerate(phrase)
+            ):
+                yield self._word_starts[first], self._word_ends[first + last]
+
+    def _deepest_containing(self, start: int, end: int) -> int:
+        text = bisect_right(self._text_starts, start) - 1
+        order = self._text_owners[text]
+        while self._ends[order] < end:
+            order = self._parents[order]
+
+        return order
@@ -1,58 +1,102 @@
+import re
 from typing import List
 from typing import Iterator
 
+from dhtmlparser3 import entities
 from dhtmlparser3.tokens import Token
 from dhtmlparser3.tokens import TagToken
 from dhtmlparser3.tokens import TextToken
 from dhtmlparser3.tokens import EntityToken
 from dhtmlparser3.tokens import CommentToken
 from dhtmlparser3.tokens import ParameterToken
+from dhtmlparser3.tags.raw_text import RawText
+
+
+def _text_token(text, start, end, lazy_entities):
+    if lazy_entities and "&" in text:
+        token = TextToken(RawText(text))
+    else:
+        token = TextToken(text)
+
+    token.start = start
+    token.end = end
+    return token
 
 
 class Tokenizer:
     tokens: List[Token]
-    MAX_ENTITY_LENGTH = 20
-
-    def __init__(self, string: str):
+    MAX_ENTITY_LENGTH = entities.MAX_NAME_LENGTH
+    _TEXT_END_RE = re.compile("[<&]")
+    _LAZY_TEXT_END_RE = re.compile("<")
+
+    def __init__(self, string: str, lazy_entities=False):
+        """
+        Args:
+            string (str): String to tokenize.
+            lazy_entities (bool): Don't decode entities in texts and quoted
+                parameter values. Such values are returned as :class:`.RawText`
+                and decoded on access. Default False.
+        """
         self.string = string
+        self.lazy_entities = lazy_entities
 
         self.pointer = 0
         self.buffer = ""
         self.char = string[0] if string else ""
         self.end = len(string) - 1
 
+        # quote of the parameter value, which is not closed before the end
+        self._unclosed_quote = None
+
     def tokenize(self) -> List[Token]:
         return list(self.tokenize_iter())
 
     def tokenize_iter(self) -> Iterator[Token]:
         if self.end == 0:
-            yield TextToken(self.string)
+            yield self._text_token(self.string, 0, 1)
             return
 
-        token = self._scan_token()
-
-        new_tokens = [token]
-        if isinstance(token, EntityToken):
-            new_tokens = [TextToken(token.to_text())]
-
-        while not self.is_at_end():
+        # consecutive texts and entities are joined into one TextToken
+        text_pieces = []
+        text_start = 0
+        while True:
             token = self._scan_token()
 
             if isinstance(token, EntityToken):
-                token = TextToken(token.to_text())
+                if not text_pieces:
+                    text_start = token.start
+                text_pieces.append(token.to_text())
+            elif isinstance(token, TextToken):
+                if not text_pieces:
+                    text_start = token.start
+                text_pieces.append(token.content)
+            else:
+                if text_pieces:
+                    text = "".join(text_pieces)
+                    yield self._text_token(text, text_start, token.start)
+                    text_pieces.clear()
+
+                yield token
+
+            if self.is_at_end():
+                break
+
+        if text_pieces:
+            text = "".join(text_pieces)
+            yield self._text_token(text, text_start, self.end + 1)
+
+    def _text_token(self, text, start, end):
+        return _text_token(text, start, end, self.lazy_entities)
 
-            if isinstance(new_tokens[-1], TextToken) and isinstance(token, TextToken):
-                new_tokens[-1].content += token.content
-                continue
-
-            yield from new_tokens
-            new_tokens.clear()
-            new_tokens.append(token)
+    def _scan_token(self):
+        start = self.pointer
+        token = self._scan()
+        token.start = start
+        token.end = min(self.pointer, self.end + 1)
 
-        if new_tokens:
-            yield from new_tokens
+        return token
 
-    def _scan_token(self):
+    def _scan(self):
         if self.char == "<":
             pointer = self.pointer
             try:
@@ -60,7 +104,7 @@ class Tokenizer:
             except IOError:
                 self.buffer = ""
                 return TextToken(self.string[pointer:self.pointer])
-        elif self.char == "&":
+        elif self.char == "&" and not self.lazy_entities:
             return self._consume_entity()
         else:
             return self._consume_text()
@@ -92,25 +136,33 @@ class Tokenizer:
             elif self.char == "<":
                 raise IOError("New tag start.")
 
+            parameter_start = self.pointer
             parameter_name = self._consume_parameter_name()
+            parameter_end = self.pointer
             self._consume_whitespaces()
 
             if self.char == "/":
                 self.advance()
                 if parameter_name:
-                    tag.parameters.append(ParameterToken(parameter_name))
+                    parameter = ParameterToken(parameter_name)
+                    tag.parameters.append(parameter)
+                    parameter.start, parameter.end = parameter_start, parameter_end
                 tag.is_non_pair = True
                 continue
 
             elif self.char == ">":
-                tag.parameters.append(ParameterToken(parameter_name))
+                parameter = ParameterToken(parameter_name)
+                tag.parameters.append(parameter)
+                parameter.start, parameter.end = parameter_start, parameter_end
                 continue
 
             elif self.char == "=":
                 self.advance()
                 self._consume_whitespaces()
                 parameter_value = self._consume_parameter_value()
-                tag.parameters.append(ParameterToken(parameter_name, parameter_value))
+                parameter = ParameterToken(parameter_name, parameter_value)
+                tag.parameters.append(parameter)
+                parameter.start, parameter.end = parameter_start, self.pointer
                 continue
 
         raise IOError("End of string while parsing tag!")
@@ -171,84 +223,56 @@ class Tokenizer:
 
     def _consume_quoted_parameter_value(self):
         quote_type = self.char
-        self.advance()
+        value_start = self.pointer + 1
 
-        if self.char == quote_type:
-            self.advance()
-            return ""
+        value_end = self.string.find(quote_type, value_start)
+        if value_end == -1:
+            self._unclosed_quote = quote_type
+            self._jump_to(self.end + 1)
+            raise IOError("End of string while parsing parameter value!")
 
-        while not self.is_at_end():
-            if self.char == quote_type:
-                self.advance()
-                return self.return_reset_buffer()
+        self._jump_to(value_end + 1)
+        value = self.string[value_start:value_end]
+        if self.lazy_entities:
+            return RawText(value, in_attribute=True) if "&" in value else value
 
-            if self.char == "&":
-                buffer = self.buffer
-                buffer += self._consume_entity().to_text()
-                self.buffer = buffer
-                continue
-
-            self.buffer += self.char
-            self.advance()
-
-        raise IOError("End of string while parsing parameter value!")
+        return entities.decode(value, in_attribute=True)
 
     def _consume_comment(self):
         self.advance()  # consume !
         self.advance()  # consume -
+        content_start = self.pointer + 1  # after the second -
 
-        self.buffer = ""
-        while not self.is_at_end():
-            char = self.advance()
-
-            if char == "-" and self.peek_is("-") and self.peek_two_is(">"):
-                self.advance()  # consume -
-                self.advance()  # consume -
-                self.advance()  # consume >
-                return CommentToken(self.return_reset_buffer())
+        content_end = self.string.find("-->", content_start)
+        if content_end == -1:
+            self._jump_to(self.end + 1)
+            return TextToken(f"<!--{self.string[content_start:]}")
 
-            self.buffer += char
-
-        return TextToken(f"<!--{self.return_reset_buffer()}")
+        self._jump_to(content_end + 3)
+        return CommentToken(self.string[content_start:content_end])
 
     def _consume_entity(self):
-        length = 0
-        self.buffer = self.char
-        while not self.is_at_end():
-            char = self.advance()
-            length += 1
-
-            if char == " ":
-                return TextToken(self.return_reset_buffer())
-
-            if length > self.MAX_ENTITY_LENGTH:
-                return TextToken(self.return_reset_buffer())
-
-            self.buffer += char
-
-            if char == ";":
-                if self.buffer != "&;":
-                    if not self.is_at_end():
-                        self.advance()
-
-                    return EntityToken(self.return_reset_buffer())
+        start = self.pointer
+        matched = entities.match(self.string, start)
+        if matched is None:
+            self.advance()  # consume &
+            return TextToken("&")
 
-                return TextToken(self.return_reset_buffer())
-
-        if self.buffer:
-            return TextToken(self.return_reset_buffer())
+        text, end = matched
+        self._jump_to(end)
+        return EntityToken(self.string[start:end], text)
 
     def _consume_text(self):
-        self.buffer += self.char
-        while not self.is_at_end():
-            char = self.advance()
-
-            if char == "<" or char == "&":
-                return TextToken(self.return_reset_buffer())
+        text_end_re = self._TEXT_END_RE
+        if self.lazy_entities:
+            text_end_re = self._LAZY_TEXT_END_RE
 
-            self.buffer += char
+        text_end = text_end_re.search(self.string, self.pointer + 1)
+        text_end = text_end.start() if text_end else self.end + 1
 
-        return TextToken(self.return_reset_buffer())
+        text = self.string[self.pointer:text_end]
+        self._jump_to(text_end)
+        return TextToken(text)
 
     def return_reset_buffer(self):
         buffer = self.buffer
@@ -265,6 +289,12 @@ class Tokenizer:
 
         return self.char
 
+    def _jump_to(self, pointer):
+        self.pointer = pointer
+
+        if pointer <= self.end:
+            self.char = self.string[pointer]
+
     def is_at_end(self):
         return self.pointer > self.end
 
@@ -289,3 +319,163 @@ class Tokenizer:
             return self.string[self.pointer + 2]
 
         return ""
+
+
+class IncrementalTokenizer:
+    """
+    Tokenizer fed by chunks of the string.
+
+    Tokens are returned as soon as the following data can't change them, the
+    rest is kept and tokenized again with the next chunk. Offsets of the tokens
+    are relative to the start of the whole input.
+
+    The rest is tokenized again only when the chunk contains the end of its
+    first (incomplete) token, like ``-->`` for the comment, so large tokens
+    fed in small chunks are not scanned over and over.
+    """
+    # enough to decide any entity at the end of the stable part
+    SAFETY_MARGIN = Tokenizer.MAX_ENTITY_LENGTH + 1
+
+    _TOKEN_END_RE = re.compile("[<>&]")
+    _COMMENT_END_RE = re.compile("-->")
+    _TAG_END_RE = re.compile("[<>'\"]")
+
+    def __init__(self, lazy_entities=False):
+        self.lazy_entities = lazy_entities
+
+        self.buffer = ""
+        self.offset = 0
+
+        # chunks not yet added to the buffer, joined before the tokenization
+        self._chunks = []
+        # end of the first token has to match this, end of the comment may
+        # start in the `_tail` of the previous chunk
+        self._token_end_re = self._TOKEN_END_RE
+        self._tail = ""
+
+        self._text_pieces = []
+        self._text_start = 0
+        self._text_end = 0
+
+    def feed(self, chunk: str) -> List[Token]:
+        """
+        Add `chunk` to the input.
+
+        Returns:
+            list: Tokens, which are complete.
+        """
+        self._chunks.append(chunk)
+
+        # no token can end in this chunk, so there is nothing new to return
+        data = self._tail + chunk
+        self._tail = data[-2:]
+        if not self._token_end_re.search(data):
+            return []
+
+        return self._tokenize(final=False)
+
+    def close(self) -> List[Token]:
+        """
+        Tokenize the rest of the input.
+
+        Returns:
+            list: Remaining tokens.
+        """
+        tokens = self._tokenize(final=True)
+
+        if self._text_pieces:
+            tokens.append(self._join_text())
+
+        return tokens
+
+    def _tokenize(self, final):
+        if self._chunks:
+            self.buffer += "".join(self._chunks)
+            self._chunks.clear()
+
+        buffer = self.buffer
+        if not buffer:
+            return []
+
+        tokens = []
+        tokenizer = Tokenizer(buffer, self.lazy_entities)
+        stable_end = len(buffer) - self.SAFETY_MARGIN
+        processed = 0
+        self._token_end_re = self._TOKEN_END_RE
+        while not tokenizer.is_at_end():
+            token = tokenizer._scan_token()
+
+            # last token may be incomplete
+            if not final and (token.end > stable_end or tokenizer.is_at_end()):
+                if tokenizer.is_at_end():
+                    self._token_end_re = self._incomplete_token_end(token, tokenizer)
+                break
+
+            processed = token.end
+            self._shift_offsets(token)
+            self._add_token(token, tokens)
+
+        self.buffer = buffer[processed:]
+        self.offset += processed
+
+        return tokens
+
+    def _incomplete_token_end(self, token, tokenizer):
+        """
+        Return the pattern, which has to follow, before the `token` running to
+        the end of the buffer can end differently.
+        """
+        if not isinstance(token, TextToken) or token.content == "<>":
+            return self._TOKEN_END_RE
+
+        first_char = tokenizer.string[token.start]
+        if first_char == "<":
+            if token.content.startswith("<!--"):
+                return self._COMMENT_END_RE
+            if tokenizer._unclosed_quote is not None:
+                return re.compile(tokenizer._unclosed_quote)
+
+            return self._TAG_END_RE
+
+        if first_char == "&":
+            return self._TOKEN_END_RE
+
+        if self.lazy_entities:
+            return Tokenizer._LAZY_TEXT_END_RE
+
+        return Tokenizer._TEXT_END_RE
+
+    def _shift_offsets(self, token):
+        token.start += self.offset
+        token.end += self.offset
+
+        if isinstance(token, TagToken):
+            for parameter in token.parameters:
+                parameter.start += self.offset
+                parameter.end += self.offset
+
+    def _add_token(self, token, tokens):
+        # consecutive texts and entities are joined into one TextToken, even
+        # over the boundaries of the chunks
+        if isinstance(token, EntityToken):
+            text = token.to_text()
+        elif isinstance(token, TextToken):
+            text = token.content
+        else:
+            if self._text_pieces:
+                tokens.append(self._join_text())
+
+            tokens.append(token)
+            return
+
+        if not self._text_pieces:
+            self._text_start = token.start
+
+        self._text_pieces.append(text)
+        self._text_end = token.end
+
+    def _join_text(self):
+        text = "".join(self._text_pieces)
+        self._text_pieces.clear()
+
+        return _text_token(text, self._text_start, self._text_end, self.lazy_entities)
@@ -1,7 +1,16 @@
+from dhtmlparser3 import entities
 from dhtmlparser3.tags.tag import Tag
 
 
 class Token:
+    """
+    Attributes:
+        start (int): Offset of the first character of the token in the source.
+        end (int): Offset just after the last character of the token.
+    """
+    start = None
+    end = None
+
     def __ne__(self, other):
         return not self.__eq__(other)
 
@@ -117,37 +126,15 @@ class CommentToken(Token):
 
 
 class EntityToken(Token):
-    NAMED_ENTITIES = {
-        "&amp;": "&",
-        "&lt;": "<",
-        "&gt;": ">",
-        "&nonbreakingspace;": "\xa0",
-        "&nbsp;": "\xa0",
-        "&quot;": '"',
-        "&apos;": "'",
-        "&cent;": "¢",
-        "&pound;": "£",
-        "&yen;": "¥",
-        "&euro;": "€",
-        "&copy;": "©",
-        "&reg;": "®",
-    }
-
-    def __init__(self, content=""):
-        self.content = content.lower()
+    def __init__(self, content="", text=None):
+        self.content = content
+        self.text = text
 
     def to_text(self):
-        representation = self.NAMED_ENTITIES.get(self.content)
-        if representation:
-            return representation
+        if self.text is None:
+            self.text = entities.decode(self.content)
 
-        if self.content.startswith("&#x"):
-            return chr(int("0" + self.content[2:-1], 16))
-
-        if self.content.startswith("&#"):
-            return chr(int(self.content[2:-1]))
-
-        return self.content
+        return self.text
 
     def __eq__(self, other):
         if not isinstance(other, EntityToken):
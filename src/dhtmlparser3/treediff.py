@@ -0,0 +1,317 @@
+"""
+This module compares two versions of the DOM and produces edit script, which
+transforms the old version to the new one.
+
+Example usage::
+
+    >>> old = dhtmlparser3.parse("<ul><li>a</li><li class=x>b</li></ul>")
+    >>> new = dhtmlparser3.parse("<ul><li>a</li><li class=y>b</li><li>c</li></ul>")
+    >>> edits = dhtmlparser3.diff(old, new)
+    >>> edits
+    [SetAttribute((1,), 'class', 'y'), Insert((), 2, Tag('li', ...))]
+    >>> dhtmlparser3.patch(old, edits).deep_equals(new)
+    True
+
+Identical sub-trees are recognized by :meth:`.Tag.fingerprint` and skipped,
+so the work is spent mostly on the changed parts of the tree. Children of
+the tags are aligned by the longest matching blocks (:mod:`difflib`), the
+remaining tags with the same name are compared recursively.
+
+Edits address the tags by `path`, which is a tuple of indexes into the
+``.content`` lists, starting from the root. Edits have to be applied in the
+order of the script, each of them expects the tree modified by the previous
+ones.
+"""
+import copy
+import difflib
+from typing import List
+from typing import Tuple
+from typing import Union
+
+from dhtmlparser3.tags.tag import Tag
+from dhtmlparser3.tags.comment import Comment
+
+
+class Edit:
+    """
+    Base class of the edits.
+
+    Attributes:
+        path (tuple): Indexes into the ``.content`` lists from the root to the
+            edited tag.
+    """
+    def __init__(self, path: Tuple[int, ...]):
+        self.path = tuple(path)
+
+    def apply(self, dom: Tag):
+        """
+        Apply the edit to the `dom`.
+        """
+        self._apply(_resolve(dom, self.path))
+
+    def _apply(self, tag: Tag):
+        raise NotImplementedError()
+
+    def _values(self) -> tuple:
+        return (self.path,)
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return False
+
+        return self._values() == other._values()
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __repr__(self):
+        parameters = ", ".join(repr(value) for value in self._values())
+        return f"{self.__class__.__name__}({parameters})"
+
+
+class Insert(Edit):
+    """
+    Insert `item` (tag, string or comment) to the ``.content`` at `index`.
+    """
+    def __init__(self, path, index: int, item: Union[Tag, str, Comment]):
+        super().__init__(path)
+        self.index = index
+        self.item = item
+
+    def _apply(self, tag):
+        item = copy.deepcopy(self.item)
+        if isinstance(item, Tag):
+            item.parent = tag
+
+        tag.content.insert(self.index, item)
+        tag._mark_dirty(content=True)
+
+    def _values(self):
+        return self.path, self.index, self.item
+
+
+class Delete(Edit):
+    """
+    Remove item at `index` from the ``.content``.
+    """
+    def __init__(self, path, index: int):
+        super().__init__(path)
+        self.index = index
+
+    def _apply(self, tag):
+        del tag.content[self.index]
+        tag._mark_dirty(content=True)
+
+    def _values(self):
+        return self.path, self.index
+
+
+class ReplaceText(Edit):
+    """
+    Replace the text at `index` in the ``.content`` with `text`.
+    """
+    def __init__(self, path, index: int, text: str):
+        super().__init__(path)
+        self.index = index
+        self.text = text
+
+    def _apply(self, tag):
+        tag.content[self.index] = self.text
+        tag._mark_dirty(content=True)
+
+    def _values(self):
+        return self.path, self.index, self.text
+
+
+class SetAttribute(Edit):
+    """
+    Set parameter `key` of the tag to `value`.
+    """
+    def __init__(self, path, key: str, value: str):
+        super().__init__(path)
+        self.key = key
+        self.value = value
+
+    def _apply(self, tag):
+        tag[self.key] = self.value
+
+    def _values(self):
+        return self.path, self.key, self.value
+
+
+class RemoveAttribute(Edit):
+    """
+    Remove parameter `key` of the tag.
+    """
+    def __init__(self, path, key: str):
+        super().__init__(path)
+        self.key = key
+
+    def _apply(self, tag):
+        del tag[self.key]
+
+    def _values(self):
+        return self.path, self.key
+
+
+class ReplaceTag(Edit):
+    """
+    Replace the whole tag (including the content) with `item`.
+    """
+    def __init__(self, path, item: Tag):
+        super().__init__(path)
+        self.item = item
+
+    def _apply(self, tag):
+        tag.replace_with(copy.deepcopy(self.item))
+        for item in tag.content:
+            if isinstance(item, Tag):
+                item.parent = tag
+
+    def _values(self):
+        return self.path, self.item
+
+
+def _resolve(dom: Tag, path: Tuple[int, ...]) -> Tag:
+    tag = dom
+    for index in path:
+        tag = tag.content[index]
+
+    return tag
+
+
+def diff(old: Tag, new: Tag) -> List[Edit]:
+    """
+    Compute the edits, which transform `old` DOM to the `new` one.
+
+    Args:
+        old (Tag): Original version of the DOM.
+        new (Tag): New version of the DOM.
+
+    Returns:
+        list: List of :class:`Edit` instances, empty if the trees are equal.
+    """
+    edits = []
+    if old.fingerprint() == new.fingerprint():
+        return edits
+
+    if not _compatible(old, new):
+        edits.append(ReplaceTag((), new))
+        return edits
+
+    _diff_tags(old, new, (), edits)
+    return edits
+
+
+def patch(dom: Tag, edits: List[Edit]) -> Tag:
+    """
+    Apply the `edits` from :func:`diff` to the `dom` in place.
+
+    Returns:
+        Tag: The modified `dom`.
+    """
+    for edit in edits:
+        edit.apply(dom)
+
+    return dom
+
+
+def _compatible(old, new) -> bool:
+    """
+    Can be `old` item updated to the `new` one?
+    """
+    if isinstance(old, Tag):
+        return (
+            isinstance(new, Tag)
+            and old.name == new.name
+            and old.is_non_pair == new.is_non_pair
+        )
+
+    if isinstance(old, Comment) or isinstance(new, (Tag, Comment)):
+        return False
+
+    return True  # two texts
+
+
+def _key(item):
+    if isinstance(item, Tag):
+        return item.fingerprint()
+    elif isinstance(item, Comment):
+        return ("c", item.content)
+
+    return ("s", str(item))
+
+
+def _diff_tags(old: Tag, new: Tag, path: tuple, edits: list):
+    """
+    Add edits for the `old` tag at `path` (already known to be different but
+    compatible with `new`) to the `edits`.
+    """
+    _diff_parameters(old, new, path, edits)
+
+    old_content = old.content
+    new_content = new.content
+    if len(old_content) == len(new_content) and all(
+        _key(first) == _key(second) for first, second in zip(old_content, new_content)
+    ):
+        return
+
+    # pairs of the compatible items, which are changed in place
+    updated = []
+    deleted = []
+    inserted = []
+
+    matcher = difflib.SequenceMatcher(
+        None,
+        [_key(item) for item in old_content],
+        [_key(item) for item in new_content],
+        autojunk=False,
+    )
+    for opcode, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if opcode == "equal":
+            continue
+
+        # pair the compatible items in the changed block, keeping the order
+        old_index = old_start
+        for new_index in range(new_start, new_end):
+            for candidate in range(old_index, old_end):
+                if _compatible(old_content[candidate], new_content[new_index]):
+                    deleted.extend(range(old_index, candidate))
+                    updated.append((candidate, new_index))
+                    old_index = candidate + 1
+                    break
+            else:
+                inserted.append(new_index)
+
+        deleted.extend(range(old_index, old_end))
+
+    # changes inside use the old indexes, so they go before the changes of
+    # this content list
+    for old_index, new_index in updated:
+        old_item = old_content[old_index]
+        new_item = new_content[new_index]
+        if isinstance(old_item, Tag):
+            _diff_tags(old_item, new_item, path + (old_index,), edits)
+        else:
+            edits.append(ReplaceText(path, old_index, str(new_item)))
+
+    for old_index in reversed(deleted):
+        edits.append(Delete(path, old_index))
+
+    for new_index in inserted:
+        edits.append(Insert(path, new_index, new_content[new_index]))
+
+
+def _diff_parameters(old: Tag, new: Tag, path: tuple, edits: list):
+    old_parameters = old.parameters
+    new_parameters = new.parameters
+    if old_parameters == new_parameters:
+        return
+
+    for key in old_parameters.keys():
+        if key not in new_parameters:
+            edits.append(RemoveAttribute(path, key))
+
+    for key, value in new_parameters.items():
+        if key not in old_parameters or str(old_parameters[key]) != str(value):
+            edits.append(SetAttribute(path, key, str(value)))
@@ -0,0 +1,1082 @@
+"""
+This module evaluates subset of the XPath 1.0 expressions on the
+:class:`.Tag` trees.
+
+Example usage::
+
+    >>> dom = dhtmlparser3.parse('<ul><li><a href="/a">A</a></li><li>B</li></ul>')
+    >>> dom.xpath("//li[a]/a/@href")
+    ['/a']
+    >>> dom.xpath("//li[last()]/text()")
+    ['B']
+
+Supported are:
+
+- location paths (``/``, ``//``, ``.``, ``..``, ``@``) and unions (``|``),
+- axes ``child``, ``descendant``, ``descendant-or-self``, ``self``,
+  ``parent``, ``ancestor``, ``ancestor-or-self``, ``following-sibling``,
+  ``preceding-sibling`` and ``attribute``,
+- node tests ``name``, ``*``, ``text()``, ``comment()`` and ``node()``,
+- predicates with operators ``or and = != < <= > >= + - * div mod``,
+- XPath 1.0 core functions for strings, numbers and booleans, and
+  ``last()``, ``position()``, ``count()``, ``name()``.
+
+Names of the tags are compared case insensitively, like in :meth:`.Tag.find`.
+Text nodes and values of the attributes are returned as strings, so there
+are no steps from them (like ``text()/..``).
+
+Compiled expressions are cached, see :func:`compile_xpath`.
+"""
+import re
+import math
+import operator
+from typing import List
+from typing import Union
+from functools import lru_cache
+
+from dhtmlparser3.tags.tag import Tag
+from dhtmlparser3.tags.comment import Comment
+from dhtmlparser3.tags.raw_text import RawText
+
+
+_TOKEN_RE = re.compile(
+    r"""
+    (?P<space>\s+)
+    | (?P<number>\d+(?:\.\d*)?|\.\d+)
+    | (?P<literal>"[^"]*"|'[^']*')
+    | (?P<operator>//|::|!=|<=|>=|\.\.|[/()\[\]@,|=<>*+\-.])
+    | (?P<name>[A-Za-z_][\w.\-]*(?::(?!:)[A-Za-z_][\w.\-]*)?)
+    """,
+    re.VERBOSE,
+)
+
+_NODE_TYPES = {"text", "node", "comment"}
+
+_AXES = {
+    "child",
+    "descendant",
+    "descendant-or-self",
+    "self",
+    "parent",
+    "ancestor",
+    "ancestor-or-self",
+    "following-sibling",
+    "preceding-sibling",
+    "attribute",
+}
+_REVERSE_AXES = {"parent", "ancestor", "ancestor-or-self", "preceding-sibling"}
+
+_RELATIONAL_OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_SWAPPED_OPERATORS = {
+    "=": "=",
+    "!=": "!=",
+    "<": ">",
+    "<=": ">=",
+    ">": "<",
+    ">=": "<=",
+}
+_ARITHMETIC_OPERATORS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "div": lambda left, right: _divide(left, right),
+    "mod": lambda left, right: math.fmod(left, right) if right else math.nan,
+}
+
+
+def _divide(left, right):
+    if right:
+        return left / right
+
+    if left == 0 or left != left:
+        return math.nan
+
+    return math.copysign(math.inf, left) * math.copysign(1, right)
+
+
+def _tokenize(expression: str) -> list:
+    tokens = []
+    pos = 0
+    while pos < len(expression):
+        match = _TOKEN_RE.match(expression, pos)
+        if match is None:
+            raise ValueError(
+                f"Unexpected character {expression[pos]!r} at {pos} in {expression!r}"
+            )
+
+        pos = match.end()
+        if match.lastgroup != "space":
+            tokens.append((match.lastgroup, match.group()))
+
+    return tokens
+
+
+# conversions ---------------------------------------------------------------
+def _string_value(node) -> str:
+    if isinstance(node, Tag):
+        return node.content_without_tags()
+    elif isinstance(node, Comment):
+        return node.content
+
+    return str(node)
+
+
+def _string(value) -> str:
+    if isinstance(value, list):
+        return _string_value(value[0]) if value else ""
+    elif isinstance(value, bool):
+        return "true" if value else "false"
+    elif isinstance(value, float):
+        if value != value:
+            return "NaN"
+        elif math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        elif value == int(value):
+            return str(int(value))
+
+        return repr(value)
+
+    return value
+
+
+def _number(value) -> float:
+    if isinstance(value, float):
+        return value
+    elif isinstance(value, bool):
+        return 1.0 if value else 0.0
+    elif isinstance(value, list):
+        value = _string(value)
+
+    try:
+        return float(value.strip())
+    except ValueError:
+        return math.nan
+
+
+def _boolean(value) -> bool:
+    if isinstance(value, float):
+        return bool(value) and value == value
+
+    return bool(value)
+
+
+def _compare(op, left, right) -> bool:
+    if isinstance(left, list):
+        if isinstance(right, list):
+            right_values = [_string_value(node) for node in right]
+            return any(
+                _compare_atoms(op, _string_value(node), value)
+                for node in left
+                for value in right_values
+            )
+        elif isinstance(right, bool):
+            return _compare_atoms(op, bool(left), right)
+
+        return any(_compare_atoms(op, _string_value(node), right) for node in left)
+
+    elif isinstance(right, list):
+        return _compare(_SWAPPED_OPERATORS[op], right, left)
+
+    return _compare_atoms(op, left, right)
+
+
+def _compare_atoms(op, left, right) -> bool:
+    if op == "=" or op == "!=":
+        if isinstance(left, bool) or isinstance(right, bool):
+            left, right = _boolean(left), _boolean(right)
+        elif isinstance(left, float) or isinstance(right, float):
+            left, right = _number(left), _number(right)
+        else:
+            left, right = _string(left), _string(right)
+
+        return (left == right) if op == "=" else (left != right)
+
+    return _RELATIONAL_OPERATORS[op](_number(left), _number(right))
+
+
+# evaluation context --------------------------------------------------------
+class _Document:
+    """
+    Root of the evaluated tree and the document order of the tags.
+    """
+    def __init__(self, node: Tag):
+        root = node
+        while root.parent is not None:
+            root = root.parent
+
+        # parse() returns the single root element without the container
+        if root.name:
+            container = Tag("")
+            container.content = [root]
+            root = container
+
+        self.root = root
+        self._order = None
+
+    def sort(self, nodes: list) -> list:
+        """
+        Remove duplicate tags and sort them in the document order. Strings
+        are kept in the order in which they were found.
+        """
+        if not all(isinstance(node, Tag) for node in nodes):
+            seen = set()
+            unique = []
+            for node in nodes:
+                if isinstance(node, Tag):
+                    if id(node) in seen:
+                        continue
+                    seen.add(id(node))
+
+                unique.append(node)
+
+            return unique
+
+        # the root may be the container without the numbering, so the ranks
+        # are used directly
+        if nodes and nodes[0]._has_numbering():
+            numbering = nodes[0]._numbering
+            if all(node._numbering is numbering for node in nodes):
+                unique = {id(node): node for node in nodes}.values()
+                return sorted(unique, key=lambda node: node._pre)
+
+        if self._order is None:
+            self._order = {
+                id(tag): index
+                for index, tag in enumerate(self.root.depth_first_iterator(True))
+            }
+
+        order = self._order
+        unique = {id(node): node for node in nodes}
+        return sorted(unique.values(), key=lambda node: order.get(id(node), -1))
+
+
+class _Context:
+    __slots__ = ("node", "position", "size", "document")
+
+    def __init__(self, node, position, size, document):
+        self.node = node
+        self.position = position
+        self.size = size
+        self.document = document
+
+
+# expressions ---------------------------------------------------------------
+class _Expression:
+    children = ()
+
+    def evaluate(self, context: _Context):
+        raise NotImplementedError()
+
+
+class _Literal(_Expression):
+    def __init__(self, value):
+        self.value = value
+
+    def evaluate(self, context):
+        return self.value
+
+
+class _Number(_Literal):
+    pass
+
+
+class _Or(_Expression):
+    def __init__(self, left, right):
+        self.children = (left, right)
+
+    def evaluate(self, context):
+        left, right = self.children
+        return _boolean(left.evaluate(context)) or _boolean(right.evaluate(context))
+
+
+class _And(_Or):
+    def evaluate(self, context):
+        left, right = self.children
+        return _boolean(left.evaluate(context)) and _boolean(right.evaluate(context))
+
+
+class _Comparison(_Expression):
+    def __init__(self, op, left, right):
+        self.op = op
+        self.children = (left, right)
+
+    def evaluate(self, context):
+        left, right = self.children
+        return _compare(self.op, left.evaluate(context), right.evaluate(context))
+
+
+class _Arithmetic(_Comparison):
+    def evaluate(self, context):
+        left, right = self.children
+        return _ARITHMETIC_OPERATORS[self.op](
+            _number(left.evaluate(context)), _number(right.evaluate(context))
+        )
+
+
+class _Negation(_Expression):
+    def __init__(self, expression):
+        self.children = (expression,)
+
+    def evaluate(self, context):
+        return -_number(self.children[0].evaluate(context))
+
+
+class _Union(_Expression):
+    def __init__(self, paths):
+        self.children = tuple(paths)
+
+    def evaluate(self, context):
+        nodes = []
+        for path in self.children:
+            value = path.evaluate(context)
+            if not isinstance(value, list):
+                raise ValueError("Union `|` works only with node-sets!")
+
+            nodes.extend(value)
+
+        return context.document.sort(nodes)
+
+
+class _Function(_Expression):
+    def __init__(self, name, arguments):
+        if name not in _FUNCTIONS:
+            raise ValueError(f"Unknown XPath function `{name}()`!")
+
+        self.name = name
+        self.function = _FUNCTIONS[name]
+        self.children = tuple(arguments)
+
+        minimum, maximum = _ARITIES.get(name, (0, 0))
+        if not minimum <= len(self.children) <= maximum:
+            raise ValueError(
+                f"Wrong number of arguments ({len(self.children)}) for the "
+                f"XPath function `{name}()`!"
+            )
+
+    def evaluate(self, context):
+        arguments = [argument.evaluate(context) for argument in self.children]
+        return self.function(context, *arguments)
+
+
+class _Filter(_Expression):
+    """
+    Primary expression with predicates, like ``(//a)[1]``.
+    """
+    def __init__(self, primary, predicates):
+        self.children = (primary,) + tuple(predicates)
+
+    def evaluate(self, context):
+        nodes = self.children[0].evaluate(context)
+        if not isinstance(nodes, list):
+            raise ValueError("Predicates work only with node-sets!")
+
+        for predicate in self.children[1:]:
+            nodes = _filter(nodes, predicate, context.document)
+
+        return nodes
+
+
+class _Path(_Expression):
+    def __init__(self, start, steps):
+        # start is "root", None (the context node) or expression
+        self.start = start
+        self.steps = _optimize_steps(steps)
+        self.children = tuple(self.steps)
+        if isinstance(start, _Expression):
+            self.children = (start,) + self.children
+
+    def evaluate(self, context):
+        if self.start == "root":
+            nodes = [context.document.root]
+        elif self.start is None:
+            nodes = [context.node]
+        else:
+            nodes = self.start.evaluate(context)
+            if not isinstance(nodes, list):
+                raise ValueError("Path steps work only with node-sets!")
+
+        for step in self.steps:
+            nodes = step.select(nodes, context.document)
+
+        return nodes
+
+
+class _Step(_Expression):
+    def __init__(self, axis, test, predicates=()):
+        self.axis = axis
+        self.test = test  # ("name", name) / ("*",) / ("text",) / ...
+        self.children = tuple(predicates)
+
+        self._axis_nodes = _AXIS_FUNCTIONS[axis]
+        if test[0] in ("name", "*") and axis in _TAG_AXIS_FUNCTIONS:
+            self._axis_nodes = _TAG_AXIS_FUNCTIONS[axis]
+
+        self._matches = _node_test(axis, test)
+
+    def select(self, nodes: list, document: _Document) -> list:
+        matches = self._matches
+        reverse = self.axis in _REVERSE_AXES
+
+        selected = []
+        for node in nodes:
+            if not isinstance(node, Tag):
+                if self.axis == "self" and matches(node):
+                    selected.append(node)
+                continue
+
+            candidates = [item for item in self._axis_nodes(node) if matches(item)]
+            for predicate in self.children:
+                candidates = _filter(candidates, predicate, document)
+
+            if reverse:
+                candidates.reverse()
+
+            selected.extend(candidates)
+
+        if len(nodes) > 1 or (reverse and len(selected) > 1):
+            return document.sort(selected)
+
+        return selected
+
+
+def _filter(nodes: list, predicate: _Expression, document: _Document) -> list:
+    size = len(nodes)
+    filtered = []
+    for position, node in enumerate(nodes, 1):
+        value = predicate.evaluate(_Context(node, position, size, document))
+        if isinstance(value, float):
+            if value == position:
+                filtered.append(node)
+        elif _boolean(value):
+            filtered.append(node)
+
+    return filtered
+
+
+def _node_test(axis, test):
+    kind = test[0]
+    if axis == "attribute":
+        if kind == "name":
+            name = test[1].lower()
+            return lambda item: item[0].lower() == name
+
+        return lambda item: True
+
+    if kind == "name":
+        name = test[1].lower()
+        return lambda item: isinstance(item, Tag) and item.name.lower() == name
+    elif kind == "*":
+        return lambda item: isinstance(item, Tag) and item.name != ""
+    elif kind == "text":
+        return lambda item: isinstance(item, (str, RawText))
+    elif kind == "comment":
+        return lambda item: isinstance(item, Comment)
+
+    return lambda item: True  # node()
+
+
+# axes ----------------------------------------------------------------------
+def _child_axis(node):
+    return node.content
+
+
+def _descendant_axis(node):
+    iterator = node.depth_first_iterator()
+    next(iterator)  # skip the node itself
+    return iterator
+
+
+def _descendant_or_self_axis(node):
+    return node.depth_first_iterator()
+
+
+def _descendant_tags_axis(node):
+    iterator = node.depth_first_iterator(tags_only=True)
+    next(iterator)
+    return iterator
+
+
+def _descendant_or_self_tags_axis(node):
+    return node.depth_first_iterator(tags_only=True)
+
+
+def _self_axis(node):
+    return (node,)
+
+
+def _parent_axis(node):
+    return (node.parent,) if node.parent is not None else ()
+
+
+def _ancestor_axis(node):
+    ancestors = []
+    parent = node.parent
+    while parent is not None:
+        ancestors.append(parent)
+        parent = parent.parent
+
+    return ancestors
+
+
+def _ancestor_or_self_axis(node):
+    return [node] + _ancestor_axis(node)
+
+
+def _sibling_index(node):
+    if node.parent is None:
+        return None, -1
+
+    siblings = node.parent.content
+    for index, item in enumerate(siblings):
+        if item is node:
+            return siblings, index
+
+    return None, -1
+
+
+def _following_sibling_axis(node):
+    siblings, index = _sibling_index(node)
+    if siblings is None:
+        return ()
+
+    return siblings[index + 1:]
+
+
+def _preceding_sibling_axis(node):
+    siblings, index = _sibling_index(node)
+    if siblings is None:
+        return ()
+
+    return siblings[index - 1::-1] if index > 0 else ()
+
+
+def _attribute_axis(node):
+    if not node.parameters:
+        return ()
+
+    return list(node.parameters.items())
+
+
+_AXIS_FUNCTIONS = {
+    "child": _child_axis,
+    "descendant": _descendant_axis,
+    "descendant-or-self": _descendant_or_self_axis,
+    "self": _self_axis,
+    "parent": _parent_axis,
+    "ancestor": _ancestor_axis,
+    "ancestor-or-self": _ancestor_or_self_axis,
+    "following-sibling": _following_sibling_axis,
+    "preceding-sibling": _preceding_sibling_axis,
+    "attribute": _attribute_axis,
+}
+
+# the tests of the tag names don't have to look at the texts and comments
+_TAG_AXIS_FUNCTIONS = {
+    "descendant": _descendant_tags_axis,
+    "descendant-or-self": _descendant_or_self_tags_axis,
+}
+
+
+class _AttributeStep(_Step):
+    def select(self, nodes, document):
+        # attribute values are returned as strings
+        return [str(value) for _, value in super().select(nodes, document)]
+
+
+def _make_step(axis, test, predicates=()):
+    if axis == "attribute":
+        return _AttributeStep(axis, test, predicates)
+
+    return _Step(axis, test, predicates)
+
+
+def _optimize_steps(steps):
+    """
+    Replace ``descendant-or-self::node()/child::x`` (``//x``) with
+    ``descendant::x``, which doesn't have to look at the children of every
+    node. It is possible only if the predicates don't depend on the position.
+    """
+    optimized = []
+    for step in steps:
+        previous = optimized[-1] if optimized else None
+        if (
+            previous is not None
+            and previous.axis == "descendant-or-self"
+            and previous.test == ("node",)
+            and not previous.children
+            and step.axis == "child"
+            and not any(_is_positional(predicate) for predicate in step.children)
+        ):
+            optimized[-1] = _make_step("descendant", step.test, step.children)
+            continue
+
+        optimized.append(step)
+
+    return optimized
+
+
+_NUMERIC_FUNCTIONS = {
+    "last", "position", "count", "string-length", "number", "sum", "floor",
+    "ceiling", "round",
+}
+
+
+def _is_positional(expression) -> bool:
+    if isinstance(expression, (_Number, _Arithmetic, _Negation)):
+        return True
+
+    if isinstance(expression, _Function) and expression.name in _NUMERIC_FUNCTIONS:
+        return True
+
+    return _uses_position(expression)
+
+
+def _uses_position(expression) -> bool:
+    if isinstance(expression, _Function) and expression.name in ("last", "position"):
+        return True
+
+    return any(_uses_position(child) for child in expression.children)
+
+
+# functions -----------------------------------------------------------------
+def _context_string(context, *arguments):
+    if arguments:
+        return _string(arguments[0])
+
+    return _string_value(context.node)
+
+
+def _name(context, nodes=None):
+    if nodes is None:
+        nodes = [context.node]
+
+    if nodes and isinstance(nodes[0], Tag):
+        return nodes[0].name
+
+    return ""
+
+
+def _substring(context, string, start, length=None):
+    string = _string(string)
+    start = round(_number(start))
+    if length is None:
+        end = math.inf
+    else:
+        end = start + round(_number(length))
+
+    # positions are counted from 1 and NaN compares as false
+    return "".join(
+        char for position, char in enumerate(string, 1) if start <= position < end
+    )
+
+
+def _substring_before(context, string, separator):
+    string, separator = _string(string), _string(separator)
+    index = string.find(separator)
+    return string[:index] if index != -1 else ""
+
+
+def _substring_after(context, string, separator):
+    string, separator = _string(string), _string(separator)
+    index = string.find(separator)
+    return string[index + len(separator):] if index != -1 else ""
+
+
+def _translate(context, string, source, target):
+    string, source, target = _string(string), _string(source), _string(target)
+
+    table = {}
+    for index, char in enumerate(source):
+        if ord(char) not in table:
+            table[ord(char)] = target[index] if index < len(target) else None
+
+    return string.translate(table)
+
+
+def _round(context, value):
+    value = _number(value)
+    if value != value or math.isinf(value):
+        return value
+
+    return float(math.floor(value + 0.5))
+
+
+def _count(context, nodes):
+    if not isinstance(nodes, list):
+        raise ValueError("count() expects node-set!")
+
+    return float(len(nodes))
+
+
+def _sum(context, nodes):
+    if not isinstance(nodes, list):
+        raise ValueError("sum() expects node-set!")
+
+    return sum((_number(_string_value(node)) for node in nodes), 0.0)
+
+
+_FUNCTIONS = {
+    "last": lambda context: float(context.size),
+    "position": lambda context: float(context.position),
+    "count": _count,
+    "name": _name,
+    "local-name": _name,
+    "string": _context_string,
+    "concat": lambda context, *args: "".join(_string(arg) for arg in args),
+    "starts-with": lambda context, a, b: _string(a).startswith(_string(b)),
+    "ends-with": lambda context, a, b: _string(a).endswith(_string(b)),
+    "contains": lambda context, a, b: _string(b) in _string(a),
+    "substring-before": _substring_before,
+    "substring-after": _substring_after,
+    "substring": _substring,
+    "string-length": lambda context, *args: float(
+        len(_context_string(context, *args))
+    ),
+    "normalize-space": lambda context, *args: " ".join(
+        _context_string(context, *args).split()
+    ),
+    "translate": _translate,
+    "not": lambda context, value: not _boolean(value),
+    "true": lambda context: True,
+    "false": lambda context: False,
+    "boolean": lambda context, value: _boolean(value),
+    "number": lambda context, *args: _number(
+        args[0] if args else _string_value(context.node)
+    ),
+    "sum": _sum,
+    "floor": lambda context, value: float(math.floor(_number(value))),
+    "ceiling": lambda context, value: float(math.ceil(_number(value))),
+    "round": _round,
+}
+
+# (minimum, maximum) number of the arguments, functions without arguments are
+# not listed
+_ARITIES = {
+    "count": (1, 1),
+    "name": (0, 1),
+    "local-name": (0, 1),
+    "string": (0, 1),
+    "concat": (2, math.inf),
+    "starts-with": (2, 2),
+    "ends-with": (2, 2),
+    "contains": (2, 2),
+    "substring-before": (2, 2),
+    "substring-after": (2, 2),
+    "substring": (2, 3),
+    "string-length": (0, 1),
+    "normalize-space": (0, 1),
+    "translate": (3, 3),
+    "not": (1, 1),
+    "boolean": (1, 1),
+    "number": (0, 1),
+    "sum": (1, 1),
+    "floor": (1, 1),
+    "ceiling": (1, 1),
+    "round": (1, 1),
+}
+
+
+# parser --------------------------------------------------------------------
+class _Parser:
+    """
+    Recursive descent parser of the XPath expressions.
+    """
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+
+    def parse(self) -> _Expression:
+        if not self.tokens:
+            raise ValueError("Empty XPath expression!")
+
+        expression = self._parse_or()
+        if self.pos < len(self.tokens):
+            self._error("Unexpected token")
+
+        return expression
+
+    def _error(self, message):
+        if self.pos < len(self.tokens):
+            message = f"{message} `{self.tokens[self.pos][1]}`"
+        else:
+            message = f"{message}: unexpected end"
+
+        raise ValueError(f"{message} in XPath {self.expression!r}!")
+
+    def _peek(self, offset=0):
+        pos = self.pos + offset
+        if pos < len(self.tokens):
+            return self.tokens[pos]
+
+        return None, None
+
+    def _next(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def _is_operator(self, *values) -> bool:
+        kind, value = self._peek()
+        return kind == "operator" and value in values
+
+    def _is_operator_name(self, *values) -> bool:
+        kind, value = self._peek()
+        return kind == "name" and value in values
+
+    def _expect(self, value):
+        if not self._is_operator(value):
+            self._error(f"Expected `{value}`, got")
+
+        self.pos += 1
+
+    def _parse_or(self):
+        left = self._parse_and()
+        while self._is_operator_name("or"):
+            self.pos += 1
+            left = _Or(left, self._parse_and())
+
+        return left
+
+    def _parse_and(self):
+        left = self._parse_equality()
+        while self._is_operator_name("and"):
+            self.pos += 1
+            left = _And(left, self._parse_equality())
+
+        return left
+
+    def _parse_equality(self):
+        left = self._parse_relational()
+        while self._is_operator("=", "!="):
+            op = self._next()[1]
+            left = _Comparison(op, left, self._parse_relational())
+
+        return left
+
+    def _parse_relational(self):
+        left = self._parse_additive()
+        while self._is_operator("<", "<=", ">", ">="):
+            op = self._next()[1]
+            left = _Comparison(op, left, self._parse_additive())
+
+        return left
+
+    def _parse_additive(self):
+        left = self._parse_multiplicative()
+        while self._is_operator("+", "-"):
+            op = self._next()[1]
+            left = _Arithmetic(op, left, self._parse_multiplicative())
+
+        return left
+
+    def _parse_multiplicative(self):
+        left = self._parse_unary()
+        while self._is_operator("*") or self._is_operator_name("div", "mod"):
+            op = self._next()[1]
+            left = _Arithmetic(op, left, self._parse_unary())
+
+        return left
+
+    def _parse_unary(self):
+        if self._is_operator("-"):
+            self.pos += 1
+            return _Negation(self._parse_unary())
+
+        return self._parse_union()
+
+    def _parse_union(self):
+        paths = [self._parse_path()]
+        while self._is_operator("|"):
+            self.pos += 1
+            paths.append(self._parse_path())
+
+        if len(paths) == 1:
+            return paths[0]
+
+        return _Union(paths)
+
+    def _parse_path(self):
+        if self._is_operator("/"):
+            self.pos += 1
+            steps = []
+            if self._can_start_step():
+                self._parse_relative_path(steps)
+
+            return _Path("root", steps)
+
+        elif self._is_operator("//"):
+            self.pos += 1
+            steps = [_make_step("descendant-or-self", ("node",))]
+            self._parse_relative_path(steps)
+            return _Path("root", steps)
+
+        elif self._can_start_filter():
+            primary = self._parse_primary()
+
+            predicates = []
+            while self._is_operator("["):
+                predicates.append(self._parse_predicate())
+
+            if predicates:
+                primary = _Filter(primary, predicates)
+
+            if not self._is_operator("/", "//"):
+                return primary
+
+            steps = []
+            self._parse_relative_path(steps, after_filter=True)
+            return _Path(primary, steps)
+
+        steps = []
+        self._parse_relative_path(steps)
+        return _Path(None, steps)
+
+    def _can_start_step(self) -> bool:
+        kind, value = self._peek()
+        if kind == "name":
+            return True
+
+        return kind == "operator" and value in (".", "..", "@", "*")
+
+    def _can_start_filter(self) -> bool:
+        kind, value = self._peek()
+        if kind in ("literal", "number"):
+            return True
+        elif kind == "operator":
+            return value == "("
+
+        # function call, but not the node type test like text()
+        next_kind, next_value = self._peek(1)
+        return (
+            kind == "name"
+            and next_kind == "operator"
+            and next_value == "("
+            and value not in _NODE_TYPES
+        )
+
+    def _parse_relative_path(self, steps, after_filter=False):
+        if not after_filter:
+            steps.append(self._parse_step())
+
+        while self._is_operator("/", "//"):
+            if self._next()[1] == "//":
+                steps.append(_make_step("descendant-or-self", ("node",)))
+
+            steps.append(self._parse_step())
+
+    def _parse_step(self):
+        if self._is_operator("."):
+            self.pos += 1
+            return _make_step("self", ("node",))
+        elif self._is_operator(".."):
+            self.pos += 1
+            return _make_step("parent", ("node",))
+
+        axis = "child"
+        if self._is_operator("@"):
+            self.pos += 1
+            axis = "attribute"
+        elif self._peek()[0] == "name" and self._peek(1) == ("operator", "::"):
+            axis = self._next()[1]
+            self.pos += 1
+            if axis not in _AXES:
+                raise ValueError(f"Unsupported XPath axis `{axis}`!")
+
+        test = self._parse_node_test()
+
+        predicates = []
+        while self._is_operator("["):
+            predicates.append(self._parse_predicate())
+
+        return _make_step(axis, test, predicates)
+
+    def _parse_node_test(self):
+        kind, value = self._peek()
+        if kind == "operator" and value == "*":
+            self.pos += 1
+            return ("*",)
+
+        if kind != "name":
+            self._error("Expected node test, got")
+
+        self.pos += 1
+        if value in _NODE_TYPES and self._is_operator("("):
+            self.pos += 1
+            self._expect(")")
+            return (value,)
+
+        return ("name", value)
+
+    def _parse_predicate(self):
+        self._expect("[")
+        predicate = self._parse_or()
+        self._expect("]")
+        return predicate
+
+    def _parse_primary(self):
+        kind, value = self._next()
+        if kind == "literal":
+            return _Literal(value[1:-1])
+        elif kind == "number":
+            return _Number(float(value))
+        elif kind == "operator":  # (
+            expression = self._parse_or()
+            self._expect(")")
+            return expression
+
+        # function call
+        self._expect("(")
+        arguments = []
+        if not self._is_operator(")"):
+            arguments.append(self._parse_or())
+            while self._is_operator(","):
+                self.pos += 1
+                arguments.append(self._parse_or())
+
+        self._expect(")")
+        return _Function(value, arguments)
+
+
+# public interface ----------------------------------------------------------
+class XPath:
+    """
+    Compiled XPath expression. Use :func:`compile_xpath` to create it.
+
+    Attributes:
+        expression (str): Source of the expression.
+    """
+    def __init__(self, expression: str):
+        self.expression = expression
+        self._root = _Parser(expression).parse()
+
+    def evaluate(self, node: Tag) -> Union[List, str, float, bool]:
+        """
+        Evaluate the expression with `node` as the context node.
+
+        Returns:
+            list / str / float / bool: List of tags (or strings for the text \
+            nodes and attributes) in the document order, or the value of the \
+            expression.
+        """
+        context = _Context(node, 1, 1, _Document(node))
+        return self._root.evaluate(context)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.expression!r})"
+
+
+@lru_cache(maxsize=256)
+def compile_xpath(expression: str) -> XPath:
+    """
+    Compile the `expression`. The last 256 compiled expressions are cached.
+
+    Raises:
+        ValueError: If the expression is invalid or unsupported.
+    """
+    return XPath(expression)
@@ -0,0 +1,79 @@
+import pytest
+
+import dhtmlparser3
+from dhtmlparser3.compact import CompactNode
+from dhtmlparser3.compact import CompactDocument
+from dhtmlparser3.query import Prefix
+
+
+HTML = """<html><head><title>Title &amp; more</title></head>
+<body>
+    <div id="main" CLASS="content">
+        <A href="/a">first</A>
+        <p>text<br>after<img src="x.png">img</p>
+        <!-- comment -->
+        <a href="http://b">second <b>bold</b></a>
+    </div>
+</body>
+</html>"""
+
+
+@pytest.fixture
+def document():
+    return CompactDocument(HTML)
+
+
+def test_same_structure_as_parse(document):
+    dom = dhtmlparser3.parse(HTML)
+
+    assert document.root.to_string() == dom.to_string()
+    assert document.to_dom().deep_equals(dom)
+    assert [tag.name for tag in document.find("")] == [tag.name for tag in dom.find("")]
+
+
+@pytest.mark.parametrize("html", [
+    "",
+    "text",
+    "<div><br><img><hr></div>",
+    "<div><p>unclosed<b>x</div>y",
+    "</a>text<a>",
+    "<p>&lt;&copy2024</p><a title='&amp;'>",
+])
+def test_malformed_input(html):
+    assert CompactDocument(html).root.to_string() == dhtmlparser3.parse(html).to_string()
+
+
+def test_find(document):
+    links = document.find("a")
+
+    assert [link["href"] for link in links] == ["/a", "http://b"]
+    assert document.find("a", case_sensitive=True) == [links[1]]
+    assert document.find("a", {"href": Prefix("http")}) == [links[1]]
+    assert document.find("a", fn=lambda tag: "b" in tag.content_without_tags()) == [
+        links[1]
+    ]
+    assert document.find("div", {"class": "content"})[0]["id"] == "main"
+    assert document.find("nothing") == []
+
+
+def test_navigation(document):
+    p = document.find("p")[0]
+
+    assert isinstance(p, CompactNode)
+    assert p.parent.name == "div"
+    assert p.content[0] == "text"
+    assert [tag.name for tag in p.tags] == ["br", "img"]
+    assert p.tags[0].is_non_pair
+    assert p.content_without_tags() == "textafterimg"
+    assert document.find("title")[0].content == ["Title & more"]
+    assert document.find("div")[0].content[5].content == " comment "
+    assert len(document.root) == 2
+    assert p.start == HTML.index("<p>")
+
+
+def test_to_tag(document):
+    link = document.find("a")[1].to_tag()
+
+    assert isinstance(link, dhtmlparser3.Tag)
+    assert link.to_string() == '<a href="http://b">second <b>bold</b></a>'
+    assert link.find("b")[0].parent is link
@@ -0,0 +1,41 @@
+import codecs
+
+from dhtmlparser3.encoding import decode
+from dhtmlparser3.encoding import sniff_encoding
+
+
+def test_sniff_bom():
+    assert sniff_encoding(codecs.BOM_UTF8 + b"<p>") == ("utf-8", 3)
+    assert sniff_encoding(codecs.BOM_UTF16_LE + "<p>".encode("utf-16-le")) == (
+        "utf-16-le",
+        2,
+    )
+
+
+def test_sniff_xml_declaration():
+    data = b'<?xml version="1.0" encoding="ISO-8859-2"?><root />'
+
+    assert sniff_encoding(data) == ("iso8859-2", 0)
+
+
+def test_sniff_meta_charset():
+    assert sniff_encoding(b'<head><meta charset="windows-1250">') == ("cp1250", 0)
+    assert sniff_encoding(b"<head><META CHARSET=koi8-r>") == ("koi8-r", 0)
+
+
+def test_sniff_meta_http_equiv():
+    data = b'<meta http-equiv="Content-Type" content="text/html; charset=latin2">'
+
+    assert sniff_encoding(data) == ("iso8859-2", 0)
+
+
+def test_sniff_unknown_and_default():
+    assert sniff_encoding(b'<meta charset="nonsense"><p>') == ("utf-8", 0)
+    assert sniff_encoding(b"<p>", default="cp1252") == ("cp1252", 0)
+
+
+def test_decode():
+    data = '<meta charset="cp1250"><p>Příliš</p>'.encode("cp1250")
+
+    assert decode(data) == ('<meta charset="cp1250"><p>Příliš</p>', "cp1250")
+    assert decode(codecs.BOM_UTF8 + "ž".encode("utf-8")) == ("ž", "utf-8")
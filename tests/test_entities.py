@@ -0,0 +1,46 @@
+from dhtmlparser3 import entities
+
+
+def test_decode_named():
+    assert entities.decode("&lt;b&gt; &amp; &Aacute;&aacute;") == "<b> & Áá"
+
+
+def test_decode_full_table():
+    assert entities.decode("&CounterClockwiseContourIntegral;") == "∳"
+    assert entities.decode("&nsubE;") == "⫅̸"
+
+
+def test_decode_legacy_without_semicolon():
+    assert entities.decode("&copy2024 &amp") == "©2024 &"
+
+
+def test_decode_longest_match():
+    assert entities.decode("&notin;") == "∉"
+    assert entities.decode("&notit;") == "¬it;"
+
+
+def test_decode_numeric():
+    assert entities.decode("&#65;&#x42;&#X43") == "ABC"
+    assert entities.decode("&#0;&#x110000;&#xD800;") == "���"
+    assert entities.decode("&#x80;") == "€"
+
+
+def test_decode_overlong_numeric():
+    assert entities.decode("&#000000000065;&#x0000000041;") == "AA"
+    assert entities.decode("&#" + "1" * 5000 + ";x") == "�x"
+    assert entities.decode("&#x" + "f" * 5000 + ";x") == "�x"
+
+
+def test_decode_unknown():
+    assert entities.decode("&unknown; & &;") == "&unknown; & &;"
+
+
+def test_decode_in_attribute():
+    assert entities.decode("?a=1&copy=2", in_attribute=True) == "?a=1&copy=2"
+    assert entities.decode("?a=1&copy;=2", in_attribute=True) == "?a=1©=2"
+    assert entities.decode("&copy", in_attribute=True) == "©"
+
+
+def test_match():
+    assert entities.match("x&amp;y", 1) == ("&", 6)
+    assert entities.match("x&y", 1) is None
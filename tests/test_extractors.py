@@ -0,0 +1,80 @@
+import time
+
+from dhtmlparser3.extractors import scan_tags
+from dhtmlparser3.extractors import extract_meta
+from dhtmlparser3.extractors import extract_links
+from dhtmlparser3.extractors import extract_title
+from dhtmlparser3.extractors import extract_images
+
+
+HTML = """<html><head>
+<TITLE>Title &amp; <b>text</b></TITLE>
+<meta charset=utf-8>
+<META NAME="author" content='Bystroushaak'>
+<script>var a = '<a href="/no">';</script>
+<style>a:after { content: "<a href=/no>" }</style>
+</head><body>
+<!-- <a href="/commented"> -->
+<a href="/a?b=1&amp;c=2" href="/second">first</a>
+<a title="x > y" href = ' /spaces '>second</a>
+<a name="anchor">no href</a>
+<abbr href="/no">abbr</abbr>
+<area href=/area>
+<img src="i.png" alt="<img src=no>"><img>
+</body></html>
+"""
+
+
+def test_scan_tags():
+    assert list(scan_tags('<A HREF=x>a</A><img src=y><br/>', ["a", "IMG"])) == [
+        ("a", {"href": "x"}),
+        ("img", {"src": "y"}),
+    ]
+
+    assert list(scan_tags("<input disabled value=1/>", ["input"])) == [
+        ("input", {"disabled": "", "value": "1/"}),
+    ]
+
+
+def test_extract_links():
+    assert extract_links(HTML) == ["/a?b=1&c=2", "/spaces", "/area"]
+
+
+def test_extract_links_base_url():
+    assert extract_links(HTML, "http://example.com/x/", tags=["a"]) == [
+        "http://example.com/a?b=1&c=2",
+        "http://example.com/spaces",
+    ]
+
+
+def test_extract_images():
+    assert extract_images(HTML) == ["i.png"]
+
+
+def test_extract_meta():
+    assert extract_meta(HTML) == [
+        {"charset": "utf-8"},
+        {"name": "author", "content": "Bystroushaak"},
+    ]
+
+
+def test_extract_title():
+    assert extract_title(HTML) == "Title & <b>text</b>"
+    assert extract_title("<title>unclosed") == "unclosed"
+    assert extract_title("<p>no title</p>") is None
+
+
+def test_unclosed_tags():
+    assert extract_links('<a href="x') == []
+    assert extract_links("<a href=x") == []
+    assert extract_links("<a href=x <a href=y>") == ["y"]
+    assert extract_links("<script><a href=x>") == []
+    assert extract_links("<!-- <a href=x>") == []
+
+
+def test_unterminated_tags_are_linear():
+    start = time.perf_counter()
+    assert extract_links("<a x" * 100000) == []
+    assert extract_links('<a x="' * 100000) == []
+
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,101 @@
+import copy
+
+import dhtmlparser3
+from dhtmlparser3.interning import InternStore
+from dhtmlparser3.tags.shared_tag import SharedTag
+
+
+NAV = '<ul class="nav"><li><a href="/a">A</a></li><li><a href="/b">B</a></li></ul>'
+
+
+def _page(text):
+    return f"<html><body>{NAV}<p>{text} &amp; more</p>{NAV}</body></html>"
+
+
+def test_intern():
+    store = InternStore()
+    first = store.intern(dhtmlparser3.parse(_page("first")))
+    second = store.intern(dhtmlparser3.parse(_page("second")))
+
+    assert first.to_string() == dhtmlparser3.parse(_page("first")).to_string()
+    assert second.to_string() == dhtmlparser3.parse(_page("second")).to_string()
+
+    first_nav, other_nav = first.find("ul")
+    second_nav = second.find("ul")[0]
+    assert isinstance(first_nav, SharedTag)
+    assert first_nav.template is other_nav.template is second_nav.template
+    assert first_nav.parent.name == "body"
+    assert first_nav.find("a")[0].parent.parent is first_nav
+
+    # body and p for each page (the root is not interned), shared ul, li and a
+    assert len(store) == 2 + 2 + 5
+    assert first.find("ul")[0] in store
+
+
+def test_copy_on_write():
+    store = InternStore()
+    first = store.intern(dhtmlparser3.parse(_page("x")))
+    second = store.intern(dhtmlparser3.parse(_page("x")))
+
+    link = first.find("a")[0]
+    link["href"] = "/changed"
+    link.parent.remove_item(link.parent.content[0])
+    first.find("ul")[1].replace_with(dhtmlparser3.Tag("hr"))
+
+    assert first.to_string() == (
+        '<html><body><ul class="nav"><li></li><li><a href="/b">B</a></li></ul>'
+        "<p>x &amp; more</p><hr></hr></body></html>"
+    )
+    assert second.to_string() == dhtmlparser3.parse(_page("x")).to_string()
+    assert not first.deep_equals(second)
+
+
+def test_direct_parameter_write():
+    store = InternStore()
+    first = store.intern(dhtmlparser3.parse(_page("x")))
+    second = store.intern(dhtmlparser3.parse(_page("x")))
+
+    first.find("ul")[0].p["class"] = "evil"
+    first.find("a")[0].parameters.clear()
+
+    assert second.find("ul")[0]["class"] == "nav"
+    assert second.find("a")[0]["href"] == "/a"
+    assert second.to_string() == dhtmlparser3.parse(_page("x")).to_string()
+    assert store.intern(dhtmlparser3.parse(_page("y"))).find("ul")[0].p == {
+        "class": "nav"
+    }
+
+
+def test_reading_doesnt_copy():
+    store = InternStore()
+    dom = store.intern(dhtmlparser3.parse(_page("x")))
+    body = dom.c[0]
+
+    assert dom.to_string() == dhtmlparser3.parse(_page("x")).to_string()
+    assert body._content is None
+
+    links = dom.find("a", {"href": "/b"})
+    assert [link.content_without_tags() for link in links] == ["B", "B"]
+    assert links[0].parent.parent.p == {"class": "nav"}
+    assert body.c[1]._content is None  # <p> is not on the path to a link
+
+    first_nav = body.c[0]
+    assert first_nav.c[0]._content is None  # first <li>
+    assert first_nav._parameters is None
+    assert first_nav.p.copy() is not first_nav.template.parameters
+
+    assert dom.find("a", fn=lambda tag: tag["href"] == "/a") == [
+        first_nav.c[0].c[0],
+        body.c[2].c[0].c[0],
+    ]
+
+
+def test_copies_are_regular_tags():
+    store = InternStore()
+    dom = store.intern(dhtmlparser3.parse(_page("x")))
+
+    nav = copy.deepcopy(dom.find("ul")[0])
+    nav["class"] = "copy"
+
+    assert type(nav) is dhtmlparser3.Tag
+    assert dom.find("ul")[0]["class"] == "nav"
@@ -0,0 +1,129 @@
+import pytest
+
+import dhtmlparser3
+from dhtmlparser3.lazy import LazyTag
+from dhtmlparser3.lazy import parse_lazy
+
+
+HTML = """<html><head><title>Title &amp; more</title></head>
+<body>
+    <div id="main" class="content">
+        <a href="/a">first</a>
+        <p>text<br>after<img src="x.png">img</p>
+        <!-- comment -->
+        <a href="http://b">second <b>bold</b></a>
+    </div>
+    <ul><li>one</li><li>two</li></ul>
+</body>
+</html>"""
+
+
+@pytest.fixture
+def dom():
+    return parse_lazy(HTML)
+
+
+@pytest.mark.parametrize("html", [
+    HTML,
+    "text",
+    "<br>",
+    "<div><p>unclosed<b>x</div>y",
+    "<p>&lt;&copy2024</p><a title='&amp;'>",
+])
+def test_same_as_parse(html):
+    dom = parse_lazy(html)
+
+    assert dom.deep_equals(dhtmlparser3.parse(html))
+    assert dom.to_string() == dhtmlparser3.parse(html).to_string()
+
+
+def test_content_is_created_on_access(dom):
+    assert isinstance(dom, LazyTag)
+    assert not dom.is_materialized
+
+    body = dom.content[2]
+    assert dom.is_materialized
+    assert body.name == "body"
+    assert body.parent is dom
+    assert not body.is_materialized
+
+
+def test_find_materializes_only_paths(dom):
+    links = dom.find("a")
+    assert [link["href"] for link in links] == ["/a", "http://b"]
+    assert links[0].parent.parent.name == "body"
+
+    body = dom.content[2]
+    ul = body.content[-2]
+    assert ul.name == "ul"
+    assert not ul.is_materialized
+    assert not links[0].is_materialized
+
+    assert dom.find("a", {"href": "http://b"}) == [links[1]]
+    assert dom.find("a", fn=lambda tag: tag.content_without_tags() == "first") == [
+        links[0]
+    ]
+
+
+def test_content_without_tags(dom):
+    assert dom.find("title")[0].content_without_tags() == "Title & more"
+    assert dom.find("a")[1].content_without_tags() == "second bold"
+    assert not dom.find("a")[1].is_materialized
+
+
+def test_find_after_modification(dom):
+    div = dom.find("div")[0]
+    div.replace_with(dhtmlparser3.Tag("div", content=[dhtmlparser3.Tag("a")]))
+
+    assert len(dom.find("a")) == 1
+    assert dom.find("li")[1].content_without_tags() == "two"
+
+    li = dom.find("li")[0]
+    li.content.append(dhtmlparser3.Tag("a", {"href": "new"}))
+    li.mark_dirty()
+
+    assert [link["href"] for link in dom.find("a", {"href": "new"})] == ["new"]
+    assert li.content_without_tags() == "one"
+
+
+def test_parameters_modification(dom):
+    link = dom.find("a")[0]
+    link["href"] = "/changed"
+
+    assert dom.find("a", {"href": "/changed"}) == [link]
+    assert dom.find("a", {"href": "/a"}) == []
+    assert '<a href="/changed">first</a>' in dom.to_string()
+
+
+def test_direct_parameters_modification(dom):
+    link = dom.find("a")[0]
+    link.parameters["href"] = "/changed"
+
+    assert dom.find("a", {"href": "/changed"}) == [link]
+    assert dom.find("a", {"href": "/a"}) == []
+
+    link.parameters = {"href": "/replaced"}
+
+    assert dom.find("a", {"href": "/replaced"}) == [link]
+    assert dom.find("a", {"href": "/changed"}) == []
+
+
+def test_content_replacement(dom):
+    li = dom.find("li")[0]
+    li.content = [dhtmlparser3.Tag("a")]
+
+    assert len(dom.find("a")) == 3
+    assert li.find("a") == [dhtmlparser3.Tag("a")]
+
+    li = dom.find("li")[1]
+    li.content.append(dhtmlparser3.Tag("a"))
+
+    assert len(dom.find("a")) == 4
+
+
+def test_root_content_replacement(dom):
+    dom.content = [dhtmlparser3.Tag("b")]
+
+    assert dom.find("a") == []
+    assert dom.find("b") == [dhtmlparser3.Tag("b")]
+    assert dom.content_without_tags() == ""
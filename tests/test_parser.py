@@ -1,6 +1,8 @@
 import pytest
 
 import dhtmlparser3
+from dhtmlparser3.parser import StreamParser
+from dhtmlparser3.reader import FileReader
 from dhtmlparser3.tags.comment import Comment
 
 
@@ -260,3 +262,167 @@ def test_blank_string():
     dom = dhtmlparser3.parse(" ")
 
     assert dom.content == [" "]
+
+
+def test_source_spans():
+    inp = """<html>
+ <div class="x">a<br>b</div><!-- c -->
+ <p>unclosed
+</html>"""
+    dom = dhtmlparser3.parse(inp)
+
+    assert dom.start == 0
+    assert dom.end == len(inp)
+    assert dom.position == (1, 1)
+
+    div = dom.find("div")[0]
+    assert div.source_string() == '<div class="x">a<br>b</div>'
+    assert div.position == (2, 2)
+
+    assert dom.find("br")[0].source_string() == "<br>"
+    assert dom.find("p")[0].source_string() == "<p>"
+    assert dom.find("p")[0].position == (3, 2)
+
+    comment = dom.c[2]
+    assert inp[comment.start:comment.end] == "<!-- c -->"
+    assert comment.position == (2, 29)
+
+
+def test_tags_without_source():
+    tag = dhtmlparser3.Tag("div")
+
+    assert tag.position is None
+    assert tag.source_string() is None
+
+
+def test_parse_bytes():
+    data = '<meta charset="iso-8859-2"><p>Žluťoučký kůň</p>'.encode("iso-8859-2")
+
+    dom = dhtmlparser3.parse_bytes(data)
+
+    assert dom.find("p")[0].content == ["Žluťoučký kůň"]
+
+
+def test_parse_bytes_bom():
+    dom = dhtmlparser3.parse_bytes(b"\xef\xbb\xbf<p>x</p>")
+
+    assert dom.name == "p"
+
+
+def test_parse_str_bom():
+    dom = dhtmlparser3.parse("﻿<p>x</p>")
+
+    assert dom.name == "p"
+
+
+def test_file_parser_binary(tmp_path):
+    path = tmp_path / "test.html"
+    path.write_bytes('<meta charset="cp1250"><a>č</a>'.encode("cp1250"))
+
+    fp = dhtmlparser3.parse_file(str(path), binary=True)
+
+    assert fp.encoding == "cp1250"
+    assert fp.dom.find("a")[0].content == ["č"]
+
+    fp.dom.find("a")[0].content = ["ř"]
+    fp.write()
+
+    assert path.read_bytes() == '<meta charset="cp1250" /><a>ř</a>'.encode("cp1250")
+
+
+def test_stream_parser():
+    inp = """<html><head><title>x</title></head>
+<body><div><br><img>text</div><p>unclosed</body></html>"""
+    parser = StreamParser(keep_source=True)
+
+    closed = []
+    for index in range(0, len(inp), 7):
+        closed.extend(parser.feed(inp[index:index + 7]))
+    closed.extend(parser.close())
+
+    dom = parser.get_dom()
+    assert dom.to_string() == dhtmlparser3.parse(inp).to_string()
+    assert dom.to_string(preserve_source=True) == inp
+    assert [tag.name for tag in closed] == [
+        "title", "head", "br", "img", "div", "p", "body", "html",
+    ]
+
+
+def test_reshape_uses_identity():
+    dom = dhtmlparser3.parse("<div><x></x><x>a</div>")
+
+    assert dom.to_string() == "<div><x></x><x />a</div>"
+
+
+def test_parse_file_preserve_source(tmp_path):
+    path = tmp_path / "test.html"
+    path.write_text("<div CLASS='x'><a href=x>a</a></div>")
+
+    fp = dhtmlparser3.parse_file(str(path), preserve_source=True)
+    fp.dom.find("a")[0]["href"] = "y"
+    fp.write()
+
+    assert path.read_text() == """<div CLASS='x'><a href="y">a</a></div>"""
+
+
+def test_parse_file_preserve_source_single_root(tmp_path):
+    path = tmp_path / "test.html"
+    path.write_text("<div><a href=x>a</a></div></span></b>")
+
+    fp = dhtmlparser3.parse_file(str(path), preserve_source=True)
+    assert fp.dom.name == "div"
+
+    fp.dom.find("a")[0]["href"] = "y"
+    fp.write()
+
+    assert path.read_text() == """<div><a href="y">a</a></div></span></b>"""
+
+
+def test_iterparse_file(tmp_path):
+    path = tmp_path / "export.xml"
+    items = "".join(f"<item id={i}><title>{i}</title></item>\n" for i in range(100))
+    path.write_text(f"<export>\n{items}</export>")
+
+    titles = [
+        item.find("title")[0].content_without_tags()
+        for item in dhtmlparser3.iterparse_file(str(path), "item")
+    ]
+
+    assert titles == [str(i) for i in range(100)]
+
+
+def test_iterparse_file_discard(tmp_path):
+    path = tmp_path / "export.xml"
+    path.write_text("<export><item /><item /><other /></export>")
+
+    tags = list(dhtmlparser3.iterparse_file(str(path), "item"))
+    assert len(tags) == 2
+    assert tags[0].parent.to_string() == "<export><other /></export>"
+
+    tags = list(dhtmlparser3.iterparse_file(str(path), "item", discard=False))
+    assert tags[0].parent.to_string() == "<export><item /><item /><other /></export>"
+
+
+def test_iterparse_file_discard_is_bounded(tmp_path, monkeypatch):
+    path = tmp_path / "export.xml"
+    items = "".join(f"<item>{i}</item>\n<other />\n" for i in range(20000))
+    path.write_text(f"<export>\n{items}</export>")
+
+    defaults = FileReader.__init__.__defaults__
+    monkeypatch.setattr(FileReader.__init__, "__defaults__", defaults[:-1] + (1024,))
+
+    count = 0
+    longest = 0
+    for item in dhtmlparser3.iterparse_file(str(path), "item"):
+        count += 1
+        longest = max(longest, len(item.parent.content))
+
+    assert count == 20000
+    assert longest < 200
+    assert len(item.parent.content) < 5
+
+
+def test_overlong_numeric_entity():
+    dom = dhtmlparser3.parse("<p>&#" + "1" * 5000 + ";</p>")
+
+    assert dom.content == ["�"]
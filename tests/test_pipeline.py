@@ -0,0 +1,180 @@
+import io
+
+import pytest
+
+from dhtmlparser3.pipeline import DropTags
+from dhtmlparser3.pipeline import Pipeline
+from dhtmlparser3.pipeline import StripComments
+from dhtmlparser3.pipeline import RewriteAttributes
+from dhtmlparser3.pipeline import rewrite
+from dhtmlparser3.pipeline import sanitize
+
+
+HTML = (
+    '<p  class = x >a &amp; b<br/><script>if (a<b) x</script>'
+    '<a href="/x?a=1&amp;b=2" id=a>link</a><!-- comment -->'
+    '<iframe src=x><b>in</b><iframe>nested</iframe></iframe>&copy; end</p>'
+)
+
+
+def _chunks(string, size):
+    return [string[i:i + size] for i in range(0, len(string), size)]
+
+
+def test_no_stages_is_verbatim():
+    assert Pipeline().run(HTML) == HTML
+    assert Pipeline().run("") == ""
+    assert Pipeline().run("<") == "<"
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 100])
+def test_chunks_are_verbatim(size):
+    output = io.StringIO()
+    Pipeline().run(_chunks(HTML, size), output)
+
+    assert output.getvalue() == HTML
+
+
+def test_rewrite_attributes():
+    result = rewrite(
+        HTML, RewriteAttributes(lambda tag, key, value: "http://h" + value, ["HREF"])
+    )
+
+    # other parameters of the changed tag are kept verbatim
+    assert '<a href="http://h/x?a=1&amp;b=2" id=a>link</a>' in result
+    assert '<p  class = x >' in result
+    assert '<iframe src=x>' in result
+
+
+def test_rewrite_attributes_remove():
+    result = rewrite(
+        '<p class=x id=y>a</p><b class=z>b</b>',
+        RewriteAttributes(lambda tag, key, value: None, ["class"], tags=["p"]),
+    )
+
+    assert result == '<p id=y>a</p><b class=z>b</b>'
+
+
+def test_drop_tags():
+    result = rewrite(HTML, DropTags(["iframe", "br", "script"]))
+
+    assert result == (
+        '<p  class = x >a &amp; b'
+        '<a href="/x?a=1&amp;b=2" id=a>link</a><!-- comment -->'
+        '&copy; end</p>'
+    )
+
+
+def test_drop_tags_keep_content():
+    result = rewrite("<div><b>a</b> <img src=x> c</div>", DropTags(["b", "img"], True))
+
+    assert result == "<div>a  c</div>"
+
+
+def test_strip_comments():
+    assert "<!--" not in rewrite(HTML, StripComments())
+
+
+@pytest.mark.parametrize("size", [1, 5, 64])
+def test_stages_on_chunks(size):
+    stages = [
+        DropTags(["iframe"]),
+        StripComments(),
+        RewriteAttributes(lambda tag, key, value: value.upper(), ["id"]),
+    ]
+    output = io.StringIO()
+    Pipeline(*stages).run(_chunks(HTML, size), output)
+
+    assert output.getvalue() == rewrite(HTML, *stages)
+    assert "<!--" not in output.getvalue()
+    assert 'id="A"' in output.getvalue()
+
+
+def test_custom_stage():
+    def upper_text(tokens):
+        for token in tokens:
+            if hasattr(token, "content") and isinstance(token.content, str):
+                token.content = token.content.upper()
+                token.start = None
+            yield token
+
+    assert rewrite("<p>a<b</p>", upper_text) == "<p>A&lt;B</p>"
+    assert rewrite("<script>a<b</script>", upper_text) == "<script>A<B</script>"
+
+
+def test_sanitize():
+    html = (
+        '<div class=x><p onclick="x()">Hi <b>there</b><script>alert(1)</script>'
+        '<!-- c --><a href="/a?b=1&amp;c" title=t style=s>link</a></div>'
+    )
+
+    assert sanitize(html) == (
+        '<div><p>Hi <b>there</b><a href="/a?b=1&amp;c" title="t">link</a>'
+        '</p></div>'
+    )
+
+
+def test_sanitize_balancing():
+    assert sanitize("<b><i>x</b>y</i></p>z") == "<b><i>x</i></b>yz"
+    assert sanitize("<ul><li>a<li>b") == "<ul><li>a<li>b</li></li></ul>"
+    assert sanitize("<br><img src=a.png><i/>") == '<br /><img src="a.png" /><i></i>'
+
+
+@pytest.mark.parametrize("url", [
+    "javascript:alert(1)",
+    " JavaScript:alert(1)",
+    "jav&#x09;ascript:alert(1)",
+    "&#106;avascript:alert(1)",
+    "data:text/html,<script>",
+])
+def test_sanitize_unsafe_urls(url):
+    assert sanitize(f'<a href="{url}">x</a>') == "<a>x</a>"
+
+
+@pytest.mark.parametrize("url", [
+    "javascript&colon;alert(1)",
+    "java&#x09;script:alert(1)",
+    "&#106;avascript:alert(1)",
+    "javascript&#58alert(1)",
+])
+def test_sanitize_unsafe_unquoted_urls(url):
+    assert sanitize(f"<a href={url}>x</a>") == "<a>x</a>"
+
+
+def test_sanitize_escapes_ampersands():
+    assert sanitize("<a href=/a?b=1&amp;c=&lt;>x</a>") == (
+        '<a href="/a?b=1&amp;c=<">x</a>'
+    )
+    assert sanitize("<a title=a&amp;b href='/a?b&amp;c'>x</a>") == (
+        '<a title="a&amp;b" href="/a?b&amp;c">x</a>'
+    )
+
+
+def test_sanitize_safe_urls():
+    for url in ["http://a", "https://a/b:c", "mailto:a@b", "/a:b", "?a:b", "a/b"]:
+        assert sanitize(f'<a href="{url}">x</a>') == f'<a href="{url}">x</a>'
+
+
+def test_sanitize_malformed_tags():
+    result = sanitize('<img src=x onerror=alert(1) <b>x</b>')
+
+    assert "<img" not in result
+    assert result == "&lt;img src=x onerror=alert(1) <b>x</b>"
+
+
+def test_sanitize_custom_allowlist():
+    result = sanitize(
+        '<p class=a id=b>x</p><span class=c>y</span>',
+        tags=["p"],
+        parameters={"*": ["class"]},
+    )
+
+    assert result == '<p class="a">x</p>y'
+
+
+def test_sanitize_chunks():
+    html = '<p onclick=x>a &amp; b<script>x<y</script><i>c</p>' * 20
+    output = io.StringIO()
+    sanitize(_chunks(html, 3), output)
+
+    assert output.getvalue() == sanitize(html)
@@ -0,0 +1,107 @@
+import pytest
+
+import dhtmlparser3
+from dhtmlparser3.query import Query
+from dhtmlparser3.query import Regex
+from dhtmlparser3.query import Prefix
+from dhtmlparser3.query import Contains
+from dhtmlparser3.query import ClassToken
+from dhtmlparser3.query import compile_query
+
+
+HTML = """
+<div class="page body">
+    <A href="https://a.com/1" class="link">1</A>
+    <a href="http://b.com/2" class="link external">2</a>
+    <a href="/relative/3" CLASS="links">3</a>
+    <span class="price" data-id=12>4</span>
+</div>
+"""
+
+
+@pytest.fixture
+def dom():
+    return dhtmlparser3.parse(HTML)
+
+
+def _contents(tags):
+    return [tag.content_str() for tag in tags]
+
+
+def test_compile_query(dom):
+    query = compile_query("A")
+
+    assert query.name == "a"
+    assert _contents(query.find(dom)) == ["1", "2", "3"]
+    assert query.find(dom) == dom.find("a")
+
+
+def test_case_sensitive(dom):
+    query = compile_query("A", case_sensitive=True)
+
+    assert _contents(query.find(dom)) == ["1"]
+
+
+def test_predicates(dom):
+    assert _contents(compile_query("a", {"href": Prefix("http")}).find(dom)) == [
+        "1",
+        "2",
+    ]
+    assert _contents(compile_query("a", {"href": Contains("b.com")}).find(dom)) == [
+        "2"
+    ]
+    assert _contents(compile_query("", {"data-id": Regex(r"^\d+$")}).find(dom)) == [
+        "4"
+    ]
+    assert _contents(compile_query("a", {"class": ClassToken("link")}).find(dom)) == [
+        "1",
+        "2",
+    ]
+    assert _contents(compile_query("", {"class": "links"}).find(dom)) == ["3"]
+
+
+def test_fn(dom):
+    query = compile_query("a", fn=lambda tag: tag.content_str() != "2")
+
+    assert _contents(query.find(dom)) == ["1", "3"]
+
+
+def test_limit(dom):
+    query = compile_query("a")
+
+    assert _contents(query.find(dom, limit=2)) == ["1", "2"]
+    assert query.find(dom, limit=0) == []
+    assert query.first(dom).content_str() == "1"
+    assert compile_query("table").first(dom) is None
+
+
+def test_reuse_in_find_and_match(dom):
+    query = compile_query("a", {"class": ClassToken("external")})
+
+    assert _contents(dom.find(query)) == ["2"]
+    assert _contents(dom.match("div", query)) == ["2"]
+    assert _contents(dom.find_many({"external": query})["external"]) == ["2"]
+
+    other_dom = dhtmlparser3.parse('<a class="external x">x</a>')
+    assert _contents(query.find(other_dom)) == ["x"]
+
+
+def test_immutable():
+    query = compile_query("a", {"href": Prefix("http")})
+
+    with pytest.raises(AttributeError):
+        query.name = "b"
+
+    with pytest.raises(AttributeError):
+        Prefix("x").prefix = "y"
+
+
+def test_compile_query_from_query():
+    query = compile_query("a")
+
+    assert compile_query(query) is query
+
+    with pytest.raises(TypeError):
+        compile_query(query, {"href": "x"})
+
+    assert isinstance(dhtmlparser3.compile_query("a"), Query)
@@ -0,0 +1,45 @@
+import dhtmlparser3
+from dhtmlparser3.tags.raw_text import RawText
+
+
+def test_decoding():
+    text = RawText("a &lt; b &amp c")
+
+    assert text.raw == "a &lt; b &amp c"
+    assert text == "a < b & c"
+    assert str(text) == "a < b & c"
+    assert text.startswith("a <")
+    assert "<" in text
+
+
+def test_attribute_decoding():
+    text = RawText("?a=1&copy=2&amp;b", in_attribute=True)
+
+    assert text == "?a=1&copy=2&b"
+
+
+def test_lazy_parse_preserves_entities():
+    inp = '<p title="a &quot;b&quot; &amp c">x &lt; y &copy2024</p>'
+    dom = dhtmlparser3.parse(inp, lazy_entities=True)
+
+    assert isinstance(dom.c[0], RawText)
+    assert dom.c[0] == "x < y ©2024"
+    assert dom.p["title"] == 'a "b" & c'
+    assert dom.content_without_tags() == "x < y ©2024"
+    assert dom.content_str() == "x < y ©2024"
+    assert dom.content_str(escape=True) == "x &lt; y &copy2024"
+    assert dom.to_string() == inp
+
+
+def test_lazy_parse_without_entities():
+    dom = dhtmlparser3.parse("<p>text</p>", lazy_entities=True)
+
+    assert dom.c == ["text"]
+    assert isinstance(dom.c[0], str)
+
+
+def test_lazy_parse_remove_item():
+    dom = dhtmlparser3.parse("<p>&lt;<br />&gt;</p>", lazy_entities=True)
+    dom.remove_item(dom.c[0])
+
+    assert dom.to_string() == "<p><br />&gt;</p>"
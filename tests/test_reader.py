@@ -0,0 +1,54 @@
+import bz2
+import gzip
+import lzma
+
+import pytest
+
+import dhtmlparser3
+from dhtmlparser3.reader import FileReader
+
+
+HTML = '<meta charset="cp1250"><p>Příliš žluťoučký kůň</p>' * 10
+
+
+@pytest.mark.parametrize("compress", [
+    lambda data: data,
+    gzip.compress,
+    bz2.compress,
+    lzma.compress,
+])
+def test_binary_chunks(tmp_path, compress):
+    path = tmp_path / "test.html"
+    path.write_bytes(compress(HTML.encode("cp1250")))
+
+    reader = FileReader(str(path), binary=True, chunk_size=7)
+
+    assert "".join(reader) == HTML
+    assert reader.encoding == "cp1250"
+
+
+def test_text_chunks(tmp_path):
+    path = tmp_path / "test.html.gz"
+    path.write_bytes(gzip.compress(HTML.encode("utf-8")))
+
+    reader = FileReader(str(path), encoding="utf-8", chunk_size=7)
+
+    assert "".join(reader) == HTML
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "test.html"
+    path.write_bytes(b"")
+
+    assert "".join(FileReader(str(path), binary=True)) == ""
+    assert dhtmlparser3.parse_file(str(path), binary=True).dom.content == [""]
+
+
+def test_parse_compressed_file(tmp_path):
+    path = tmp_path / "test.html.xz"
+    path.write_bytes(lzma.compress(HTML.encode("cp1250")))
+
+    fp = dhtmlparser3.parse_file(str(path), binary=True)
+
+    assert len(fp.dom.find("p")) == 10
+    assert fp.dom.find("p")[0].content == ["Příliš žluťoučký kůň"]
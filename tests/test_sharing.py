@@ -0,0 +1,158 @@
+import multiprocessing
+import struct
+
+import pytest
+
+import dhtmlparser3
+from dhtmlparser3 import sharing
+from dhtmlparser3.query import Prefix
+from dhtmlparser3.compact import CompactDocument
+
+
+HTML = """<html><head><title>Title &amp; more</title></head>
+<body>
+    <div id="main" CLASS="content">
+        <A href="/a">first</A>
+        <p>text<br>after<img src="x.png">ž&amp;</p>
+        <!-- comment -->
+        <a href="http://b">second <b>bold</b></a>
+    </div>
+</body>
+</html>"""
+
+
+def _assert_same(mapped, document):
+    assert len(mapped) == len(document)
+    assert mapped.string is None
+    assert mapped.root.to_string() == document.root.to_string()
+    assert mapped.to_dom().deep_equals(document.to_dom())
+    assert mapped.root.start == document.root.start
+    assert mapped.root.end == document.root.end
+
+    for name in ("a", "A", "p", "", "missing"):
+        assert [node.to_string() for node in mapped.find(name)] == [
+            node.to_string() for node in document.find(name)
+        ]
+
+
+@pytest.mark.parametrize("case_insensitive_parameters", [True, False])
+def test_from_buffer(case_insensitive_parameters):
+    document = CompactDocument(HTML, case_insensitive_parameters)
+
+    with CompactDocument.from_buffer(document.to_bytes()) as mapped:
+        _assert_same(mapped, document)
+        assert mapped.find("p")[0].content_without_tags() == "textafterž&"
+        parameters = mapped.find("div")[0].parameters
+        assert ("class" in parameters) is case_insensitive_parameters
+
+
+@pytest.mark.parametrize("html", ["", "text", "<br>", "<div><p>unclosed</div>"])
+def test_from_buffer_edge_cases(html):
+    document = CompactDocument(html)
+    mapped = CompactDocument.from_buffer(document.to_bytes())
+
+    _assert_same(mapped, document)
+    assert mapped.to_bytes() == document.to_bytes()
+
+
+def test_from_buffer_invalid():
+    data = CompactDocument(HTML).to_bytes()
+
+    with pytest.raises(ValueError):
+        CompactDocument.from_buffer(b"<html>")
+
+    with pytest.raises(ValueError):
+        CompactDocument.from_buffer(data[:len(data) // 2])
+
+    with pytest.raises(ValueError):
+        CompactDocument.from_buffer(b"X" + data[1:])
+
+
+def test_from_buffer_old_version():
+    data = CompactDocument(HTML).to_bytes()
+    old = data[:8] + struct.pack("<I", 1) + data[12:]
+
+    with pytest.raises(ValueError, match="Unsupported version 1"):
+        CompactDocument.from_buffer(old)
+
+
+def test_save_load(tmp_path):
+    document = CompactDocument(HTML)
+    path = str(tmp_path / "document.dhp")
+    sharing.save(document, path)
+
+    with sharing.load(path) as mapped:
+        _assert_same(mapped, document)
+
+    (tmp_path / "broken.dhp").write_bytes(b"broken")
+    with pytest.raises(ValueError):
+        sharing.load(str(tmp_path / "broken.dhp"))
+
+
+def _find_links(name):
+    with sharing.attach(name) as document:
+        return [link["href"] for link in document.find("a")]
+
+
+def test_share_attach():
+    memory = sharing.share(CompactDocument(HTML))
+    try:
+        with sharing.attach(memory.name) as document:
+            _assert_same(document, CompactDocument(HTML))
+
+        with multiprocessing.Pool(2) as pool:
+            results = pool.map(_find_links, [memory.name] * 2)
+
+        assert results == [["/a", "http://b"]] * 2
+    finally:
+        memory.close()
+        memory.unlink()
+
+
+def test_from_dom():
+    dom = dhtmlparser3.parse(HTML)
+    document = CompactDocument.from_dom(dom)
+
+    assert document.string is None
+    assert document.to_dom().deep_equals(dom)
+    assert document.root.start == dom.start
+
+    dom.find("a")[0].replace_with(dhtmlparser3.Tag("a", {"href": "/new"}))
+    document = CompactDocument.from_dom(dom)
+    assert [link["href"] for link in document.find("a")] == ["/new", "http://b"]
+
+    document = CompactDocument.from_dom(dhtmlparser3.Tag("div"))
+    assert document.root.name == "div"
+    assert document.root.start is None
+
+
+@pytest.mark.parametrize("case_insensitive_parameters", [True, False])
+def test_save_index(tmp_path, case_insensitive_parameters):
+    dom = dhtmlparser3.parse(HTML, case_insensitive_parameters)
+    path = str(tmp_path / "document.dhp")
+    dom.save_index(path)
+
+    with sharing.load(path) as document:
+        assert document._name_postings is not None
+        _assert_same(document, CompactDocument.from_dom(dom))
+
+        for name, parameters, case_sensitive in (
+            ("a", {"href": "/a"}, False),
+            ("a", {"href": "/a"}, True),
+            ("A", None, True),
+            ("", {"id": "main"}, False),
+            ("div", {"CLASS": "content", "id": "main"}, False),
+            ("div", {"class": "content"}, False),
+            ("a", {"href": Prefix("http")}, False),
+            ("a", {"href": "missing"}, False),
+            ("missing", {"href": "/a"}, False),
+        ):
+            expected = dom.find(name, parameters, case_sensitive=case_sensitive)
+            found = document.find(name, parameters, case_sensitive=case_sensitive)
+            assert [node.to_string() for node in found] == [
+                tag.to_string() for tag in expected
+            ]
+
+        div = document.find("div")[0]
+        assert [link["href"] for link in div.find("a", {"href": "/a"})] == ["/a"]
+        assert div.find("title") == []
@@ -0,0 +1,19 @@
+from dhtmlparser3.source import Source
+
+
+def test_position():
+    source = Source("ab\ncd\n\nef")
+
+    assert source.position(0) == (1, 1)
+    assert source.position(1) == (1, 2)
+    assert source.position(3) == (2, 1)
+    assert source.position(6) == (3, 1)
+    assert source.position(7) == (4, 1)
+    assert source.position(8) == (4, 2)
+
+
+def test_slicing():
+    source = Source("abcd")
+
+    assert source[1:3] == "bc"
+    assert len(source) == 4
@@ -4,6 +4,7 @@ import pytest
 
 import dhtmlparser3
 from dhtmlparser3.tags.tag import Tag
+from dhtmlparser3.query import Prefix
 
 
 def test_constructor_with_content():
@@ -254,6 +255,41 @@ def test_find_parameters():
     assert div_tags[0].content_str().strip().startswith("First div.")
 
 
+def test_find_many():
+    dom = dhtmlparser3.parse(
+        """
+        <div id=first>
+            <A href="a">a</A>
+            <span class="price">1</span>
+            <div id=subdiv><a>b</a><span class="price">2</span></div>
+        </div>
+        """
+    )
+
+    queries = {
+        "divs": "div",
+        "prices": ("span", {"class": "price"}),
+        "links": {"name": "a", "fn": lambda x: "href" in x.p},
+        "exact": ["A", None, None, True],
+        "ids": ("", {"id": "subdiv"}),
+        "nothing": "table",
+    }
+    results = dom.find_many(queries)
+
+    assert set(results) == set(queries)
+    for key, query in queries.items():
+        if isinstance(query, dict):
+            assert results[key] == dom.find(**query)
+        elif isinstance(query, (list, tuple)):
+            assert results[key] == dom.find(*query)
+        else:
+            assert results[key] == dom.find(query)
+
+    assert [x.content_str() for x in results["prices"]] == ["1", "2"]
+    assert len(results["exact"]) == 1
+    assert results["nothing"] == []
+
+
 def test_findb():
     dom = dhtmlparser3.parse(
         """
@@ -471,6 +507,44 @@ def test_match_parameters_relative_path():
     assert xe[0].parameters["id"] == "wanted xe"
 
 
+def test_match_nested_unique():
+    dom = dhtmlparser3.parse(
+        """
+        <div id=1>
+            <div id=2>
+                <div id=3><p id=a /></div>
+                <p id=b />
+            </div>
+            <p id=c />
+        </div>
+        """
+    )
+
+    p_tags = dom.match("div", "div", "p")
+    assert [x.p["id"] for x in p_tags] == ["a", "b", "c"]
+
+    divs = dom.match("div", "div")
+    assert [x.p["id"] for x in divs] == ["1", "2", "3"]
+
+
+def test_match_paths_nested_unique():
+    dom = dhtmlparser3.parse(
+        """
+        <div id=1>
+            <div id=2>
+                <div id=3><p id=a /></div>
+                <p id=b />
+            </div>
+            <p id=c />
+        </div>
+        """
+    )
+
+    assert [x.p["id"] for x in dom.match_paths("div", "div")] == ["2", "3"]
+    assert [x.p["id"] for x in dom.match_paths("div", "p")] == ["a", "b", "c"]
+    assert [x.p["id"] for x in dom.match_paths("div", "div", "p")] == ["a", "b"]
+
+
 def test_match_path_p_in_body():
     code = """
     <html>
@@ -816,3 +890,257 @@ def test_weird_msg():
 
     assert tag.prettify().strip() == original_str
 
+
+
+def test_to_string_preserve_source():
+    inp = """<html>
+ <body BGCOLOR=white><div class='x'>a &amp; b<br>c</div><!-- c -->
+ <p>unclosed <a href=x>l</a>
+</body></html>"""
+    dom = dhtmlparser3.parse(inp)
+
+    assert dom.to_string(preserve_source=True) == inp
+
+
+def test_to_string_preserve_source_modified_parameter():
+    dom = dhtmlparser3.parse("<div class='x'><a href=x>l</a><br></div>")
+    dom.find("a")[0]["href"] = "y"
+
+    assert dom.to_string(preserve_source=True) == (
+        """<div class='x'><a href="y">l</a><br></div>"""
+    )
+
+
+def test_to_string_preserve_source_modified_content():
+    dom = dhtmlparser3.parse("<div id=a><p class='x'>a &amp; b<br>c</p> x </div>")
+    p = dom.find("p")[0]
+    p.remove_item(p.find("br")[0])
+
+    assert dom.to_string(preserve_source=True) == (
+        "<div id=a><p class='x'>a &amp; bc</p> x </div>"
+    )
+
+    del dom["id"]
+    assert dom.to_string(preserve_source=True) == (
+        "<div><p class='x'>a &amp; bc</p> x </div>"
+    )
+
+
+def test_to_string_preserve_source_replace_with():
+    dom = dhtmlparser3.parse("<div><p  class='x'>a</p><i >b</i></div>")
+    dom.find("p")[0].replace_with(Tag("b", content=["new"]))
+
+    assert dom.to_string(preserve_source=True) == "<div><b>new</b><i >b</i></div>"
+
+
+def test_to_string_preserve_source_foreign_tag():
+    dom = dhtmlparser3.parse("<div><i >a</i></div>")
+    dom.content.append(Tag("b", content=["new"]))
+    dom.mark_dirty()
+
+    assert dom.to_string(preserve_source=True) == "<div><i >a</i><b>new</b></div>"
+
+
+def test_number_nodes():
+    dom = dhtmlparser3.parse("<div><p><b>a</b><i>b</i></p><p>c</p></div> ")
+    div = dom.find("div")[0]
+    p1, p2 = dom.find("p")
+    b, i = dom.find("b")[0], dom.find("i")[0]
+
+    dom.number_nodes()
+
+    assert div.is_ancestor_of(b)
+    assert p1.is_ancestor_of(i)
+    assert not p2.is_ancestor_of(i)
+    assert not b.is_ancestor_of(b)
+    assert [tag.depth for tag in (dom, div, p1, b)] == [0, 1, 2, 3]
+    assert dom.sorted_in_document_order([p2, i, b, p1, i]) == [p1, b, i, p2]
+    assert p1.sorted_in_document_order([i, p1]) == [p1, i]
+
+    with pytest.raises(ValueError):
+        p1.sorted_in_document_order([i, p2])
+
+    # mutation invalidates the numbering, the methods fall back to traversal
+    p2["x"] = Tag("u")
+    p2[-1:] = b
+    b.parent = p2
+    assert p2.is_ancestor_of(b)
+    assert not p1.is_ancestor_of(b)
+
+
+def test_is_ancestor_of_without_numbering():
+    dom = dhtmlparser3.parse("<div><p><b>a</b></p></div> ")
+    b = dom.find("b")[0]
+
+    assert dom.find("div")[0].is_ancestor_of(b)
+    assert not b.is_ancestor_of(dom)
+    assert b.depth == 3
+    assert dom.sorted_in_document_order([b, dom]) == [dom, b]
+
+    with pytest.raises(ValueError):
+        b.sorted_in_document_order([dom])
+
+
+def test_closest():
+    dom = dhtmlparser3.parse("<div class=x><div><p><b>a</b></p></div></div>")
+    b = dom.find("b")[0]
+
+    assert b.closest("b") is b
+    assert b.closest("div") is dom.find("div")[1]
+    assert b.closest("div", {"class": "x"}) is dom
+    assert b.closest("table") is None
+
+
+def test_fingerprint():
+    dom = dhtmlparser3.parse(
+        "<ul><li a=1 B=2>x<b>y</b></li><li b=2 a=1>x<b>y</b></li><li>x</li></ul>"
+    )
+    li1, li2, li3 = dom.find("li")
+
+    assert len(li1.fingerprint()) == 16
+    assert li1.fingerprint() == li2.fingerprint()
+    assert li1.fingerprint() != li3.fingerprint()
+    assert hash(li1) == hash(li2)
+    assert li1.deep_equals(li2)
+    assert not li1.deep_equals(li3)
+
+    # cached values are invalidated up to the root
+    dom_fingerprint = dom.fingerprint()
+    li2.find("b")[0]["c"] = "d"
+    assert li1.fingerprint() != li2.fingerprint()
+    assert dom.fingerprint() != dom_fingerprint
+    assert not li1.deep_equals(li2)
+
+    del li2.find("b")[0]["c"]
+    assert dom.fingerprint() == dom_fingerprint
+    assert li1.deep_equals(li2)
+
+
+def test_hash_after_direct_modification():
+    first = dhtmlparser3.parse("<p>x</p>")
+    first_hash = hash(first)
+
+    first.content.append("y")
+    first.mark_dirty()
+
+    assert hash(first) != first_hash
+    assert hash(first) == hash(dhtmlparser3.Tag("p", content=["x", "y"]))
+
+
+def test_deep_equals_after_direct_modification():
+    first = dhtmlparser3.parse("<p>x</p>")
+    second = dhtmlparser3.parse("<p>x</p>")
+    assert first.deep_equals(second)
+
+    second.content[0] = "z"
+    second.mark_dirty()
+
+    assert second.deep_equals(dhtmlparser3.parse("<p>z</p>"))
+    assert not first.deep_equals(second)
+
+
+def test_deep_equals_content():
+    first = dhtmlparser3.parse("<p>a<!-- c --><br></p>")
+
+    assert first.deep_equals(dhtmlparser3.parse("<p>a<!-- c --><br></p>"))
+    assert not first.deep_equals(dhtmlparser3.parse("<p>a<!-- d --><br></p>"))
+    assert not first.deep_equals(dhtmlparser3.parse("<p>b<!-- c --><br></p>"))
+    assert not first.deep_equals("<p>a<!-- c --><br></p>")
+
+
+def test_cow_clone():
+    dom = dhtmlparser3.parse(
+        "<div><ul><li>a</li><li class=x>b</li></ul><p>text</p></div>"
+    )
+    original = dom.to_string()
+
+    clone = dom.cow_clone()
+    assert clone.to_string() == original
+    assert clone.parent is None
+
+    clone.find("li")[1]["class"] = "y"
+    clone.find("p")[0].replace_with(dhtmlparser3.Tag("hr", is_non_pair=True))
+    second = clone.cow_clone()
+    second.find("ul")[0].remove_item(second.find("li")[0])
+
+    assert dom.to_string() == original
+    assert clone.to_string() == (
+        '<div><ul><li>a</li><li class="y">b</li></ul><hr /></div>'
+    )
+    assert second.to_string() == '<div><ul><li class="y">b</li></ul><hr /></div>'
+    assert clone.find("li")[0].parent.parent is clone
+
+
+def test_cow_clone_direct_parameter_write():
+    dom = dhtmlparser3.parse('<div class="a"><p id="x">text</p></div>')
+    original = dom.to_string()
+
+    clone = dom.cow_clone()
+    clone.p["class"] = "b"
+    clone.find("p")[0].p["id"] = "y"
+    del clone.find("p")[0].p["id"]
+
+    assert dom.to_string() == original
+    assert clone.to_string() == '<div class="b"><p>text</p></div>'
+
+
+def test_query_cache():
+    dom = dhtmlparser3.parse(
+        '<div><p class="x">a</p><p>b<a href="/x">link</a></p></div> '
+    )
+    div = dom.find("div")[0]
+    dom.enable_query_cache()
+
+    first = div.find("p", {"class": "x"})
+    assert div.find("p", {"class": "x"}) == first
+    assert div.find("p", {"class": "x"}) is not first
+    assert div.find("P", {"class": Prefix("x")}) == first
+    assert div.match("p", "a") == [div.find("a")[0]]
+    assert div.match_paths("div", "p") == div.find("p")
+
+    first[0]["class"] = "y"
+    assert div.find("p", {"class": "x"}) == []
+
+    del first[0]["class"]
+    assert div.find("p", {"class": Prefix("y")}) == []
+
+    div.find("p")[1].remove_item(div.find("a")[0])
+    assert div.match("p", "a") == []
+
+    div[-1:] = dhtmlparser3.Tag("p", {"class": "x"})
+    assert len(div.find("p")) == 3
+
+    div.find("p")[0].replace_with(dhtmlparser3.Tag("a"))
+    assert len(div.find("p")) == 2
+    assert div.match_paths("div", "a") == [div.find("a")[0]]
+
+    div.content.append(dhtmlparser3.Tag("p"))
+    div.mark_dirty()
+    assert len(div.find("p")) == 3
+    assert len(div.find("", fn=lambda tag: tag.name == "p")) == 3
+
+    dom.enable_query_cache(False)
+    div.content.append(dhtmlparser3.Tag("p"))
+    assert len(div.find("p")) == 4
+
+
+def test_query_cache_constructed_tree():
+    dom = Tag("div", content=[Tag("p")])
+    dom.enable_query_cache()
+    assert dom.find("p", {"x": "y"}) == []
+
+    dom.c[0]["x"] = "y"
+
+    assert dom.find("p", {"x": "y"}) == [dom.c[0]]
+
+
+def test_constructor_sets_parents():
+    p = Tag("p")
+    div = Tag("div", content=["a", p])
+
+    assert p.parent is div
+
+    fingerprint = div.fingerprint()
+    p["x"] = "y"
+
+    assert div.fingerprint() != fingerprint
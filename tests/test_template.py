@@ -0,0 +1,43 @@
+import dhtmlparser3
+from dhtmlparser3 import Tag
+from dhtmlparser3.template import Slot
+from dhtmlparser3.template import compile_template
+
+
+def _dom():
+    return Tag("div", {"class": Slot("cls", "default"), "id": "x"}, [
+        Tag("h1", content=[Slot("title")]),
+        Tag("p", content=["a & b", Tag("br", is_non_pair=True), Slot("text")]),
+        Tag("script", content=["if (a < b) ", Slot("code")]),
+        dhtmlparser3.Comment(" c "),
+    ])
+
+
+def test_render():
+    template = compile_template(_dom())
+
+    assert template.slot_names == {"cls", "title", "text", "code"}
+    assert template.render(cls="c", title="<T>", text="x", code="a && b") == (
+        '<div class="c" id="x"><h1>&lt;T&gt;</h1><p>a &amp; b<br />x</p>'
+        "<script>if (a < b) a && b</script><!-- c --></div>"
+    )
+
+
+def test_render_defaults_and_tags():
+    template = compile_template(_dom())
+
+    result = template.render(text=Tag("b", content=["bold"]))
+    assert result.startswith('<div class="default" id="x"><h1></h1>')
+    assert "<br /><b>bold</b></p>" in result
+
+    assert template.render(cls=None).startswith('<div id="x">')
+
+
+def test_render_matches_to_string():
+    dom = _dom()
+    template = compile_template(dom)
+
+    assert template.render() == dom.to_string()
+
+    dom.find("h1")[0].content = ["Title"]
+    assert template.render(title="Title") == dom.to_string()
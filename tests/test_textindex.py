@@ -0,0 +1,78 @@
+import pytest
+
+import dhtmlparser3
+from dhtmlparser3.textindex import words
+from dhtmlparser3.textindex import TextIndex
+
+
+HTML = """<div id="main">
+    <p>Free <b>shipping</b> on all orders.</p>
+    <p>Shipping is FREE!</p><p>one</p><p>two &amp; three</p>
+    <!-- free shipping -->
+</div>"""
+
+
+@pytest.fixture
+def dom():
+    return dhtmlparser3.parse(HTML)
+
+
+def test_words():
+    assert words("Free  shipping, ON all-orders!") == [
+        "free", "shipping", "on", "all", "orders"
+    ]
+    assert words("Straße") == ["strasse"]
+
+
+def test_find_text_contains(dom):
+    first, second, one, two = dom.find("p")
+
+    assert dom.find("p", text_contains="free shipping") == [first]
+    assert dom.find("p", text_contains="FREE") == [first, second]
+    assert dom.find("", text_contains="shipping is") == [dom, second]
+    assert dom.find("", text_contains="shipping") == [
+        dom, first, first.find("b")[0], second
+    ]
+    assert dom.find("p", {"id": "x"}, text_contains="free") == []
+    assert dom.find("p", text_contains="one two") == []
+    assert dom.find("p", text_contains="two & three") == [two]
+    assert dom.find("p", text_contains="missing") == []
+    assert first.find("", text_contains="shipping") == [first, first.find("b")[0]]
+    assert second.find("b", text_contains="shipping") == []
+
+    with pytest.raises(ValueError):
+        dom.find("p", text_contains=" - ")
+
+
+def test_index_is_reused_and_invalidated(dom):
+    index = dom.text_index()
+    assert isinstance(index, TextIndex)
+    assert dom.text_index() is index
+    assert dom.find("p")[1].text_index() is index
+
+    last = dom.find("p")[-1]
+    last.content.append(dhtmlparser3.Tag("b", content=["four"]))
+    last.mark_dirty()
+
+    assert not index.valid
+    assert dom.find("p", text_contains="three four") == [last]
+    assert dom.text_index() is not index
+
+    first = dom.find("p")[0]
+    first.remove_item(first.find("b")[0])
+    assert dom.find("p", text_contains="free on all") == [first]
+
+    index = dom.text_index()
+    dom["id"] = "changed"
+    assert not index.valid
+
+    second = dom.find("p")[1]
+    assert dom.text_index().containing("shipping", second) == [second]
+
+    with pytest.raises(ValueError):
+        dom.text_index().containing("free", dhtmlparser3.Tag("p"))
+
+
+def test_lazy_entities():
+    dom = dhtmlparser3.parse("<p>Fish &amp; chips</p>", lazy_entities=True)
+    assert dom.find("p", text_contains="fish chips") == [dom]
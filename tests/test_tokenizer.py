@@ -1,9 +1,14 @@
+import time
+
+import pytest
+
 from dhtmlparser3.tokens import TagToken
 from dhtmlparser3.tokens import TextToken
 from dhtmlparser3.tokens import CommentToken
 from dhtmlparser3.tokens import ParameterToken
 
 from dhtmlparser3.tokenizer import Tokenizer
+from dhtmlparser3.tokenizer import IncrementalTokenizer
 
 
 def test_entity_consumption():
@@ -344,3 +349,96 @@ def test_recovery_from_another_unclosed_tag():
         TextToken("Bla</code\n"),
         CommentToken(" "),
     ]
+
+
+def test_html5_entities():
+    tokenizer = Tokenizer("&Aacute;&notin;&copy2024&#x263A;")
+
+    assert tokenizer.tokenize() == [TextToken("Á∉©2024☺")]
+
+
+def test_legacy_entity_in_parameter():
+    tokenizer = Tokenizer('<a href="?a=1&copy=2&amp;b=&lt;">')
+
+    assert tokenizer.tokenize() == [
+        TagToken("a", parameters=[ParameterToken("href", "?a=1&copy=2&b=<")])
+    ]
+
+
+def test_lazy_entities():
+    tokenizer = Tokenizer('a &amp; b<tag key="&lt;" k2="v">&gt;', lazy_entities=True)
+
+    tokens = tokenizer.tokenize()
+
+    assert tokens == [
+        TextToken("a & b"),
+        TagToken("tag", parameters=[
+            ParameterToken("key", "<"),
+            ParameterToken("k2", "v"),
+        ]),
+        TextToken(">"),
+    ]
+    assert tokens[0].content.raw == "a &amp; b"
+    assert tokens[1].parameters[0].value.raw == "&lt;"
+    assert tokens[1].parameters[1].value == "v"
+
+
+def test_token_spans():
+    string = '<a href="x">t &amp; t<!-- c --></a>'
+    tokens = Tokenizer(string).tokenize()
+
+    assert [string[t.start:t.end] for t in tokens] == [
+        '<a href="x">',
+        "t &amp; t",
+        "<!-- c -->",
+        "</a>",
+    ]
+    assert string[tokens[0].parameters[0].start:tokens[0].parameters[0].end] == (
+        'href="x"'
+    )
+
+
+def test_incremental_tokenizer():
+    string = '<a href="x">t &amp; t &notin;<!-- c --></a>'
+    expected = Tokenizer(string).tokenize()
+
+    for chunk_size in range(1, len(string)):
+        tokenizer = IncrementalTokenizer()
+        tokens = []
+        for index in range(0, len(string), chunk_size):
+            tokens.extend(tokenizer.feed(string[index:index + chunk_size]))
+        tokens.extend(tokenizer.close())
+
+        assert tokens == expected
+        assert [(t.start, t.end) for t in tokens] == [
+            (t.start, t.end) for t in expected
+        ]
+
+
+def test_incremental_tokenizer_returns_complete_tokens():
+    tokenizer = IncrementalTokenizer()
+
+    assert tokenizer.feed("<a href=") == []
+    assert tokenizer.feed('"x">text' + 40 * " " + "<b") == [
+        TagToken("a", parameters=[ParameterToken("href", "x")]),
+    ]
+    assert tokenizer.close() == [TextToken("text" + 40 * " " + "<b")]
+
+
+@pytest.mark.parametrize("string", [
+    "<!--" + "x>" * 100000 + "-->",
+    "<a href='" + 'x>"' * 100000 + "'>",
+    "text>" * 100000 + "<b>",
+])
+def test_incremental_tokenizer_large_token_is_linear(string):
+    expected = Tokenizer(string).tokenize()
+
+    start = time.perf_counter()
+    tokenizer = IncrementalTokenizer()
+    tokens = []
+    for index in range(0, len(string), 10):
+        tokens.extend(tokenizer.feed(string[index:index + 10]))
+    tokens.extend(tokenizer.close())
+
+    assert tokens == expected
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,84 @@
+import copy
+
+import dhtmlparser3
+from dhtmlparser3.treediff import Delete
+from dhtmlparser3.treediff import Insert
+from dhtmlparser3.treediff import ReplaceTag
+from dhtmlparser3.treediff import ReplaceText
+from dhtmlparser3.treediff import SetAttribute
+from dhtmlparser3.treediff import RemoveAttribute
+
+
+OLD = """<div id=page>
+    <ul><li>a</li><li class=x>b</li><li>c</li></ul>
+    <p>text <b>bold</b></p>
+    <!-- comment -->
+</div>"""
+
+
+def _diff_and_patch(old, new):
+    old_dom = dhtmlparser3.parse(old)
+    new_dom = dhtmlparser3.parse(new)
+
+    edits = dhtmlparser3.diff(old_dom, new_dom)
+    patched = dhtmlparser3.patch(copy.deepcopy(old_dom), edits)
+    assert patched.deep_equals(new_dom)
+
+    return edits
+
+
+def test_equal_trees():
+    assert _diff_and_patch(OLD, OLD) == []
+
+
+def test_attributes():
+    edits = _diff_and_patch(OLD, OLD.replace("id=page", "class=y"))
+
+    assert edits == [RemoveAttribute((), "id"), SetAttribute((), "class", "y")]
+
+
+def test_text():
+    edits = _diff_and_patch(OLD, OLD.replace("text", "changed"))
+
+    assert edits == [ReplaceText((3,), 0, "changed ")]
+
+
+def test_insert_and_delete():
+    edits = _diff_and_patch(OLD, OLD.replace("<li>a</li>", "").replace(
+        "<li>c</li>", "<li>c</li><li>d</li>"
+    ))
+
+    assert edits == [
+        Delete((1,), 0),
+        Insert((1,), 2, dhtmlparser3.parse("<li>d</li>")),
+    ]
+
+
+def test_nested_changes():
+    new = (
+        OLD.replace("<b>bold</b>", "<b>bolder</b><i>x</i>")
+        .replace("class=x", "class=z")
+        .replace("comment", "other")
+    )
+
+    edits = _diff_and_patch(OLD, new)
+    assert SetAttribute((1, 1), "class", "z") in edits
+    assert ReplaceText((3, 1), 0, "bolder") in edits
+    assert Insert((3,), 2, dhtmlparser3.parse("<i>x</i>")) in edits
+
+
+def test_different_roots():
+    edits = _diff_and_patch("<a>x</a>", "<b>x</b>")
+
+    assert edits == [ReplaceTag((), dhtmlparser3.parse("<b>x</b>"))]
+
+
+def test_diff_after_modification_of_constructed_tree():
+    old = dhtmlparser3.Tag("div", content=[dhtmlparser3.Tag("p", content=["a"])])
+    new = dhtmlparser3.Tag("div", content=[dhtmlparser3.Tag("p", content=["a"])])
+    assert dhtmlparser3.diff(old, new) == []
+
+    new.c[0]["x"] = "y"
+
+    assert not old.deep_equals(new)
+    assert dhtmlparser3.diff(old, new) == [SetAttribute((0,), "x", "y")]
@@ -0,0 +1,149 @@
+import pytest
+
+import dhtmlparser3
+from dhtmlparser3.xpath import XPath
+from dhtmlparser3.xpath import _Document
+from dhtmlparser3.xpath import compile_xpath
+
+
+HTML = """
+<html>
+<body>
+    <ul id="menu">
+        <li><a href="/a" class="link">A</a></li>
+        <li class="sep">B</li>
+        <LI><a href="/c">C</a><!-- comment --></LI>
+    </ul>
+    <div><p>1</p><p>2</p></div>
+    <div><p>3</p></div>
+</body>
+</html>
+"""
+
+
+@pytest.fixture
+def dom():
+    return dhtmlparser3.parse(HTML)
+
+
+def _contents(tags):
+    return [tag.content_without_tags().strip() for tag in tags]
+
+
+def test_paths(dom):
+    assert _contents(dom.xpath("//li")) == ["A", "B", "C"]
+    assert _contents(dom.xpath("/html/body/ul/li/a")) == ["A", "C"]
+    assert _contents(dom.xpath("//ul//a")) == ["A", "C"]
+    assert _contents(dom.xpath("//div/p")) == ["1", "2", "3"]
+    assert dom.xpath("//nothing") == []
+
+
+def test_relative_paths(dom):
+    ul = dom.find("ul")[0]
+
+    assert _contents(ul.xpath("li/a")) == ["A", "C"]
+    assert _contents(ul.xpath("./li[2]")) == ["B"]
+    assert ul.xpath("..")[0].name == "body"
+    assert _contents(ul.xpath("/html/body/div[2]")) == ["3"]
+
+
+def test_attributes(dom):
+    assert dom.xpath("//a/@href") == ["/a", "/c"]
+    assert dom.xpath("//ul/@*") == ["menu"]
+    assert _contents(dom.xpath("//li[@class='sep']")) == ["B"]
+    assert _contents(dom.xpath("//a[@class]")) == ["A"]
+    assert _contents(dom.xpath("//a[not(@class)]")) == ["C"]
+    assert _contents(dom.xpath("//a[starts-with(@href, '/c')]")) == ["C"]
+
+
+def test_positions(dom):
+    assert _contents(dom.xpath("//p[1]")) == ["1", "3"]
+    assert _contents(dom.xpath("(//p)[1]")) == ["1"]
+    assert _contents(dom.xpath("//p[last()]")) == ["2", "3"]
+    assert _contents(dom.xpath("(//p)[last()]")) == ["3"]
+    assert _contents(dom.xpath("//li[position() > 1]")) == ["B", "C"]
+
+
+def test_text(dom):
+    assert dom.xpath("//p/text()") == ["1", "2", "3"]
+    assert _contents(dom.xpath("//p[text() = '2']")) == ["2"]
+    assert _contents(dom.xpath("//li[contains(., 'B')]")) == ["B"]
+    assert len(dom.xpath("//comment()")) == 1
+
+
+def test_axes(dom):
+    a = dom.xpath("//a")[1]
+
+    assert [tag.name for tag in a.xpath("ancestor::*")] == ["html", "body", "ul", "LI"]
+    assert a.xpath("parent::li")[0].name == "LI"
+    assert _contents(a.xpath("../preceding-sibling::li")) == ["A", "B"]
+    assert _contents(a.xpath("../preceding-sibling::li[1]")) == ["B"]
+    assert _contents(dom.xpath("//li[1]/following-sibling::*")) == ["B", "C"]
+    assert [tag.name for tag in a.xpath("ancestor-or-self::*[2]")] == ["LI"]
+    assert _contents(dom.xpath("//ul/descendant::a")) == ["A", "C"]
+    assert _contents(dom.xpath("//li/self::*[@class]")) == ["B"]
+
+
+def test_unions_are_unique_and_ordered(dom):
+    result = dom.xpath("//p | //li | //div/p")
+
+    assert _contents(result) == ["A", "B", "C", "1", "2", "3"]
+    assert len(dom.xpath("//li/a/ancestor::ul")) == 1
+
+
+def test_numbered_nodes_are_sorted_without_traversal(monkeypatch):
+    dom = dhtmlparser3.parse("<root><a>1</a><b><a>2</a></b><a>3</a></root>")
+    dom.number_nodes()
+
+    def traversal(*args, **kwargs):
+        raise AssertionError("The tree was traversed!")
+
+    links = dom.find("a")
+    monkeypatch.setattr(dhtmlparser3.Tag, "depth_first_iterator", traversal)
+
+    assert _Document(dom).root is not dom
+    assert _Document(dom).sort(links[::-1] + links) == links
+
+
+def test_values(dom):
+    assert dom.xpath("count(//li)") == 3.0
+    assert dom.xpath("string(//li[2])") == "B"
+    assert dom.xpath("name(//ul/*[3])") == "LI"
+    assert dom.xpath("1 + 2 * 3 - 8 div 4") == 5.0
+    assert dom.xpath("concat('a', 1, true())") == "a1true"
+    assert dom.xpath("normalize-space('  a  b ')") == "a b"
+    assert dom.xpath("sum(//p) = 6") is True
+    assert dom.xpath("//li = 'B' and count(//p) > 2") is True
+
+
+def test_compile_xpath_is_cached():
+    assert compile_xpath("//a") is compile_xpath("//a")
+    assert isinstance(compile_xpath("//a"), XPath)
+
+
+@pytest.mark.parametrize("expression", ["", "//", "//a[", "foo::a", "unknown()", "a b"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        compile_xpath(expression)
+
+
+@pytest.mark.parametrize("expression", [
+    "//a[contains(@href)]",
+    "count()",
+    "last(1)",
+    "concat('a')",
+    "substring('a', 1, 2, 3)",
+    "translate('a', 'b')",
+    "not()",
+])
+def test_wrong_number_of_arguments(expression):
+    with pytest.raises(ValueError, match="number of arguments"):
+        compile_xpath(expression)
+
+
+def test_unwrapped_root():
+    dom = dhtmlparser3.parse("<root><a>1</a><a>2</a></root>")
+
+    assert dom.name == "root"
+    assert _contents(dom.xpath("/root/a")) == ["1", "2"]
+    assert _contents(dom.xpath("a[2]")) == ["2"]